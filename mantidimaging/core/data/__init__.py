@@ -2,3 +2,5 @@
 # SPDX - License - Identifier: GPL-3.0-or-later
 
 from .images import Images  # noqa: F401
+from .lazy_images import LazyImages  # noqa: F401
+from .live_images import LiveImages  # noqa: F401
@@ -4,6 +4,7 @@
 import datetime
 import json
 from copy import deepcopy
+from logging import getLogger
 from typing import List, Tuple, Optional, Any, Dict
 
 import numpy as np
@@ -12,9 +13,13 @@ from mantidimaging.core.data.utility import mark_cropped
 from mantidimaging.core.operation_history import const
 from mantidimaging.core.parallel import utility as pu
 from mantidimaging.core.utility.data_containers import ProjectionAngles, Counts
+from mantidimaging.core.utility import memory_budget
 from mantidimaging.core.utility.imat_log_file_parser import IMATLogFile
+from mantidimaging.core.utility.progress_reporting import Progress
 from mantidimaging.core.utility.sensible_roi import SensibleROI
 
+LOG = getLogger(__name__)
+
 
 class Images:
     NO_FILENAME_IMAGE_TITLE_STRING = "Image: {}"
@@ -46,15 +51,23 @@ class Images:
         self._proj180deg: Optional[Images] = None
         self._log_file: Optional[IMATLogFile] = None
         self._projection_angles: Optional[ProjectionAngles] = None
+        # sinogram-ordered copy of the projections, see cache_sinograms
+        self._sinogram_cache: Optional[np.ndarray] = None
 
     def __eq__(self, other):
         if isinstance(other, Images):
-            return np.array_equal(self.data, other.data) \
-                   and self.is_sinograms == other.is_sinograms \
-                   and self.metadata == other.metadata \
-                   and self.indices == other.indices
+            if other is self:
+                return True
+            # the cheap checks come first, so that the data is only read if everything else matches
+            if self.is_sinograms != other.is_sinograms \
+                    or self.indices != other.indices \
+                    or self.shape != other.shape \
+                    or self.dtype != other.dtype \
+                    or self.metadata != other.metadata:
+                return False
+            return self.data is other.data or np.array_equal(self.data, other.data)
         elif isinstance(other, np.ndarray):
-            return np.array_equal(self.data, other)
+            return self.data is other or np.array_equal(self.data, other)
         else:
             raise ValueError(f"Cannot compare against {other}")
 
@@ -62,7 +75,7 @@ class Images:
         return not self == other
 
     def __str__(self):
-        return f'Image Stack: data={self.data.shape} | properties|={len(self.metadata)}'
+        return f'Image Stack: data={self.shape} | properties|={len(self.metadata)}'
 
     def count(self) -> int:
         return len(self._filenames) if self._filenames else 0
@@ -96,6 +109,7 @@ class Images:
         self._filenames = new_ones
 
     def load_metadata(self, f):
+        self.clear_sinogram_cache()
         self.metadata = json.load(f)
         self._is_sinograms = self.metadata.get(const.SINOGRAMS, False)
 
@@ -108,6 +122,8 @@ class Images:
         json.dump(self.metadata, f, indent=4)
 
     def record_operation(self, func_name: str, display_name, *args, **kwargs):
+        # every operation that changes the data is recorded, so this is where the sinograms become stale
+        self.clear_sinogram_cache()
         if const.OPERATION_HISTORY not in self.metadata:
             self.metadata[const.OPERATION_HISTORY] = []
 
@@ -134,11 +150,13 @@ class Images:
     def copy(self, flip_axes=False) -> 'Images':
         shape = (self.data.shape[1], self.data.shape[0], self.data.shape[2]) if flip_axes else self.data.shape
         data_name = pu.create_shared_name()
-        data_copy = pu.create_array(shape, self.data.dtype, data_name)
-        if flip_axes:
-            data_copy[:] = np.swapaxes(self.data, 0, 1)
-        else:
-            data_copy[:] = self.data[:]
+        nbytes = memory_budget.size_in_bytes(shape, self.data.dtype)
+        with memory_budget.reserve(nbytes, "Copy", spill_to_disk=True):
+            data_copy = pu.create_array(shape, self.data.dtype, data_name)
+            if flip_axes:
+                pu.swap_axes(self.data, data_copy)
+            else:
+                data_copy[:] = self.data[:]
 
         images = Images(data_copy,
                         indices=deepcopy(self.indices),
@@ -151,8 +169,10 @@ class Images:
         shape = (self.data.shape[0], roi.height, roi.width)
 
         data_name = pu.create_shared_name()
-        data_copy = pu.create_array(shape, self.data.dtype, data_name)
-        data_copy[:] = self.data[:, roi.top:roi.bottom, roi.left:roi.right]
+        nbytes = memory_budget.size_in_bytes(shape, self.data.dtype)
+        with memory_budget.reserve(nbytes, "Copy ROI", spill_to_disk=True):
+            data_copy = pu.create_array(shape, self.data.dtype, data_name)
+            data_copy[:] = self.data[:, roi.top:roi.bottom, roi.left:roi.right]
 
         images = Images(data_copy,
                         indices=deepcopy(self.indices),
@@ -163,19 +183,37 @@ class Images:
         mark_cropped(images, roi)
         return images
 
+    def convert_dtype(self, dtype):
+        """
+        Replace the data with a copy in another dtype, e.g. to apply an operation that needs float32 data
+        to a stack stored in reduced precision.
+
+        :param dtype: The new dtype of the data
+        """
+        if self.dtype == dtype:
+            return
+        data = self.data
+        output = pu.allocate_output(self, self.shape, dtype)
+        output[:] = data
+        self.data = output
+
     def index_as_images(self, index) -> 'Images':
         return Images(np.asarray([self.data[index]]), metadata=deepcopy(self.metadata), sinograms=self.is_sinograms)
 
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self.data.shape
+
     @property
     def height(self):
         if not self._is_sinograms:
-            return self.data.shape[1]
+            return self.shape[1]
         else:
-            return self.data.shape[0]
+            return self.shape[0]
 
     @property
     def width(self):
-        return self.data.shape[2]
+        return self.shape[2]
 
     @property
     def h_middle(self) -> float:
@@ -193,14 +231,14 @@ class Images:
 
     @property
     def num_images(self) -> int:
-        return self.data.shape[0]
+        return self.shape[0]
 
     @property
     def num_projections(self) -> int:
         if not self._is_sinograms:
-            return self.data.shape[0]
+            return self.shape[0]
         else:
-            return self.data.shape[1]
+            return self.shape[1]
 
     @property
     def num_sinograms(self) -> int:
@@ -208,6 +246,8 @@ class Images:
 
     def sino(self, slice_idx) -> np.ndarray:
         if not self._is_sinograms:
+            if self._sinogram_cache is not None:
+                return self._sinogram_cache[slice_idx]
             return np.swapaxes(self.data, 0, 1)[slice_idx]
         else:
             return self.data[slice_idx]
@@ -243,7 +283,41 @@ class Images:
 
     @property
     def sinograms(self):
-        return self._data if self._is_sinograms else np.swapaxes(self._data, 0, 1)
+        """
+        The data in sinogram order. If the stack contains projections this is the contiguous copy made by
+        `cache_sinograms`, or otherwise a strided view of the projections, so that reading this does not copy the stack
+        """
+        if self._is_sinograms:
+            return self._data
+        return self._sinogram_cache if self._sinogram_cache is not None else np.swapaxes(self._data, 0, 1)
+
+    @property
+    def has_sinogram_cache(self) -> bool:
+        return self._sinogram_cache is not None
+
+    def cache_sinograms(self, progress: Optional[Progress] = None) -> bool:
+        """
+        Keep a sinogram-ordered copy of the projections, so that `sino` and `sinograms` read contiguous
+        memory instead of gathering a row from every projection. It is used until the data is replaced
+        or an operation is recorded.
+
+        The copy doubles the memory used by the stack, so it is only made if it fits in physical memory.
+
+        :param progress: Progress instance to use for progress reporting (optional)
+        :return: Whether the sinograms can be read from contiguous memory
+        """
+        if self._is_sinograms or self._sinogram_cache is not None:
+            return True
+        shape = (self.shape[1], self.shape[0], self.shape[2])
+        if not pu.enough_memory(shape, self.dtype):
+            LOG.info(f"Not enough memory to cache the sinograms of shape {shape}")
+            return False
+        LOG.info(f"Caching the sinograms of shape {shape}")
+        self._sinogram_cache = pu.swap_axes(self.data, progress=progress)
+        return True
+
+    def clear_sinogram_cache(self):
+        self._sinogram_cache = None
 
     @property
     def data(self) -> np.ndarray:
@@ -251,8 +325,16 @@ class Images:
 
     @data.setter
     def data(self, other: np.ndarray):
+        self.clear_sinogram_cache()
         self._data = other
 
+    @property
+    def stored_on_disk(self) -> bool:
+        """
+        Whether the data did not fit in memory and is stored in a memory-mapped file in the scratch directory
+        """
+        return self._data is not None and pu.is_disk_array(self._data)
+
     @property
     def dtype(self):
         return self._data.dtype
@@ -0,0 +1,174 @@
+# Copyright (C) 2020 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+
+import threading
+from collections import OrderedDict
+from logging import getLogger
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from mantidimaging.core.data.images import Images
+from mantidimaging.core.parallel import utility as pu
+from mantidimaging.core.utility.progress_reporting import Progress
+
+LOG = getLogger(__name__)
+
+# Number of decoded projections kept in memory before the whole stack is loaded
+DEFAULT_CACHE_SIZE = 32
+
+
+class LazyImages(Images):
+    """
+    A stack of projections that is only read from its files when it is needed.
+
+    Single projections (for browsing and previews) are decoded on demand and kept in a bounded
+    least-recently-used cache. Sinograms (for finding the COR) read one row from each file, without going
+    through the cache. The whole volume is loaded into a shared array the first time `data`, `projections`
+    or `sinograms` is accessed, e.g. when an operation or a reconstruction is applied to the stack.
+    """
+    def __init__(self,
+                 load_func: Callable[[str], np.ndarray],
+                 filenames: List[str],
+                 shape: Tuple[int, int, int],
+                 dtype=np.float32,
+                 indices: Optional[Tuple[int, int, int]] = None,
+                 cache_size: int = DEFAULT_CACHE_SIZE):
+        """
+        :param load_func: Function that decodes a single file into a 2D array
+        :param filenames: The files of the projections in the stack, in order
+        :param shape: The shape of the whole stack
+        :param dtype: The dtype of the stack
+        :param indices: Indices that were selected from the matched files
+        :param cache_size: The maximum number of decoded projections kept in memory
+        """
+        super().__init__(None, filenames, indices)
+        self._load_func = load_func
+        self._shape = shape
+        self._dtype = np.dtype(dtype)
+        self._cache_size = cache_size
+        self._cache: 'OrderedDict[int, np.ndarray]' = OrderedDict()
+        # previews and the loading of the whole stack can happen on different threads
+        self._lock = threading.RLock()
+        self._freed = False
+
+    @property
+    def is_loaded(self) -> bool:
+        """
+        Whether the whole stack has been loaded into memory
+        """
+        return self._data is not None
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self._data.shape if self._data is not None else self._shape
+
+    @property
+    def dtype(self):
+        return self._data.dtype if self._data is not None else self._dtype
+
+    def _load_if_needed(self):
+        if self._data is None and not self._freed:
+            self.load()
+
+    @property
+    def data(self) -> np.ndarray:
+        self._load_if_needed()
+        return self._data
+
+    @data.setter
+    def data(self, other: np.ndarray):
+        self.clear_sinogram_cache()
+        self._data = other
+
+    @property
+    def projections(self):
+        self._load_if_needed()
+        return super().projections
+
+    @property
+    def sinograms(self):
+        self._load_if_needed()
+        return super().sinograms
+
+    def _read(self, index: int) -> np.ndarray:
+        """
+        :return: The image as the load function returns it, e.g. a memory map of an uncompressed file
+        """
+        image = self._load_func(self._filenames[index])
+        if image.shape != self._shape[1:]:
+            raise ValueError(f"An image has different width and/or height dimensions! All images must have the "
+                             f"same dimensions. Expected dimensions: {self._shape[1:]}, file "
+                             f"{self._filenames[index]} has dimensions {image.shape}")
+        return image
+
+    def _decode(self, index: int) -> np.ndarray:
+        return self._read(index).astype(self._dtype, copy=False)
+
+    def _cached_projection(self, index: int) -> np.ndarray:
+        with self._lock:
+            if index in self._cache:
+                self._cache.move_to_end(index)
+                return self._cache[index]
+
+        image = self._decode(index)
+        with self._lock:
+            self._cache[index] = image
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return image
+
+    def projection(self, projection_idx) -> np.ndarray:
+        if self._data is not None:
+            return super().projection(projection_idx)
+        return self._cached_projection(range(self.num_images)[projection_idx])
+
+    def index_as_images(self, index) -> Images:
+        if self._data is not None:
+            return super().index_as_images(index)
+        return Images(np.asarray([self.projection(index)]), metadata=self.metadata)
+
+    def sino(self, slice_idx) -> np.ndarray:
+        if self._data is not None:
+            return super().sino(slice_idx)
+        # read one row from every projection, without keeping the whole stack in memory. The rows of
+        # uncompressed files are read through their memory maps, and the projections are not cached,
+        # so that reading a sinogram does not evict the projections being browsed
+        sino = np.empty((self.num_images, self.width), dtype=self.dtype)
+        for i in range(self.num_images):
+            with self._lock:
+                cached = self._cache.get(i)
+            sino[i] = cached[slice_idx] if cached is not None else self._read(i)[slice_idx]
+        return sino
+
+    def load(self, progress: Optional[Progress] = None) -> np.ndarray:
+        """
+        Load the whole stack into a shared array. Projections that are already cached are not decoded again.
+
+        :param progress: Progress instance to use for progress reporting (optional)
+        :return: The loaded data
+        """
+        with self._lock:
+            if self._data is not None:
+                return self._data
+
+            LOG.info(f"Loading all {self.num_images} images of the lazily loaded stack")
+            memory_filename = pu.create_shared_name(self._filenames[0])
+            data = pu.create_array(self._shape, self._dtype, memory_filename)
+            progress = Progress.ensure_instance(progress, num_steps=self.num_images, task_name='Load')
+            with progress:
+                for i in range(self.num_images):
+                    cached = self._cache.get(i)
+                    data[i] = cached if cached is not None else self._decode(i)
+                    progress.update(msg='Image')
+
+            self.memory_filename = memory_filename
+            self._data = data
+            self._cache.clear()
+            return data
+
+    def free_memory(self, delete_filename=True):
+        with self._lock:
+            self._cache.clear()
+            self._freed = True
+            super().free_memory(delete_filename)
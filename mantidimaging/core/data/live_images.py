@@ -0,0 +1,119 @@
+# Copyright (C) 2020 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+
+import threading
+from logging import getLogger
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from mantidimaging.core.data.images import Images
+from mantidimaging.core.parallel import utility as pu
+from mantidimaging.core.utility.data_containers import ProjectionAngles
+
+LOG = getLogger(__name__)
+
+# Number of projections a live stack has room for before its buffer grows
+DEFAULT_CAPACITY = 64
+
+
+class LiveImages(Images):
+    """
+    A stack of projections that grows while the scan is acquired.
+
+    The projections are written into a shared array that has room for more of them, so appending
+    does not copy the stack. `data` is the part of the array that holds the projections appended so far.
+    When the array is full it is replaced by one with twice the capacity.
+    """
+    def __init__(self,
+                 image_shape: Tuple[int, int],
+                 dtype=np.float32,
+                 capacity: int = DEFAULT_CAPACITY,
+                 expected_images: Optional[int] = None):
+        """
+        :param image_shape: The shape of each projection
+        :param dtype: The dtype of the stack
+        :param capacity: The number of projections to allocate memory for up front
+        :param expected_images: The number of projections in the whole scan, if it is known
+        """
+        memory_filename = pu.create_shared_name()
+        self._buffer = pu.create_array((max(capacity, 1), ) + tuple(image_shape), dtype, memory_filename)
+        # the part of the buffer holding the appended projections, unless the data has been replaced since
+        self._appended = self._buffer[:0]
+        super().__init__(self._appended, filenames=[], memory_filename=memory_filename)
+        self.expected_images = expected_images
+        # appends happen on the thread that watches the scan, while the stack is read by others
+        self._lock = threading.RLock()
+
+    @property
+    def capacity(self) -> int:
+        return self._buffer.shape[0] if self._buffer is not None else 0
+
+    @property
+    def is_complete(self) -> bool:
+        return self.expected_images is not None and self.num_images >= self.expected_images
+
+    def _grow(self, capacity: int):
+        LOG.info(f"Growing the live stack from {self.capacity} to {capacity} projections")
+        num_images = self.num_images
+        memory_filename = pu.create_shared_name()
+        buffer = pu.create_array((capacity, ) + self._buffer.shape[1:], self._buffer.dtype, memory_filename)
+        buffer[:num_images] = self._buffer[:num_images]
+
+        old_memory_filename = self.memory_filename
+        self._buffer = buffer
+        self.memory_filename = memory_filename
+        self._appended = self.data = buffer[:num_images]
+        if old_memory_filename is not None:
+            pu.delete_shared_array(old_memory_filename)
+
+    def reserve(self, count: int) -> np.ndarray:
+        """
+        Make room for the next projections, growing the buffer if needed.
+
+        :param count: The number of projections
+        :return: The rows of the buffer to write the projections into. They are added to the stack by `commit`
+        """
+        with self._lock:
+            if self._buffer is None or self._data is not self._appended:
+                raise RuntimeError("Projections can not be appended, the data of the live stack has been replaced")
+            needed = self.num_images + count
+            if needed > self.capacity:
+                self._grow(max(needed, 2 * self.capacity))
+            return self._buffer[self.num_images:needed]
+
+    def commit(self, filenames: List[str]) -> range:
+        """
+        Add the projections written into the reserved rows to the stack.
+
+        :param filenames: The files of the projections, in order
+        :return: The indices of the new projections
+        """
+        with self._lock:
+            start = self.num_images
+            self._appended = self.data = self._buffer[:start + len(filenames)]
+            # a new list, so that readers of the old one are not affected
+            self._filenames = self._filenames + list(filenames)
+            return range(start, self.num_images)
+
+    def append(self, images: np.ndarray, filenames: List[str]) -> range:
+        """
+        :param images: The new projections, as a 3D array
+        :param filenames: The files of the projections
+        :return: The indices of the new projections
+        """
+        with self._lock:
+            self.reserve(len(images))[:] = images
+            return self.commit(filenames)
+
+    def projection_angles(self, max_angle: float = 360.0) -> ProjectionAngles:
+        if self._log_file is None and self._projection_angles is None and self.expected_images:
+            # the angles of the projections acquired so far, spaced as in the whole scan
+            angles = np.linspace(0, np.deg2rad(max_angle), self.expected_images)
+            return ProjectionAngles(angles[:self.num_projections])
+        return super().projection_angles(max_angle)
+
+    def free_memory(self, delete_filename=True):
+        with self._lock:
+            self._buffer = None
+            super().free_memory(delete_filename)
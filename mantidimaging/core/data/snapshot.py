@@ -0,0 +1,135 @@
+# Copyright (C) 2020 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+
+import threading
+from copy import deepcopy
+from logging import getLogger
+from typing import Optional, Set
+
+import numpy as np
+
+from mantidimaging.core.data.images import Images
+from mantidimaging.core.parallel import utility as pu
+
+LOG = getLogger(__name__)
+
+
+class ImagesSnapshot:
+    """
+    Keeps the original data of a stack while an operation is applied to it, so that it can be restored.
+
+    With copy on write the parallel executors save each image just before they first modify it, so only
+    the images that are actually changed are kept. They are saved into the rows of an array of the size of the
+    stack, whose memory is only used by the rows that are written, so the array can be completed into the
+    original stack without another copy. If the operation replaces the data array instead
+    (e.g. crop), the original array is kept as it is. Operations that change the data in any other way
+    need a full copy of the stack, taken when the snapshot is created.
+    """
+    def __init__(self, images: Images, copy_on_write: bool = True):
+        """
+        :param images: The stack that the operation will be applied to
+        :param copy_on_write: Whether the operation only changes the data through the parallel executors,
+                              or by replacing the data array
+        """
+        self.images = images
+        self._original_data: Optional[np.ndarray] = images.data
+        self._original_metadata = deepcopy(images.metadata)
+        # the original images are saved in the rows of this array
+        self._saved_data: Optional[np.ndarray] = None
+        self._saved: Set[int] = set()
+        self._lock = threading.Lock()
+        self._copy: Optional[Images] = None
+        self._original_images: Optional[Images] = None
+
+        if copy_on_write:
+            pu.register_copy_on_write(self._original_data, self._save_slab)
+        else:
+            self._copy = images.copy()
+
+    def _save_slab(self, slab: slice):
+        with self._lock:
+            if self._saved_data is None:
+                self._saved_data = pu.create_array(self._original_data.shape, self._original_data.dtype)
+            for i in range(slab.start, slab.stop):
+                if i not in self._saved:
+                    self._saved_data[i] = self._original_data[i]
+                    self._saved.add(i)
+
+    @property
+    def num_saved_images(self) -> int:
+        return len(self._saved)
+
+    @property
+    def data_replaced(self) -> bool:
+        return self._copy is None and self.images.data is not self._original_data
+
+    def finish(self):
+        """
+        Stop saving the images once the operation has finished.
+        """
+        if self._original_data is not None:
+            pu.unregister_copy_on_write(self._original_data, self._save_slab)
+
+    def original_images(self) -> Images:
+        """
+        The stack as it was before the operation, e.g. to compare it with the new data.
+
+        Unless a full copy was taken or the data was replaced, the images that were not modified
+        are copied into the rows of the array holding the saved images, which is then used as the stack.
+        """
+        if self._copy is not None:
+            return self._copy
+        if self._original_images is None:
+            if self.data_replaced or not self._saved:
+                data = self._original_data
+            else:
+                self.finish()
+                data = self._saved_data
+                for i in range(len(data)):
+                    if i not in self._saved:
+                        data[i] = self._original_data[i]
+            self._original_images = Images(data,
+                                           self.images.filenames,
+                                           self.images.indices,
+                                           self._original_metadata,
+                                           sinograms=self.images.is_sinograms)
+        return self._original_images
+
+    def restore(self) -> Images:
+        """
+        Undo the operation. If the data was modified in place only the saved images are copied back.
+
+        :return: The images with the original data
+        """
+        self.finish()
+        if self._copy is not None:
+            return self._copy
+
+        if self.data_replaced:
+            LOG.info("Restoring the data array that was replaced by the operation")
+            self.images.free_memory()
+            self.images.data = self._original_data
+        else:
+            LOG.info(f"Restoring {len(self._saved)} images modified by the operation")
+            for i in self._saved:
+                self._original_data[i] = self._saved_data[i]
+            self.images.clear_sinogram_cache()
+        self.images.metadata = self._original_metadata
+        self._release()
+        return self.images
+
+    def discard(self):
+        """
+        Keep the new data and free the memory held by the snapshot.
+        """
+        self.finish()
+        if self._copy is not None:
+            self._copy.free_memory()
+            self._copy = None
+        self._release()
+
+    def _release(self):
+        self._saved.clear()
+        self._saved_data = None
+        self._original_images = None
+        self._original_data = None
@@ -2,8 +2,10 @@
 # SPDX - License - Identifier: GPL-3.0-or-later
 
 import io
+import tempfile
 from mantidimaging.core.utility.data_containers import ProjectionAngles
 import unittest
+from unittest import mock
 
 import numpy as np
 from six import StringIO
@@ -12,6 +14,8 @@ from mantidimaging.core.data import Images
 from mantidimaging.core.data.test.fake_logfile import generate_logfile
 from mantidimaging.core.operations.crop_coords import CropCoordinatesFilter
 from mantidimaging.core.operation_history import const
+from mantidimaging.core.parallel import utility as pu
+from mantidimaging.core.utility.memory_budget import MemoryBudgetError
 from mantidimaging.core.utility.sensible_roi import SensibleROI
 from mantidimaging.test_helpers.unit_test_helper import generate_images, assert_not_equals
 
@@ -77,6 +81,20 @@ class ImagesTest(unittest.TestCase):
         self.assertNotEqual(images.memory_filename, copy.memory_filename)
         self.assertNotEqual(images, copy)
 
+    @mock.patch("mantidimaging.core.parallel.utility.enough_memory", return_value=False)
+    def test_copy_stored_on_disk_when_not_enough_memory(self, _):
+        images = generate_images()
+        self.assertFalse(images.stored_on_disk)
+        with tempfile.TemporaryDirectory() as scratch_dir:
+            pu.set_scratch_directory(scratch_dir)
+            try:
+                copy = images.copy()
+                self.assertTrue(copy.stored_on_disk)
+                self.assertEqual(images, copy)
+                copy.free_memory()
+            finally:
+                pu.set_scratch_directory(None)
+
     def test_copy_flip_axes(self):
         images = generate_images(automatic_free=False)
         images.record_operation("Test", "Display", 123)
@@ -111,6 +129,14 @@ class ImagesTest(unittest.TestCase):
         self.assertNotEqual(images.memory_filename, cropped_copy.memory_filename)
         self.assertNotEqual(images, cropped_copy)
 
+    def test_copy_roi_reserves_memory(self):
+        images = generate_images()
+        with mock.patch("mantidimaging.core.data.images.memory_budget.reserve",
+                        side_effect=MemoryBudgetError("Not enough memory")) as reserve:
+            self.assertRaises(MemoryBudgetError, images.copy_roi, SensibleROI(0, 0, 5, 5))
+
+        reserve.assert_called_once_with(images.num_images * 5 * 5 * 4, "Copy ROI", spill_to_disk=True)
+
     def test_filenames_set(self):
         images = generate_images()
         with self.assertRaises(AssertionError):
@@ -213,3 +239,77 @@ class ImagesTest(unittest.TestCase):
         actual = images.projection_angles()
         self.assertEqual(10, len(actual.value))
         self.assertAlmostEqual(images.projection_angles().value, pangles.value, places=4)
+
+    def test_cache_sinograms(self):
+        images = generate_images()
+        self.assertTrue(images.cache_sinograms())
+        self.assertTrue(images.has_sinogram_cache)
+
+        np.testing.assert_equal(images.sino(3), images.data[:, 3])
+        self.assertTrue(images.sino(3).flags.c_contiguous)
+        self.assertIs(images.sinograms, images._sinogram_cache)
+
+    def test_sinogram_cache_invalidated_by_record_operation(self):
+        images = generate_images()
+        images.cache_sinograms()
+        images.data[:] += 1
+        images.record_operation("Test", "Display")
+
+        self.assertFalse(images.has_sinogram_cache)
+        np.testing.assert_equal(images.sino(3), images.data[:, 3])
+
+    def test_sinogram_cache_invalidated_by_data_replacement(self):
+        images = generate_images()
+        images.cache_sinograms()
+        images.data = np.zeros((2, 3, 4))
+
+        self.assertFalse(images.has_sinogram_cache)
+        np.testing.assert_equal(images.sino(1), np.zeros((2, 4)))
+
+    def test_sinograms_not_cached_for_sinogram_stack(self):
+        images = generate_images()
+        images._is_sinograms = True
+        self.assertTrue(images.cache_sinograms())
+        self.assertFalse(images.has_sinogram_cache)
+        self.assertIs(images.sinograms, images.data)
+
+    def test_sinograms_not_cached_without_memory(self):
+        images = generate_images()
+        with mock.patch("mantidimaging.core.data.images.pu.enough_memory", return_value=False):
+            self.assertFalse(images.cache_sinograms())
+        self.assertFalse(images.has_sinogram_cache)
+
+    def test_uncached_sinograms_are_a_view(self):
+        images = generate_images()
+
+        sinograms = images.sinograms
+
+        self.assertTrue(np.shares_memory(sinograms, images.data))
+        np.testing.assert_equal(sinograms, np.swapaxes(images.data, 0, 1))
+
+    def test_equal_stacks(self):
+        images = generate_images()
+        copy = images.copy()
+
+        self.assertEqual(images, copy)
+        copy.data[2, 0, 0] += 1
+        self.assertNotEqual(images, copy)
+
+    def test_stacks_with_different_metadata_are_not_compared_by_content(self):
+        images = generate_images()
+        copy = images.copy()
+        copy.record_operation("Test", "Display")
+
+        with mock.patch("mantidimaging.core.data.images.np.array_equal") as array_equal:
+            self.assertNotEqual(images, copy)
+        array_equal.assert_not_called()
+
+    def test_convert_dtype(self):
+        images = Images(pu.create_array((10, 8, 10), np.uint16))
+        images.data[:] = np.arange(8 * 10).reshape((8, 10))
+        original = np.copy(images.data)
+
+        images.convert_dtype(np.float32)
+
+        self.assertEqual(images.dtype, np.float32)
+        np.testing.assert_equal(images.data, original)
@@ -0,0 +1,64 @@
+# Copyright (C) 2020 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+
+import unittest
+
+import numpy as np
+import numpy.testing as npt
+
+from mantidimaging.core.data import LiveImages
+
+
+class LiveImagesTest(unittest.TestCase):
+    def setUp(self):
+        self.images = LiveImages((3, 4), capacity=2, expected_images=10)
+
+    def tearDown(self):
+        self.images.free_memory()
+
+    def test_empty(self):
+        self.assertEqual(self.images.shape, (0, 3, 4))
+        self.assertEqual(self.images.filenames, [])
+        self.assertFalse(self.images.is_complete)
+
+    def test_append_within_capacity_does_not_copy(self):
+        buffer = self.images._buffer
+        new_indices = self.images.append(np.ones((2, 3, 4)), ["a", "b"])
+
+        self.assertEqual(new_indices, range(0, 2))
+        self.assertIs(self.images._buffer, buffer)
+        self.assertEqual(self.images.shape, (2, 3, 4))
+        self.assertEqual(self.images.filenames, ["a", "b"])
+
+    def test_append_grows_buffer(self):
+        self.images.append(np.ones((2, 3, 4)), ["a", "b"])
+        first_memory_filename = self.images.memory_filename
+
+        new_indices = self.images.append(np.full((3, 3, 4), 2), ["c", "d", "e"])
+
+        self.assertEqual(new_indices, range(2, 5))
+        self.assertEqual(self.images.capacity, 5)
+        self.assertNotEqual(self.images.memory_filename, first_memory_filename)
+        npt.assert_equal(self.images.data[:, 0, 0], [1, 1, 2, 2, 2])
+
+    def test_sinogram_follows_appended_projections(self):
+        self.images.append(np.ones((2, 3, 4)), ["a", "b"])
+        self.assertEqual(self.images.sino(1).shape, (2, 4))
+
+        self.images.append(np.full((1, 3, 4), 2), ["c"])
+        npt.assert_equal(self.images.sino(1)[:, 0], [1, 1, 2])
+
+    def test_angles_spaced_as_in_whole_scan(self):
+        self.images.append(np.ones((3, 3, 4)), ["a", "b", "c"])
+
+        npt.assert_almost_equal(self.images.projection_angles(360).value, np.deg2rad([0, 40, 80]))
+
+    def test_can_not_append_after_data_is_replaced(self):
+        self.images.append(np.ones((2, 3, 4)), ["a", "b"])
+        self.images.data = np.zeros((2, 2, 2))
+
+        self.assertRaises(RuntimeError, self.images.append, np.ones((1, 3, 4)), ["c"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+# Copyright (C) 2020 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+
+import unittest
+from unittest import mock
+from copy import deepcopy
+
+import numpy as np
+import numpy.testing as npt
+
+from mantidimaging.core.data.snapshot import ImagesSnapshot
+from mantidimaging.core.operations.crop_coords import CropCoordinatesFilter
+from mantidimaging.core.parallel import shared_mem as psm
+from mantidimaging.core.parallel import utility as pu
+from mantidimaging.test_helpers.unit_test_helper import generate_images
+
+
+def _add_one(data):
+    data[:] += 1
+
+
+class ImagesSnapshotTest(unittest.TestCase):
+    @staticmethod
+    def _add_one_to_images(images, num_images):
+        # only the first num_images are dispatched to the executor
+        pu.execute_impl(num_images,
+                        psm.create_partial(_add_one, fwd_func=psm.inplace),
+                        1,
+                        2,
+                        None,
+                        "Add one",
+                        shared_arrays=[images.data],
+                        slab_kernel=True)
+
+    def test_only_modified_images_are_saved(self):
+        images = generate_images()
+        original = np.copy(images.data)
+        snapshot = ImagesSnapshot(images)
+
+        self._add_one_to_images(images, 3)
+        snapshot.finish()
+
+        self.assertEqual(snapshot.num_saved_images, 3)
+        npt.assert_equal(images.data[:3], original[:3] + 1)
+        npt.assert_equal(snapshot.original_images().data, original)
+
+        snapshot.restore()
+        npt.assert_equal(images.data, original)
+
+    def test_original_images_reuse_saved_images(self):
+        images = generate_images()
+        original = np.copy(images.data)
+        snapshot = ImagesSnapshot(images)
+
+        self._add_one_to_images(images, 3)
+        snapshot.finish()
+
+        with mock.patch.object(pu, "create_array", wraps=pu.create_array) as create_array:
+            npt.assert_equal(snapshot.original_images().data, original)
+        create_array.assert_not_called()
+        self.assertEqual(snapshot.num_saved_images, 3)
+
+        snapshot.restore()
+        npt.assert_equal(images.data, original)
+
+    def test_restore_in_place(self):
+        images = generate_images()
+        original = np.copy(images.data)
+        data = images.data
+        images.record_operation("Test", "Display")
+        metadata = deepcopy(images.metadata)
+        snapshot = ImagesSnapshot(images)
+
+        self._add_one_to_images(images, images.num_images)
+        images.record_operation("Test", "Display")
+        snapshot.finish()
+        npt.assert_equal(images.data, original + 1)
+
+        restored = snapshot.restore()
+
+        self.assertIs(restored, images)
+        self.assertIs(restored.data, data)
+        npt.assert_equal(restored.data, original)
+        self.assertEqual(restored.metadata, metadata)
+
+    def test_discard_keeps_new_data(self):
+        images = generate_images()
+        original = np.copy(images.data)
+        snapshot = ImagesSnapshot(images)
+
+        self._add_one_to_images(images, images.num_images)
+        snapshot.discard()
+
+        self.assertEqual(snapshot.num_saved_images, 0)
+        npt.assert_equal(images.data, original + 1)
+
+    def test_unmodified_stack_is_not_copied(self):
+        images = generate_images()
+        snapshot = ImagesSnapshot(images)
+        snapshot.finish()
+
+        self.assertEqual(snapshot.num_saved_images, 0)
+        self.assertIs(snapshot.original_images().data, images.data)
+
+    def test_changes_after_finish_are_not_saved(self):
+        images = generate_images()
+        snapshot = ImagesSnapshot(images)
+        snapshot.finish()
+
+        self._add_one_to_images(images, images.num_images)
+
+        self.assertEqual(snapshot.num_saved_images, 0)
+
+    def test_restore_replaced_data(self):
+        images = generate_images(automatic_free=False)
+        original = np.copy(images.data)
+        snapshot = ImagesSnapshot(images)
+
+        CropCoordinatesFilter.filter_func(images, [0, 0, 5, 5])
+        snapshot.finish()
+
+        self.assertTrue(snapshot.data_replaced)
+        self.assertEqual(snapshot.num_saved_images, 0)
+        npt.assert_equal(snapshot.original_images().data, original)
+
+        restored = snapshot.restore()
+        npt.assert_equal(restored.data, original)
+        self.assertIsNone(restored.memory_filename)
+
+    def test_full_copy_without_copy_on_write(self):
+        images = generate_images()
+        original = np.copy(images.data)
+        snapshot = ImagesSnapshot(images, copy_on_write=False)
+
+        images.data[:] += 1
+        snapshot.finish()
+
+        npt.assert_equal(snapshot.original_images().data, original)
+        npt.assert_equal(snapshot.restore().data, original)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -14,3 +14,9 @@ def mark_cropped(images: 'Images', roi: SensibleROI):
     from mantidimaging.core.operations.crop_coords import CropCoordinatesFilter
     # not ideal.. but it will allow to replicate the result accurately
     images.record_operation(CropCoordinatesFilter.__name__, CropCoordinatesFilter.filter_name, region_of_interest=roi)
+
+
+def mark_rebinned(images: 'Images', rebin_param: float, mode: str):
+    # avoids circular import error
+    from mantidimaging.core.operations.rebin import RebinFilter
+    images.record_operation(RebinFilter.__name__, RebinFilter.filter_name, rebin_param=rebin_param, mode=mode)
@@ -2,4 +2,4 @@
 # SPDX - License - Identifier: GPL-3.0-or-later
 
 from .loader import (  # noqa: F401
-    load, load_p, load_log, read_in_file_information, supported_formats)
+    load, load_lazy, load_p, load_log, read_in_file_information, supported_formats)
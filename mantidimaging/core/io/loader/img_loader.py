@@ -4,17 +4,77 @@
 This module handles the loading of FIT, FITS, TIF, TIFF
 """
 import os
+import threading
 from typing import Tuple, Optional, List
 
 import numpy as np
 
 from mantidimaging.core.data import Images
-from mantidimaging.core.io.utility import get_file_names, get_prefix
+from mantidimaging.core.data.utility import mark_cropped, mark_rebinned
+from mantidimaging.core.io.utility import decodes_into_output, get_file_names, get_prefix
 from mantidimaging.core.parallel import utility as pu
 from mantidimaging.core.utility.progress_reporting import Progress
+from mantidimaging.core.utility.sensible_roi import SensibleROI
 from . import stack_loader
 from ...data.dataset import Dataset
 
+# Number of files decoded concurrently
+DEFAULT_LOAD_WORKERS = pu.DEFAULT_IO_WORKERS
+
+# Interpolation mode of the binning done while loading, recorded with the Rebin operation
+BINNING_MODE = "reflect"
+
+
+def reduced_shape(shape: Tuple[int, int], roi: Optional[SensibleROI], binning: int) -> Tuple[int, int]:
+    """
+    The shape of an image after it is cropped to the ROI and binned, as the Rebin operation computes it,
+    so that replaying the recorded operations gives the same shape.
+    """
+    height, width = (roi.height, roi.width) if roi is not None else shape
+    if binning > 1:
+        # the same expression as the Rebin operation, which is given the factor 1 / binning
+        height, width = int(1 / binning * height), int(1 / binning * width)
+    return height, width
+
+
+def mark_reduced(images: Images, roi: Optional[SensibleROI], binning: int):
+    """
+    Record the crop and the binning applied while loading in the operation history, so that they can be replayed
+    """
+    if roi is not None:
+        mark_cropped(images, roi)
+    if binning > 1:
+        mark_rebinned(images, 1 / binning, BINNING_MODE)
+
+
+def write_binned(image: np.ndarray, out: np.ndarray, binning: int):
+    """
+    Write a decoded image into its row of the output, binned in the same way as the Rebin operation
+    so that it can be replayed
+    """
+    if binning > 1:
+        import skimage.transform
+        # the binning interpolates, so the image is binned in floating point like the Rebin operation
+        dtype = out.dtype if not pu.is_reduced_precision(out.dtype) else pu.COMPUTE_DTYPE
+        image = skimage.transform.resize(image.astype(dtype, copy=False), out.shape, mode=BINNING_MODE)
+    if np.issubdtype(out.dtype, np.integer) and not np.issubdtype(image.dtype, np.integer):
+        pu.cast_to_storage(image, out)
+    else:
+        out[...] = image
+
+
+def reduce_loaded(images: Images, roi: Optional[SensibleROI], binning: int, progress=None):
+    """
+    Crop and bin images that could not be reduced while they were decoded, e.g. those from a stack file.
+    The operations are not recorded, see mark_reduced
+    """
+    from mantidimaging.core.operations.crop_coords import CropCoordinatesFilter
+    from mantidimaging.core.operations.rebin import RebinFilter
+    if roi is not None:
+        CropCoordinatesFilter.filter_func(images, roi, progress=progress)
+    if binning > 1:
+        RebinFilter.filter_func(images, rebin_param=1 / binning, mode=BINNING_MODE, progress=progress)
+
 
 def execute(load_func,
             sample_path,
@@ -25,7 +85,10 @@ def execute(load_func,
             img_format,
             dtype,
             indices,
-            progress=None) -> Dataset:
+            progress=None,
+            workers: Optional[int] = None,
+            roi: Optional[SensibleROI] = None,
+            binning: int = 1) -> Dataset:
     """
     Reads a stack of images into memory, assuming dark and flat images
     are in separate directories.
@@ -41,6 +104,9 @@ def execute(load_func,
         '>f2' - float16
         '>f4' - float32
 
+    :param workers: Number of files decoded concurrently. If None, DEFAULT_LOAD_WORKERS is used
+    :param roi: Crop every image to this region as it is decoded
+    :param binning: Bin every image by this factor as it is decoded, after cropping it
     :returns: Images object
     """
 
@@ -56,9 +122,11 @@ def execute(load_func,
 
     # get the shape of all images
     img_shape = first_sample_img.shape
+    if roi is not None and (roi.right > img_shape[-1] or roi.bottom > img_shape[-2]):
+        raise ValueError(f"The ROI {roi} is outside of the images of shape {img_shape[-2:]}")
 
     # forward all arguments to internal class for easy re-usage
-    il = ImageLoader(load_func, img_format, img_shape, dtype, indices, progress)
+    il = ImageLoader(load_func, img_format, img_shape, dtype, indices, progress, workers, roi, binning)
 
     # we load the flat and dark first, because if they fail we don't want to
     # fail after we've loaded a big stack into memory
@@ -68,25 +136,44 @@ def execute(load_func,
     dark_after_data, dark_after_filenames, dark_after_mfname = il.load_data(dark_after_path)
     sample_data, sample_mfname = il.load_sample_data(chosen_input_filenames)
 
-    return Dataset(Images(sample_data, chosen_input_filenames, indices, memory_filename=sample_mfname),
-                   flat_before=Images(flat_before_data, flat_before_filenames, memory_filename=flat_before_mfname)
-                   if flat_before_data is not None else None,
-                   flat_after=Images(flat_after_data, flat_after_filenames, memory_filename=flat_after_mfname)
-                   if flat_after_data is not None else None,
-                   dark_before=Images(dark_before_data, dark_before_filenames, memory_filename=dark_before_mfname)
-                   if dark_before_data is not None else None,
-                   dark_after=Images(dark_after_data, dark_after_filenames, memory_filename=dark_after_mfname)
-                   if dark_after_data is not None else None)
+    dataset = Dataset(Images(sample_data, chosen_input_filenames, indices, memory_filename=sample_mfname),
+                      flat_before=Images(flat_before_data, flat_before_filenames, memory_filename=flat_before_mfname)
+                      if flat_before_data is not None else None,
+                      flat_after=Images(flat_after_data, flat_after_filenames, memory_filename=flat_after_mfname)
+                      if flat_after_data is not None else None,
+                      dark_before=Images(dark_before_data, dark_before_filenames, memory_filename=dark_before_mfname)
+                      if dark_before_data is not None else None,
+                      dark_after=Images(dark_after_data, dark_after_filenames, memory_filename=dark_after_mfname)
+                      if dark_after_data is not None else None)
+    for images in (dataset.sample, dataset.flat_before, dataset.flat_after, dataset.dark_before, dataset.dark_after):
+        if images is not None:
+            mark_reduced(images, roi, binning)
+    return dataset
 
 
 class ImageLoader(object):
-    def __init__(self, load_func, img_format, img_shape, data_dtype, indices, progress=None):
+    def __init__(self,
+                 load_func,
+                 img_format,
+                 img_shape,
+                 data_dtype,
+                 indices,
+                 progress=None,
+                 workers: Optional[int] = None,
+                 roi: Optional[SensibleROI] = None,
+                 binning: int = 1):
         self.load_func = load_func
         self.img_format = img_format
         self.img_shape = img_shape
         self.data_dtype = data_dtype
         self.indices = indices
         self.progress = progress
+        self.workers = workers if workers is not None else DEFAULT_LOAD_WORKERS
+        self.decodes_into_output = decodes_into_output(load_func)
+        self.roi = roi
+        self.binning = binning
+        # the images are decoded whole into a buffer of each thread, before they are cropped and binned
+        self._buffers = threading.local()
 
     def load_sample_data(self, input_file_names):
         # determine what the loaded data was
@@ -96,12 +183,15 @@ class ImageLoader(object):
             sample_data = self.load_files(input_file_names, memory_file_name), memory_file_name
         elif len(self.img_shape) == 3:
             # the loaded file was a file containing a stack of images
-            sample_data = stack_loader.execute(self.load_func,
-                                               input_file_names[0],
-                                               self.data_dtype,
-                                               "Sample",
-                                               self.indices,
-                                               progress=self.progress)
+            images = stack_loader.execute(self.load_func,
+                                          input_file_names[0],
+                                          self.data_dtype,
+                                          "Sample",
+                                          self.indices,
+                                          progress=self.progress,
+                                          shape=self.img_shape)
+            reduce_loaded(images, self.roi, self.binning, self.progress)
+            sample_data = images.data, images.memory_filename
         else:
             raise ValueError("Data loaded has invalid shape: {0}", self.img_shape)
 
@@ -114,29 +204,79 @@ class ImageLoader(object):
             return self.load_files(file_names, memory_file_name), file_names, memory_file_name
         return None, None, None
 
+    @property
+    def reduces_images(self) -> bool:
+        return self.roi is not None or self.binning > 1
+
+    def _decode_buffer(self, dtype) -> np.ndarray:
+        buffer = getattr(self._buffers, "buffer", None)
+        if buffer is None or buffer.dtype != dtype:
+            buffer = np.empty(self.img_shape, dtype)
+            self._buffers.buffer = buffer
+        return buffer
+
+    def _load_reduced(self, out: np.ndarray, in_file):
+        """
+        Decode the whole image, and write it into the output cropped and binned.
+        The binning is done in the same way as the Rebin operation, so that it can be replayed.
+        """
+        # the binning interpolates, so the image is binned in floating point like the Rebin operation
+        dtype = out.dtype if self.binning == 1 or not pu.is_reduced_precision(out.dtype) else pu.COMPUTE_DTYPE
+        if self.decodes_into_output:
+            image = self.load_func(in_file, out=self._decode_buffer(dtype))
+        else:
+            image = self.load_func(in_file)
+        if image.shape != self.img_shape:
+            raise ValueError(f"could not broadcast input array from shape {image.shape} into shape {self.img_shape}")
+
+        if self.roi is not None:
+            image = image[self.roi.top:self.roi.bottom, self.roi.left:self.roi.right]
+        write_binned(image, out, self.binning)
+
+    def _load_file(self, data, idx, in_file):
+        try:
+            if self.reduces_images:
+                self._load_reduced(data[idx], in_file)
+            elif self.decodes_into_output:
+                self.load_func(in_file, out=data[idx])
+            else:
+                data[idx, :] = self.load_func(in_file)
+        except ValueError as exc:
+            raise ValueError("An image has different width and/or height "
+                             "dimensions! All images must have the same "
+                             "dimensions. Expected dimensions: {0} Error "
+                             "message: {1}".format(self.img_shape, exc))
+        except IOError as exc:
+            raise RuntimeError("Could not load file {0}. Error details: " "{1}".format(in_file, exc))
+
     def _do_files_load_seq(self, data, files, name):
+        """
+        Decode the files into their rows of the data. With more than one worker the files are decoded
+        concurrently, but the progress is still reported in the order of the files.
+        """
         progress = Progress.ensure_instance(self.progress, num_steps=len(files), task_name=f'Load {name}')
 
         with progress:
-            for idx, in_file in enumerate(files):
-                try:
-                    data[idx, :] = self.load_func(in_file)
-                    progress.update(msg='Image')
-                except ValueError as exc:
-                    raise ValueError("An image has different width and/or height "
-                                     "dimensions! All images must have the same "
-                                     "dimensions. Expected dimensions: {0} Error "
-                                     "message: {1}".format(self.img_shape, exc))
-                except IOError as exc:
-                    raise RuntimeError("Could not load file {0}. Error details: " "{1}".format(in_file, exc))
+            pu.run_ordered(lambda idx: self._load_file(data, idx, files[idx]), len(files), self.workers, progress,
+                           'Image', f"Load {name}")
 
         return data
 
+    def load_files_into(self, data: np.ndarray, files: List[str], name=None) -> np.ndarray:
+        """
+        Decode the files into the rows of an existing array, e.g. the rows reserved in a growing stack
+
+        :param data: The array with a row for each file
+        :param files: The files to decode
+        :param name: The name used in the progress messages
+        """
+        return self._do_files_load_seq(data, files, name)
+
     def load_files(self, files, memory_name=None) -> np.ndarray:
         # Zeroing here to make sure that we can allocate the memory.
         # If it's not possible better crash here than later.
         num_images = len(files)
-        shape = (num_images, self.img_shape[0], self.img_shape[1])
+        shape = (num_images, ) + reduced_shape(self.img_shape, self.roi, self.binning)
         data = pu.create_array(shape, self.data_dtype, memory_name)
         return self._do_files_load_seq(data, files, memory_name)
 
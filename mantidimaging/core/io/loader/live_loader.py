@@ -0,0 +1,202 @@
+# Copyright (C) 2020 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+"""
+This module handles the loading of a scan while it is being acquired, by watching the directory the
+projections are written to.
+"""
+import os
+import threading
+from logging import getLogger
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from mantidimaging.core.data.live_images import DEFAULT_CAPACITY, LiveImages
+from mantidimaging.core.io.loader.img_loader import ImageLoader
+from mantidimaging.core.io.loader.loader import image_load_func, probe_image
+from mantidimaging.core.io.utility import DEFAULT_IO_FILE_FORMAT, get_file_names
+from mantidimaging.core.utility.progress_reporting import Progress
+
+LOG = getLogger(__name__)
+
+# Seconds between two listings of the watched directory
+DEFAULT_POLL_INTERVAL = 1.0
+
+# Called with the stack and the indices of the new projections, on the thread that watches the directory
+LiveListener = Callable[[LiveImages, range], None]
+
+
+class LiveLoader(object):
+    """
+    Watches the directory of a scan that is being acquired, and appends the projections to a `LiveImages`
+    stack as they are written.
+
+    The directory is polled, rather than watched with inotify, as inotify does not see the files written
+    by other machines to network file systems. A file is only read once its size and modification time
+    did not change between two polls, so that files that are still being written are not read.
+
+    The projection angles of a live stack follow the order of the files, so a file that sorts before
+    projections that are already loaded is skipped with a warning, rather than appended out of order.
+    """
+    def __init__(self,
+                 input_path: str,
+                 in_prefix: str = '',
+                 in_format: str = DEFAULT_IO_FILE_FORMAT,
+                 dtype=np.float32,
+                 expected_images: Optional[int] = None,
+                 capacity: Optional[int] = None,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 workers: Optional[int] = None):
+        """
+        :param input_path: The directory the projections are written to
+        :param in_prefix: Optional: Prefix of the projection files
+        :param in_format: Default:'tiff', format of the projection files
+        :param dtype: Default:np.float32, data type of the stack
+        :param expected_images: The number of projections in the whole scan. Watching stops once they are all loaded
+        :param capacity: The number of projections to allocate memory for up front.
+                         Defaults to the expected number of projections
+        :param poll_interval: Seconds between two listings of the directory
+        :param workers: Number of files decoded concurrently
+        """
+        self.input_path = input_path
+        self.in_prefix = in_prefix
+        self.in_format = in_format
+        self.dtype = dtype
+        self.expected_images = expected_images
+        self.capacity = capacity if capacity is not None else expected_images or DEFAULT_CAPACITY
+        self.poll_interval = poll_interval
+        self.workers = workers
+
+        self.images: Optional[LiveImages] = None
+        self._image_loader: Optional[ImageLoader] = None
+        # the size and modification time of the files that were not ready at the last poll
+        self._unready: Dict[str, Tuple[int, int]] = {}
+        # the files that appeared after later projections had been loaded
+        self.skipped_files: List[str] = []
+        self._listeners: List[LiveListener] = []
+        self._poll_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_listener(self, listener: LiveListener):
+        """
+        Register a function to call when new projections are appended, e.g. to update a preview
+        or the reconstruction of a slice
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: LiveListener):
+        self._listeners.remove(listener)
+
+    def _ready_files(self) -> List[str]:
+        """
+        The new files that are completely written, in order. The files after one that is still being written
+        are left for a later poll, so that the projections are always appended in order.
+        """
+        files = get_file_names(self.input_path, self.in_format, self.in_prefix, essential=False)
+        loaded = set(self.images.filenames) if self.images is not None else set()
+        # the files are sorted, so the new files before the last loaded one have arrived out of order
+        last_loaded = self.images.filenames[-1] if self.images is not None and self.images.filenames else None
+        num_before_last = files.index(last_loaded) if last_loaded in files else 0
+
+        ready = []
+        in_order = True
+        for position, filename in enumerate(files):
+            if filename in loaded or filename in self.skipped_files:
+                continue
+            if position < num_before_last:
+                LOG.warning(f"{filename} was written after the projections that follow it were loaded. "
+                            f"It is not added to the live stack, as its projection angle would be wrong")
+                self.skipped_files.append(filename)
+                continue
+            try:
+                stat = os.stat(filename)
+            except FileNotFoundError:
+                in_order = False
+                continue
+            signature = (stat.st_size, stat.st_mtime_ns)
+            if self._unready.get(filename) != signature:
+                # new, or changed since the last poll
+                self._unready[filename] = signature
+                in_order = False
+            elif in_order:
+                ready.append(filename)
+        return ready
+
+    def _create_images(self, first_file: str):
+        image_shape, _ = probe_image(first_file)
+        if len(image_shape) != 2:
+            raise ValueError(f"Only files containing a single image can be watched, found shape {image_shape}")
+        self.images = LiveImages(image_shape, self.dtype, self.capacity, self.expected_images)
+        self._image_loader = ImageLoader(image_load_func(self.in_format),
+                                         self.in_format,
+                                         image_shape,
+                                         self.dtype,
+                                         None,
+                                         Progress(task_name="Live load"),
+                                         workers=self.workers)
+
+    def poll(self) -> range:
+        """
+        Load the projections written since the last poll.
+
+        :return: The indices of the new projections
+        """
+        with self._poll_lock:
+            ready = self._ready_files()
+            if self.expected_images is not None:
+                loaded = self.images.num_images if self.images is not None else 0
+                ready = ready[:max(self.expected_images - loaded, 0)]
+            if not ready:
+                return range(0)
+
+            if self.images is None:
+                self._create_images(ready[0])
+            assert self.images is not None and self._image_loader is not None
+
+            rows = self.images.reserve(len(ready))
+            self._image_loader.load_files_into(rows, ready, "Live")
+            new_indices = self.images.commit(ready)
+            for filename in ready:
+                self._unready.pop(filename, None)
+            LOG.info(f"Appended {len(new_indices)} projections to the live stack of {self.input_path}, "
+                     f"it now has {self.images.num_images}")
+
+        for listener in list(self._listeners):
+            listener(self.images, new_indices)
+        return new_indices
+
+    @property
+    def is_watching(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """
+        Start polling the directory on a background thread
+        """
+        if self.is_watching:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name=f"Watch {self.input_path}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop polling the directory. The projections that were loaded stay in the stack.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _watch(self):
+        LOG.info(f"Watching {self.input_path} for new projections")
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception:
+                # e.g. a file that can not be decoded yet, it is read again at the next poll
+                LOG.exception(f"Failed to load the new projections from {self.input_path}")
+            if self.images is not None and self.images.is_complete:
+                LOG.info(f"All {self.expected_images} projections of {self.input_path} have been loaded")
+                break
+            self._stop.wait(self.poll_interval)
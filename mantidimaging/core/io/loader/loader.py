@@ -1,49 +1,191 @@
 # Copyright (C) 2020 ISIS Rutherford Appleton Laboratory UKRI
 # SPDX - License - Identifier: GPL-3.0-or-later
 
+import json
+import os
+import threading
 from dataclasses import dataclass
 from logging import getLogger
-from typing import Tuple, List
+from typing import Dict, Tuple, List, Optional
 
 import numpy as np
 
-from mantidimaging.core.data import Images
+from mantidimaging.core.data import Images, LazyImages
+from mantidimaging.core.data.lazy_images import DEFAULT_CACHE_SIZE
 from mantidimaging.core.data.dataset import Dataset
-from mantidimaging.core.io.loader import img_loader
+from mantidimaging.core.io.loader import img_loader, nexus_loader
 from mantidimaging.core.io.utility import (DEFAULT_IO_FILE_FORMAT, get_file_names)
+from mantidimaging.core.operation_history import const
+from mantidimaging.core.parallel import utility as pu
 from mantidimaging.core.utility.data_containers import ImageParameters
 from mantidimaging.core.utility.imat_log_file_parser import IMATLogFile
+from mantidimaging.core.utility.sensible_roi import SensibleROI
 
 LOG = getLogger(__name__)
 
+# Buffers that each loading thread decodes into when the image has to be converted to another dtype
+_decode_buffers = threading.local()
 
-def _fitsread(filename):
+# The information read by read_in_file_information, with the modification time of the directory it was read from
+_file_information_cache: Dict[Tuple[str, str, str], Tuple[int, 'FileInformation']] = {}
+_file_information_lock = threading.Lock()
+
+# The dtypes of the FITS BITPIX values, which are always stored big-endian
+FITS_BITPIX_DTYPES = {8: 'u1', 16: '>i2', 32: '>i4', 64: '>i8', -32: '>f4', -64: '>f8'}
+
+
+def _decode_buffer(shape: Tuple[int, ...], dtype) -> np.ndarray:
+    buffer = getattr(_decode_buffers, "buffer", None)
+    if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+        buffer = np.empty(shape, dtype)
+        _decode_buffers.buffer = buffer
+    return buffer
+
+
+def _copy_into(image: np.ndarray, out: np.ndarray) -> np.ndarray:
+    if image.shape != out.shape:
+        raise ValueError(f"could not broadcast input array from shape {image.shape} into shape {out.shape}")
+    if np.issubdtype(out.dtype, np.integer) and not np.issubdtype(image.dtype, np.integer):
+        # rounded and clipped into the storage dtype, without modifying the image
+        pu.cast_to_storage(image.astype(pu.COMPUTE_DTYPE), out)
+    else:
+        out[...] = image
+    return out
+
+
+def _tiff_memmap(filename) -> Optional[np.ndarray]:
+    import tifffile
+    with tifffile.TiffFile(filename) as tif:
+        series = tif.series[0]
+        # only set if the pixel data is uncompressed and stored contiguously
+        offset = series.dataoffset
+        if offset is None:
+            return None
+        dtype = np.dtype(series.dtype).newbyteorder(tif.byteorder)
+        shape = tuple(series.shape)
+    return np.memmap(filename, dtype=dtype, mode='r', offset=offset, shape=shape)
+
+
+def _fits_memmap(filename) -> Optional[np.ndarray]:
+    import astropy.io.fits as fits
+    with fits.open(filename, memmap=True, do_not_scale_image_data=True) as image:
+        if len(image) < 1:
+            raise RuntimeError("Could not load at least one FITS image/table file from: {0}".format(filename))
+        hdu = image[0]
+        header = hdu.header
+        # scaled data, e.g. uint16 stored with an offset, has to be converted by astropy
+        if header.get('BSCALE', 1) != 1 or header.get('BZERO', 0) != 0 or not hdu.shape:
+            return None
+        dtype = np.dtype(FITS_BITPIX_DTYPES[header['BITPIX']])
+        offset = hdu.fileinfo()['datLoc']
+        shape = tuple(hdu.shape)
+    return np.memmap(filename, dtype=dtype, mode='r', offset=offset, shape=shape)
+
+
+def _memmap(filename) -> Optional[np.ndarray]:
+    """
+    Map the pixel data of an uncompressed TIFF or FITS file read-only. Copying from the map reads the
+    file with large sequential reads, instead of going through the decoder.
+
+    :param filename: The TIFF or FITS file
+    :return: The read-only memory map, or None if the file is compressed or its pixel data is scaled
+    """
+    lower = filename.lower()
+    try:
+        if lower.endswith(('.tif', '.tiff')):
+            return _tiff_memmap(filename)
+        if lower.endswith(('.fits', '.fit')):
+            return _fits_memmap(filename)
+    except ImportError:
+        LOG.debug(f"No reader available to map {filename}")
+    return None
+
+
+def _fitsread(filename, out: Optional[np.ndarray] = None):
     """
     Read one image and return it as a 2d numpy array
 
     :param filename :: name of the image file, can be relative or absolute path
-    :param img_format: format of the image ('fits')
+    :param out: The array to write the image into, e.g. its row of the stack. The file is
+                closed afterwards, so nothing else keeps its memory map
     """
     import astropy.io.fits as fits
-    image = fits.open(filename)
-    if len(image) < 1:
-        raise RuntimeError("Could not load at least one FITS image/table file from: {0}".format(filename))
+    if out is None:
+        image = fits.open(filename)
+        if len(image) < 1:
+            raise RuntimeError("Could not load at least one FITS image/table file from: {0}".format(filename))
 
-    # get the image data
-    return image[0].data
+        # get the image data
+        return image[0].data
 
+    mapped = _fits_memmap(filename)
+    if mapped is not None:
+        return _copy_into(mapped, out)
 
-def _nxsread(filename):
-    import h5py
-    nexus = h5py.File(filename, 'r')
-    data = nexus["tomography/sample_data"]
-    return data
+    with fits.open(filename) as image:
+        if len(image) < 1:
+            raise RuntimeError("Could not load at least one FITS image/table file from: {0}".format(filename))
+        return _copy_into(image[0].data, out)
 
 
-def _imread(filename):
+def _tiffread_into(filename, out: np.ndarray) -> np.ndarray:
+    """
+    Decode a TIFF file straight into the output array, without allocating the image first.
+    If the output is in another dtype, uncompressed files are converted straight from their memory map,
+    and the others are decoded into a buffer reused by the thread and converted from there.
+    """
+    import tifffile
+    with tifffile.TiffFile(filename) as tif:
+        series = tif.series[0]
+        if tuple(series.shape) != out.shape:
+            raise ValueError(f"could not broadcast input array from shape {series.shape} into shape {out.shape}")
+        if series.dtype == out.dtype and out.flags.c_contiguous:
+            # uncompressed data is read with a single read into the output
+            tif.asarray(out=out)
+            return out
+        if series.dataoffset is not None:
+            mapped = np.memmap(filename,
+                               dtype=np.dtype(series.dtype).newbyteorder(tif.byteorder),
+                               mode='r',
+                               offset=series.dataoffset,
+                               shape=out.shape)
+            return _copy_into(mapped, out)
+        buffer = _decode_buffer(out.shape, series.dtype)
+        tif.asarray(out=buffer)
+    return _copy_into(buffer, out)
+
+
+def _imread(filename, out: Optional[np.ndarray] = None):
+    """
+    :param out: The array to write the image into, e.g. its row of the stack
+    """
+    if out is not None and filename.lower().endswith(('.tif', '.tiff')):
+        try:
+            return _tiffread_into(filename, out)
+        except ImportError:
+            LOG.debug("tifffile is not available, images are decoded through skimage")
+
     from mantidimaging.core.utility.special_imports import import_skimage_io
     skio = import_skimage_io()
-    return skio.imread(filename)
+    image = skio.imread(filename)
+    return _copy_into(image, out) if out is not None else image
+
+
+def _read_mapped(filename) -> np.ndarray:
+    """
+    Read one image for browsing. Uncompressed files are only mapped, so the pixels are not read until they are used.
+    """
+    mapped = _memmap(filename)
+    if mapped is not None:
+        return mapped
+    return _fitsread(filename) if filename.lower().endswith(('.fits', '.fit')) else _imread(filename)
+
+
+def image_load_func(in_format: str):
+    """
+    :return: The function that decodes a single image file of the format
+    """
+    return _fitsread if in_format in ['fits', 'fit'] else _imread
 
 
 def supported_formats():
@@ -62,9 +204,16 @@ def supported_formats():
     except ImportError:  # pragma: no cover
         fits_available = False  # pragma: no cover
 
+    try:
+        import h5py  # noqa: F401
+        h5py_available = True
+    except ImportError:  # pragma: no cover
+        h5py_available = False  # pragma: no cover
+
     avail_list = \
         (['fits', 'fit'] if fits_available else []) + \
-        (['tif', 'tiff'] if skio_available else [])
+        (['tif', 'tiff'] if skio_available else []) + \
+        (['nxs'] if h5py_available else [])
 
     return avail_list
 
@@ -74,45 +223,169 @@ class FileInformation:
     filenames: List[str]
     shape: Tuple[int, int, int]
     sinograms: bool
+    dtype: Optional[np.dtype] = None
+
+
+def _tiff_probe(filename) -> Tuple[Tuple[int, ...], np.dtype]:
+    import tifffile
+    with tifffile.TiffFile(filename) as tif:
+        series = tif.series[0]
+        return tuple(series.shape), np.dtype(series.dtype)
+
+
+def _fits_probe(filename) -> Tuple[Tuple[int, ...], np.dtype]:
+    import astropy.io.fits as fits
+    header = fits.getheader(filename)
+    # FITS axes are listed fastest varying first
+    shape = tuple(header[f"NAXIS{axis}"] for axis in range(header["NAXIS"], 0, -1))
+    dtype = np.dtype(FITS_BITPIX_DTYPES[header['BITPIX']]).newbyteorder('=')
+    bscale, bzero = header.get('BSCALE', 1), header.get('BZERO', 0)
+    if bscale != 1 or bzero != 0:
+        # the dtype that astropy scales the data to when it is read
+        if bscale == 1 and dtype.kind == 'i' and bzero == 2**(8 * dtype.itemsize - 1):
+            dtype = np.dtype(f"u{dtype.itemsize}")
+        else:
+            dtype = np.dtype(np.float32 if dtype.itemsize <= 2 else np.float64)
+    return shape, dtype
+
+
+def probe_image(filename) -> Tuple[Tuple[int, ...], np.dtype]:
+    """
+    Read the shape and dtype of the image in a file from its header, without decoding the pixel data.
+
+    :param filename: A TIFF, FITS or NeXus file
+    :return: The shape and dtype of the image, or of the sample stack for a NeXus file
+    """
+    lower = filename.lower()
+    if lower.endswith(('.tif', '.tiff')):
+        return _tiff_probe(filename)
+    if lower.endswith(('.fits', '.fit')):
+        return _fits_probe(filename)
+    if lower.endswith('.nxs'):
+        return nexus_loader.probe(filename)
+    raise ValueError(f"Can not read the header of {filename}, the format is not supported")
+
+
+def _read_file_information(input_path, in_prefix, in_format, data_dtype) -> FileInformation:
+    input_file_names = get_file_names(input_path, in_format, in_prefix)
+    try:
+        image_shape, image_dtype = probe_image(input_file_names[0])
+    except ImportError:
+        LOG.debug(f"No reader available for the header of {input_file_names[0]}, loading the first image")
+        dataset = load(input_path,
+                       in_prefix=in_prefix,
+                       in_format=in_format,
+                       dtype=data_dtype,
+                       indices=[0, 1, 1],
+                       file_names=input_file_names)
+        image_shape, image_dtype = dataset.sample.data[0].shape, dataset.sample.dtype
+        dataset.sample.free_memory()
+
+    if len(image_shape) == 3 and len(input_file_names) == 1:
+        # a single file holds the whole stack
+        shape = image_shape
+    else:
+        shape = (len(input_file_names), ) + tuple(image_shape[-2:])
+
+    sinograms = False
+    metadata_found_filenames = get_file_names(input_path, 'json', in_prefix, essential=False)
+    if metadata_found_filenames:
+        with open(metadata_found_filenames[0]) as f:
+            sinograms = json.load(f).get(const.SINOGRAMS, False)
+
+    return FileInformation(filenames=input_file_names, shape=shape, sinograms=sinograms, dtype=image_dtype)
 
 
 def read_in_file_information(input_path,
                              in_prefix='',
                              in_format=DEFAULT_IO_FILE_FORMAT,
                              data_dtype=np.float32) -> FileInformation:
+    """
+    Find the files of a stack and the shape of the stack, without loading it.
+
+    Only the header of the first file is read. The information is cached for each directory,
+    until files are added to or removed from it.
+
+    :param input_path: Path for the input data folder
+    :param in_prefix: Optional: Prefix for loaded files
+    :param in_format: Default:'tiff', format for the input images
+    :param data_dtype: The dtype the first image is loaded as, if its header can not be read
+    :return: The file names, the shape of the stack and whether it is sinograms
+    """
+    path = os.path.abspath(os.path.expanduser(input_path))
+    key = (path, in_prefix, in_format)
+    # the modification time of a directory changes when files are added, removed or renamed in it
+    modified = os.stat(path).st_mtime_ns
+    with _file_information_lock:
+        cached = _file_information_cache.get(key)
+    if cached is not None and cached[0] == modified:
+        return cached[1]
+
+    file_information = _read_file_information(path, in_prefix, in_format, data_dtype)
+    with _file_information_lock:
+        _file_information_cache[key] = (modified, file_information)
+    return file_information
+
+
+def load_lazy(input_path,
+              in_prefix='',
+              in_format=DEFAULT_IO_FILE_FORMAT,
+              dtype=np.float32,
+              indices=None,
+              cache_size=DEFAULT_CACHE_SIZE) -> LazyImages:
+    """
+    Prepares a stack of projections without loading it. Only the first image is read, to find the shape.
+    The other images are read when they are first needed.
+
+    This is for scripts and the reconstruction tools. The GUI loads stacks with `load_p`, as the stack
+    visualiser displays the whole array, which would load a lazy stack on the GUI thread.
+
+    :param input_path: Path for the input data folder
+    :param in_prefix: Optional: Prefix for loaded files
+    :param in_format: Default:'tiff', format for the input images
+    :param dtype: Default:np.float32, data type for the input images
+    :param indices: Specify which indices are loaded from the found files, as [start, stop, step]
+    :param cache_size: The maximum number of decoded images kept in memory before the whole stack is loaded
+    :return: The lazily loaded images
+    """
+    if in_format not in supported_formats():
+        raise ValueError("Image format {0} not supported!".format(in_format))
+
     input_file_names = get_file_names(input_path, in_format, in_prefix)
-    dataset = load(input_path,
-                   in_prefix=in_prefix,
-                   in_format=in_format,
-                   dtype=data_dtype,
-                   indices=[0, 1, 1],
-                   file_names=input_file_names)
-    images = dataset.sample
+    if indices:
+        input_file_names = input_file_names[indices[0]:indices[1]:indices[2]]
 
-    # construct and return the new shape
-    shape = (len(input_file_names), ) + images.data[0].shape
-    images.free_memory()
+    # uncompressed projections are read-only memory maps until the whole stack is loaded
+    load_func = _read_mapped
+    first_image = load_func(input_file_names[0])
+    if first_image.ndim != 2:
+        raise ValueError(f"Only files containing a single image can be loaded lazily, found shape {first_image.shape}")
 
-    fi = FileInformation(filenames=input_file_names, shape=shape, sinograms=images.is_sinograms)
-    return fi
+    shape = (len(input_file_names), ) + first_image.shape
+    images = LazyImages(load_func, input_file_names, shape, dtype, indices, cache_size)
+
+    metadata_found_filenames = get_file_names(input_path, 'json', in_prefix, essential=False)
+    if metadata_found_filenames:
+        with open(metadata_found_filenames[0]) as f:
+            images.load_metadata(f)
+    return images
 
 
 def load_log(log_file: str) -> IMATLogFile:
-    data = []
     with open(log_file, 'r') as f:
-        for line in f:
-            data.append(line.strip().split("   "))
+        # the rows are parsed as the file is read, so the lines are not all kept in memory
+        return IMATLogFile((line.strip().split("   ") for line in f), log_file)
 
-    return IMATLogFile(data, log_file)
 
-
-def load_p(parameters: ImageParameters, dtype, progress) -> Images:
+def load_p(parameters: ImageParameters, dtype, progress, roi: Optional[SensibleROI] = None, binning=1) -> Images:
     return load(input_path=parameters.input_path,
                 in_prefix=parameters.prefix,
                 in_format=parameters.format,
                 indices=parameters.indices,
                 dtype=dtype,
-                progress=progress).sample
+                progress=progress,
+                roi=roi,
+                binning=binning).sample
 
 
 def load(input_path=None,
@@ -125,7 +398,10 @@ def load(input_path=None,
          dtype=np.float32,
          file_names=None,
          indices=None,
-         progress=None) -> Dataset:
+         progress=None,
+         load_workers=None,
+         roi: Optional[SensibleROI] = None,
+         binning=1) -> Dataset:
     """
 
     Loads a stack, including sample, white and dark images.
@@ -144,6 +420,10 @@ def load(input_path=None,
                     filename, but removes all indices from the filenames list
                     that are not selected
     :param progress: The progress reporting instance
+    :param load_workers: Number of files decoded concurrently. If None, img_loader.DEFAULT_LOAD_WORKERS is used
+    :param roi: Crop all images to this region while they are loaded, instead of loading them whole
+    :param binning: Bin all images by this integer factor while they are loaded, after cropping them.
+                    Both are recorded in the operation history, as the Crop Coordinates and Rebin operations
     :return: a tuple with shape 3: (sample, flat, dark), if no flat and dark
              were loaded, they will be None
     """
@@ -153,24 +433,26 @@ def load(input_path=None,
     if indices and len(indices) < 3:
         raise ValueError("Indices at this point MUST have 3 elements: [start, stop, step]!")
 
+    if int(binning) != binning or binning < 1:
+        raise ValueError(f"The binning must be a positive integer, got {binning}")
+
     if not file_names:
         input_file_names = get_file_names(input_path, in_format, in_prefix)
     else:
         input_file_names = file_names
 
     if in_format in ['nxs']:
-        raise NotImplementedError("TODO this needs to be adapted to the new changes")
-        # pass only the first filename as we only expect a stack
-        # input_file = input_file_names[0]
-        # images = stack_loader.execute(_nxsread, input_file, dtype, "NXS Load", indices, progress)
+        # a single file contains the sample, flats and darks. They are cropped and binned as the file is read
+        dataset = nexus_loader.execute(input_file_names[0],
+                                       dtype,
+                                       indices,
+                                       roi,
+                                       progress=progress,
+                                       binning=int(binning))
     else:
-        if in_format in ['fits', 'fit']:
-            load_func = _fitsread
-        else:
-            load_func = _imread
-
-        dataset = img_loader.execute(load_func, input_file_names, input_path_flat_before, input_path_flat_after,
-                                     input_path_dark_before, input_path_dark_after, in_format, dtype, indices, progress)
+        dataset = img_loader.execute(image_load_func(in_format), input_file_names, input_path_flat_before,
+                                     input_path_flat_after, input_path_dark_before, input_path_dark_after, in_format,
+                                     dtype, indices, progress, load_workers, roi, int(binning))
 
     # Search for and load metadata file
     metadata_found_filenames = get_file_names(input_path, 'json', in_prefix, essential=False)
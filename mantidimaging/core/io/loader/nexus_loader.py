@@ -0,0 +1,234 @@
+# Copyright (C) 2020 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+"""
+This module handles the loading of NeXus/HDF5 files, either in the NXtomo format, where the sample,
+flat and dark frames are in one dataset marked by their image key, or in the format written by the saver.
+"""
+from functools import partial
+from logging import getLogger
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from mantidimaging.core.data import Images
+from mantidimaging.core.data.dataset import Dataset
+from mantidimaging.core.io.loader.img_loader import mark_reduced, reduced_shape, write_binned
+from mantidimaging.core.parallel import utility as pu
+from mantidimaging.core.utility.data_containers import ProjectionAngles
+from mantidimaging.core.utility.progress_reporting import Progress
+from mantidimaging.core.utility.sensible_roi import SensibleROI
+
+LOG = getLogger(__name__)
+
+# Values of the NXtomo image_key dataset
+SAMPLE_KEY = 0
+FLAT_KEY = 1
+DARK_KEY = 2
+
+NXTOMO_DATA = "instrument/detector/data"
+NXTOMO_IMAGE_KEY = "instrument/detector/image_key"
+NXTOMO_ROTATION_ANGLE = "sample/rotation_angle"
+
+# The datasets written by saver.write_nxs
+SAVER_DATA = "tomography/sample_data"
+SAVER_ROTATION_ANGLE = "tomography/rotation_angle"
+
+# Size of the slabs of frames read at once, if the dataset is not chunked
+READ_SLAB_BYTES = 64 * 1024 * 1024
+
+
+def _find_nxtomo_entry(nexus) -> Optional[str]:
+    for name, group in nexus.items():
+        if NXTOMO_DATA in group:
+            definition = group.get("definition")
+            if definition is None or _as_str(definition[()]) == "NXtomo":
+                return name
+    return None
+
+
+def _as_str(value) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+def _frame_runs(frames: np.ndarray) -> List[Tuple[int, int, int]]:
+    """
+    Split the frame indices into runs of consecutive frames, so that each run is read as one hyperslab.
+
+    :return: (first output index, first frame, number of frames) of each run
+    """
+    breaks = np.flatnonzero(np.diff(frames) != 1) + 1
+    starts = np.concatenate(([0], breaks))
+    stops = np.concatenate((breaks, [len(frames)]))
+    return [(int(start), int(frames[start]), int(stop - start)) for start, stop in zip(starts, stops)]
+
+
+def _read_frames(slab: slice,
+                 data: np.ndarray,
+                 file_name: str,
+                 dataset_path: str,
+                 frames: np.ndarray,
+                 roi: Optional[SensibleROI],
+                 binning: int = 1):
+    """
+    Read the frames of the slab of output images. Runs in the pool workers if the reads are parallel,
+    so the file is opened by each task. With binning, each frame is read into a buffer and binned
+    into the output, so the full resolution stack is never held in memory.
+    """
+    import h5py
+    rows = slice(roi.top, roi.bottom) if roi else slice(None)
+    columns = slice(roi.left, roi.right) if roi else slice(None)
+    with h5py.File(file_name, 'r') as nexus:
+        dataset = nexus[dataset_path]
+        for start, frame, count in _frame_runs(frames[slab]):
+            output_start = slab.start + start
+            source_sel = np.s_[frame:frame + count, rows, columns]
+            if binning == 1:
+                dataset.read_direct(data, source_sel=source_sel, dest_sel=np.s_[output_start:output_start + count])
+                continue
+            # the binning interpolates, so the frames are read in floating point like the Rebin operation
+            buffer_dtype = data.dtype if not pu.is_reduced_precision(data.dtype) else pu.COMPUTE_DTYPE
+            buffer = np.empty((roi.height, roi.width) if roi else dataset.shape[1:], buffer_dtype)
+            for i in range(count):
+                dataset.read_direct(buffer, source_sel=np.s_[frame + i, rows, columns])
+                write_binned(buffer, data[output_start + i], binning)
+
+
+def _load_frames(file_name: str,
+                 dataset,
+                 frames: np.ndarray,
+                 dtype,
+                 roi: Optional[SensibleROI],
+                 binning: int,
+                 parallel: bool,
+                 name: str,
+                 progress: Optional[Progress] = None) -> Optional[Images]:
+    if len(frames) == 0:
+        return None
+
+    height, width = dataset.shape[1:]
+    if roi is not None:
+        height, width = roi.height, roi.width
+    shape = (len(frames), ) + reduced_shape((height, width), roi, binning)
+    memory_filename = pu.create_shared_name(f"{file_name}-{name}")
+    data = pu.create_array(shape, dtype, memory_filename)
+
+    # each task reads whole chunks of the file where possible
+    frame_nbytes = height * width * dataset.dtype.itemsize
+    chunksize = dataset.chunks[0] if dataset.chunks else max(1, READ_SLAB_BYTES // max(frame_nbytes, 1))
+    pu.execute_impl(len(frames),
+                    partial(_read_frames,
+                            file_name=file_name,
+                            dataset_path=dataset.name,
+                            frames=frames,
+                            roi=roi,
+                            binning=binning),
+                    pu.get_cores() if parallel else 1,
+                    chunksize,
+                    progress,
+                    f"Load {name}",
+                    shared_arrays=[data],
+                    slab_kernel=True,
+                    backend=pu.Backend.PROCESS if parallel else pu.Backend.SERIAL)
+
+    images = Images(data, [file_name], memory_filename=memory_filename)
+    mark_reduced(images, roi, binning)
+    return images
+
+
+def _rotation_angles(angles_dataset, frames: np.ndarray, default_units: str) -> ProjectionAngles:
+    angles = np.asarray(angles_dataset[()], dtype=np.float64)[frames]
+    units = _as_str(angles_dataset.attrs.get("units", default_units))
+    return ProjectionAngles(angles if units.startswith("rad") else np.deg2rad(angles))
+
+
+def _open_data(nexus, file_name: str):
+    """
+    :return: The frames dataset, the image key of each frame, and the path and default units of the rotation angles
+    """
+    entry = _find_nxtomo_entry(nexus)
+    if entry is not None:
+        dataset = nexus[f"{entry}/{NXTOMO_DATA}"]
+        image_key = np.asarray(nexus[f"{entry}/{NXTOMO_IMAGE_KEY}"][()]) \
+            if f"{entry}/{NXTOMO_IMAGE_KEY}" in nexus else np.full(dataset.shape[0], SAMPLE_KEY)
+        # NXtomo angles are in degrees unless stated otherwise
+        return dataset, image_key, f"{entry}/{NXTOMO_ROTATION_ANGLE}", "degree"
+    if SAVER_DATA in nexus:
+        dataset = nexus[SAVER_DATA]
+        # the saver writes the projection angles of the stack, which are in radians
+        return dataset, np.full(dataset.shape[0], SAMPLE_KEY), SAVER_ROTATION_ANGLE, "rad"
+    raise RuntimeError(f"Could not find the NXtomo data in {file_name}")
+
+
+def probe(file_name: str) -> Tuple[Tuple[int, int, int], np.dtype]:
+    """
+    Read the shape and dtype of the sample frames from the file metadata, without reading any frames.
+
+    :return: The shape of the sample stack, and the dtype of the frames in the file
+    """
+    import h5py
+    with h5py.File(file_name, 'r') as nexus:
+        dataset, image_key, _, _ = _open_data(nexus, file_name)
+        num_sample = int(np.count_nonzero(image_key == SAMPLE_KEY))
+        return (num_sample, ) + tuple(dataset.shape[1:]), dataset.dtype
+
+
+def execute(file_name: str,
+            dtype=np.float32,
+            indices: Optional[List[int]] = None,
+            roi: Optional[SensibleROI] = None,
+            parallel: bool = False,
+            progress: Optional[Progress] = None,
+            binning: int = 1) -> Dataset:
+    """
+    Load the sample, flat and dark frames of a NeXus file, with the rotation angles of the sample.
+
+    The frames are read in hyperslabs straight into the shared arrays. Only the selected frames,
+    and only the pixels inside the ROI, are read from the file. Binned frames are read one at a time
+    and binned as they are read.
+
+    :param file_name: The NeXus file
+    :param dtype: The data type of the loaded images
+    :param indices: The [start, stop, step] of the sample frames to load. Flats and darks are always loaded
+    :param roi: Only load this region of each frame
+    :param parallel: Read independent slabs of frames in parallel, e.g. from a parallel file system
+    :param progress: The progress reporting instance
+    :param binning: Bin all frames by this integer factor, after cropping them
+    :return: The sample, and the flats and darks taken before and after it, if there are any
+    """
+    import h5py
+    with h5py.File(file_name, 'r') as nexus:
+        dataset, image_key, angles_path, angles_units = _open_data(nexus, file_name)
+
+        if roi is not None and (roi.right > dataset.shape[2] or roi.bottom > dataset.shape[1]):
+            raise ValueError(f"The ROI {roi} is outside of the images of shape {dataset.shape[1:]}")
+
+        sample_frames = np.flatnonzero(image_key == SAMPLE_KEY)
+        if len(sample_frames) == 0:
+            raise RuntimeError(f"No sample frames found in {file_name}")
+        if indices:
+            sample_frames = sample_frames[indices[0]:indices[1]:indices[2]]
+            if len(sample_frames) == 0:
+                raise ValueError(f"The indices {indices} do not select any of the sample frames in {file_name}")
+        first, last = sample_frames[0], sample_frames[-1]
+
+        def frames_with_key(key: int) -> Tuple[np.ndarray, np.ndarray]:
+            frames = np.flatnonzero(image_key == key)
+            return frames[frames < first], frames[frames > last]
+
+        flat_before, flat_after = frames_with_key(FLAT_KEY)
+        dark_before, dark_after = frames_with_key(DARK_KEY)
+
+        LOG.info(f"Loading {len(sample_frames)} sample, {len(flat_before) + len(flat_after)} flat and "
+                 f"{len(dark_before) + len(dark_after)} dark frames from {file_name}")
+        load = partial(_load_frames, file_name, dataset, dtype=dtype, roi=roi, binning=binning, parallel=parallel)
+        sample = load(sample_frames, name="Sample", progress=progress)
+        dataset_images = Dataset(sample,
+                                 flat_before=load(flat_before, name="Flat Before"),
+                                 flat_after=load(flat_after, name="Flat After"),
+                                 dark_before=load(dark_before, name="Dark Before"),
+                                 dark_after=load(dark_after, name="Dark After"))
+
+        if angles_path in nexus:
+            sample.set_projection_angles(_rotation_angles(nexus[angles_path], sample_frames, angles_units))
+        sample.indices = indices
+    return dataset_images
@@ -1,7 +1,10 @@
 # Copyright (C) 2020 ISIS Rutherford Appleton Laboratory UKRI
 # SPDX - License - Identifier: GPL-3.0-or-later
 
+from typing import Optional, Tuple
+
 from mantidimaging.core.data import Images
+from mantidimaging.core.io.utility import decodes_into_output
 from mantidimaging.core.parallel import utility as pu
 from mantidimaging.core.utility.progress_reporting import Progress
 
@@ -39,7 +42,13 @@ def do_stack_load_seq(data, new_data, img_shape, name, progress):
     return data
 
 
-def execute(load_func, file_name, dtype, name, indices=None, progress=None):
+def execute(load_func,
+            file_name,
+            dtype,
+            name,
+            indices=None,
+            progress=None,
+            shape: Optional[Tuple[int, int, int]] = None):
     """
     Load a single image FILE that is expected to be a stack of images.
 
@@ -54,9 +63,22 @@ def execute(load_func, file_name, dtype, name, indices=None, progress=None):
 
     :param dtype: data type for the output numpy array
 
+    :param shape: The shape of the whole stack in the file, if it is already known. If the load
+                  function can decode into an output array, and all images are loaded, the file
+                  is then decoded straight into the shared array
+
     :return: stack of images as a 3-elements tuple: numpy array with sample
              images, white image, and dark image.
     """
+    memory_filename = pu.create_shared_name(file_name)
+    if shape is not None and not indices and decodes_into_output(load_func):
+        progress = Progress.ensure_instance(progress, num_steps=1, task_name=name)
+        with progress:
+            data = pu.create_array(shape, dtype=dtype, name=memory_filename)
+            load_func(file_name, out=data)
+            progress.update(msg='Stack')
+        return Images(data, file_name, memory_filename=memory_filename)
+
     # create shared array
     new_data = load_func(file_name)
 
@@ -64,7 +86,7 @@ def execute(load_func, file_name, dtype, name, indices=None, progress=None):
         new_data = new_data[indices[0]:indices[1]:indices[2]]
 
     img_shape = new_data.shape
-    data = pu.create_array(img_shape, dtype=dtype, name=f"{file_name}-Stack")
+    data = pu.create_array(img_shape, dtype=dtype, name=memory_filename)
 
     # we could just move with data[:] = new_data[:] but then we don't get
     # loading bar information, and I doubt there's any performance gain
@@ -72,4 +94,4 @@ def execute(load_func, file_name, dtype, name, indices=None, progress=None):
 
     # Nexus doesn't load flat/dark images yet, if the functionality is
     # requested it should be changed here
-    return Images(data, file_name)
+    return Images(data, file_name, memory_filename=memory_filename)
@@ -0,0 +1,74 @@
+# Copyright (C) 2020 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+import numpy.testing as npt
+
+from mantidimaging.core.io.loader.img_loader import ImageLoader
+from mantidimaging.core.utility.progress_reporting import Progress
+
+
+def _load_number(filename):
+    # the later files are decoded faster, so they finish out of order
+    number = int(filename)
+    time.sleep(0.001 * (10 - number))
+    return np.full((3, 4), number, dtype=np.float32)
+
+
+class ImageLoaderTest(unittest.TestCase):
+    def test_files_loaded_concurrently_in_order(self):
+        files = [str(i) for i in range(10)]
+        progress = Progress(num_steps=len(files))
+        il = ImageLoader(_load_number, "tiff", (3, 4), np.float32, None, progress, workers=4)
+
+        with mock.patch.object(progress, "update", wraps=progress.update) as update:
+            data = il.load_files(files)
+
+        for i in range(10):
+            npt.assert_equal(data[i], i)
+        self.assertEqual(update.call_args_list.count(mock.call(msg='Image')), len(files))
+
+    def test_sequential_load_with_one_worker(self):
+        files = [str(i) for i in range(3)]
+        il = ImageLoader(_load_number, "tiff", (3, 4), np.float32, None, workers=1)
+
+        with mock.patch("mantidimaging.core.parallel.utility.ThreadPoolExecutor") as executor:
+            data = il.load_files(files)
+
+        executor.assert_not_called()
+        npt.assert_equal(data[2], 2)
+
+    def test_files_decoded_into_rows(self):
+        def load_func(filename, out=None):
+            out[:] = int(filename)
+            return out
+
+        il = ImageLoader(load_func, "tiff", (3, 4), np.float32, None, workers=2)
+
+        data = il.load_files(["4", "5"])
+
+        npt.assert_equal(data[0], 4)
+        npt.assert_equal(data[1], 5)
+
+    def test_failed_file_stops_loading(self):
+        def load_func(filename):
+            if filename == "3":
+                raise IOError("Broken file")
+            return _load_number(filename)
+
+        il = ImageLoader(load_func, "tiff", (3, 4), np.float32, None, workers=4)
+
+        self.assertRaisesRegex(RuntimeError, "Could not load file 3", il.load_files, [str(i) for i in range(10)])
+
+    def test_different_image_shape(self):
+        il = ImageLoader(lambda _: np.zeros((5, 5)), "tiff", (3, 4), np.float32, None, workers=2)
+
+        self.assertRaisesRegex(ValueError, "different width and/or height", il.load_files, ["0", "1"])
+
+
+if __name__ == '__main__':
+    unittest.main()
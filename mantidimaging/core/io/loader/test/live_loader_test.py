@@ -0,0 +1,95 @@
+# Copyright (C) 2020 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import numpy.testing as npt
+import tifffile
+
+from mantidimaging.core.io.loader.live_loader import LiveLoader
+
+
+class LiveLoaderTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.live_loader = LiveLoader(self.tmpdir.name, "image", expected_images=4, capacity=2, poll_interval=0.01)
+
+    def tearDown(self):
+        self.live_loader.stop()
+        if self.live_loader.images is not None:
+            self.live_loader.images.free_memory()
+        self.tmpdir.cleanup()
+
+    def _write(self, *numbers):
+        for number in numbers:
+            tifffile.imwrite(os.path.join(self.tmpdir.name, f"image_{number}.tif"),
+                             np.full((3, 4), number, dtype=np.uint16))
+
+    def test_files_loaded_once_they_are_written(self):
+        self._write(0, 1)
+        # the files are only read once they have not changed since the previous poll
+        self.assertEqual(self.live_loader.poll(), range(0))
+        self.assertEqual(self.live_loader.poll(), range(0, 2))
+
+        self._write(2)
+        self.live_loader.poll()
+        self.assertEqual(self.live_loader.poll(), range(2, 3))
+
+        images = self.live_loader.images
+        self.assertEqual(images.dtype, np.float32)
+        npt.assert_equal(images.data[:, 0, 0], [0, 1, 2])
+        self.assertEqual([os.path.basename(f) for f in images.filenames], ["image_0.tif", "image_1.tif", "image_2.tif"])
+
+    def test_file_being_written_is_not_loaded(self):
+        self._write(0, 1)
+        self.live_loader.poll()
+        # image_1 is still being written
+        self._write(1)
+        os.utime(os.path.join(self.tmpdir.name, "image_1.tif"), ns=(0, 0))
+
+        self.assertEqual(self.live_loader.poll(), range(0, 1))
+        self.assertEqual(self.live_loader.poll(), range(1, 2))
+
+    def test_file_arriving_out_of_order_is_skipped(self):
+        self._write(0, 2)
+        self.live_loader.poll()
+        self.live_loader.poll()
+        # image_1 sorts before image_2, which is already in the stack
+        self._write(1, 3)
+
+        with self.assertLogs("mantidimaging.core.io.loader.live_loader", "WARNING"):
+            self.live_loader.poll()
+        self.assertEqual(self.live_loader.poll(), range(2, 3))
+        self.assertEqual(self.live_loader.poll(), range(0))
+
+        npt.assert_equal(self.live_loader.images.data[:, 0, 0], [0, 2, 3])
+        self.assertEqual([os.path.basename(f) for f in self.live_loader.skipped_files], ["image_1.tif"])
+
+    def test_listeners_notified_of_new_projections(self):
+        listener = mock.Mock()
+        self.live_loader.add_listener(listener)
+        self._write(0, 1)
+
+        self.live_loader.poll()
+        listener.assert_not_called()
+        self.live_loader.poll()
+
+        listener.assert_called_once_with(self.live_loader.images, range(0, 2))
+
+    def test_watching_stops_when_scan_is_complete(self):
+        self._write(0, 1, 2, 3, 4)
+
+        self.live_loader.start()
+        self.live_loader._thread.join(5)
+
+        self.assertFalse(self.live_loader.is_watching)
+        self.assertEqual(self.live_loader.images.num_images, 4)
+        self.assertTrue(self.live_loader.images.is_complete)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,186 @@
 # Copyright (C) 2020 ISIS Rutherford Appleton Laboratory UKRI
 # SPDX - License - Identifier: GPL-3.0-or-later
 
+import json
+import os
+import tempfile
 import unittest
+from unittest import mock
 
+import numpy as np
+import numpy.testing as npt
+import tifffile
+from astropy.io import fits
+
+from mantidimaging.core.operation_history import const
 from mantidimaging.core.io import loader
+from mantidimaging.core.io.loader.img_loader import BINNING_MODE
+from mantidimaging.core.io.loader import stack_loader
+from mantidimaging.core.io.loader.loader import _fitsread, _imread, _memmap, probe_image
+from mantidimaging.core.operations.crop_coords import CropCoordinatesFilter
+from mantidimaging.core.operations.rebin import RebinFilter
+from mantidimaging.core.utility.sensible_roi import SensibleROI
 
 
 class LoaderTest(unittest.TestCase):
     def test_raise_on_invalid_format(self):
         self.assertRaises(ValueError, loader.load, "/some/path", file_names=["/somefile"], in_format='txt')
+
+    def test_tiff_decoded_into_output(self):
+        image = np.arange(12, dtype=np.float32).reshape((3, 4))
+        out = np.zeros((2, 3, 4), dtype=np.float32)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "image_0.tif")
+            tifffile.imwrite(filename, image)
+
+            self.assertIs(_imread(filename, out=out[1]).base, out)
+
+        npt.assert_equal(out[1], image)
+        npt.assert_equal(out[0], 0)
+
+    def test_tiff_decoded_into_output_of_other_dtype(self):
+        image = np.array([[1.4, 1.6], [-1, 70000]], dtype=np.float32)
+        as_float = np.zeros((2, 2), dtype=np.float64)
+        as_uint16 = np.zeros((2, 2), dtype=np.uint16)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "image_0.tif")
+            tifffile.imwrite(filename, image)
+
+            _imread(filename, out=as_float)
+            _imread(filename, out=as_uint16)
+
+        npt.assert_equal(as_float, image)
+        npt.assert_equal(as_uint16, [[1, 2], [0, 65535]])
+
+    def test_tiff_of_other_shape(self):
+        out = np.zeros((4, 4), dtype=np.float32)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "image_0.tif")
+            tifffile.imwrite(filename, np.zeros((3, 4), dtype=np.float32))
+
+            self.assertRaises(ValueError, _imread, filename, out=out)
+
+    def test_stack_file_decoded_into_shared_array(self):
+        stack = np.arange(2 * 3 * 4, dtype=np.uint16).reshape((2, 3, 4))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "stack.tif")
+            tifffile.imwrite(filename, stack)
+
+            images = stack_loader.execute(_imread, filename, np.float32, "Stack", shape=stack.shape)
+
+        self.assertEqual(images.dtype, np.float32)
+        npt.assert_equal(images.data, stack)
+        self.assertIsNotNone(images.memory_filename)
+        images.free_memory()
+
+    def test_uncompressed_tiff_is_mapped(self):
+        image = np.arange(12, dtype=np.uint16).reshape((3, 4))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "image_0.tif")
+            tifffile.imwrite(filename, image, byteorder='>')
+
+            mapped = _memmap(filename)
+            self.assertIsInstance(mapped, np.memmap)
+            self.assertFalse(mapped.flags.writeable)
+            npt.assert_equal(mapped, image)
+            del mapped
+
+    def test_compressed_tiff_is_not_mapped(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "image_0.tif")
+            tifffile.imwrite(filename, np.zeros((3, 4), dtype=np.uint16), compression='zlib')
+
+            self.assertIsNone(_memmap(filename))
+
+    def test_fits_is_mapped(self):
+        image = np.arange(12, dtype=np.float32).reshape((3, 4))
+        out = np.zeros((3, 4), dtype=np.float32)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "image_0.fits")
+            fits.PrimaryHDU(image).writeto(filename)
+
+            mapped = _memmap(filename)
+            self.assertIsInstance(mapped, np.memmap)
+            npt.assert_equal(mapped, image)
+            del mapped
+            _fitsread(filename, out=out)
+
+        npt.assert_equal(out, image)
+
+    def test_scaled_fits_is_not_mapped(self):
+        image = np.array([[0, 40000]], dtype=np.uint16)
+        out = np.zeros((1, 2), dtype=np.float32)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "image_0.fits")
+            fits.PrimaryHDU(image).writeto(filename)
+
+            self.assertIsNone(_memmap(filename))
+            _fitsread(filename, out=out)
+
+        npt.assert_equal(out, image)
+
+    def test_images_cropped_and_binned_while_loading(self):
+        rng = np.random.default_rng(0)
+        images = rng.random((3, 10, 12)).astype(np.float32)
+        roi = SensibleROI(1, 2, 11, 9)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for i, image in enumerate(images):
+                tifffile.imwrite(os.path.join(tmpdir, f"image_{i}.tif"), image)
+
+            reduced = loader.load(tmpdir, in_prefix="image", roi=roi, binning=2, load_workers=2).sample
+            whole = loader.load(tmpdir, in_prefix="image").sample
+
+        # the recorded operations reproduce the loaded images
+        operations = [op["name"] for op in reduced.metadata[const.OPERATION_HISTORY]]
+        self.assertEqual(operations, [CropCoordinatesFilter.__name__, RebinFilter.__name__])
+        CropCoordinatesFilter.filter_func(whole, roi)
+        RebinFilter.filter_func(whole, rebin_param=0.5, mode=BINNING_MODE)
+        self.assertEqual(reduced.data.shape, (3, 3, 5))
+        npt.assert_allclose(reduced.data, whole.data, rtol=1e-6)
+
+        reduced.free_memory()
+        whole.free_memory()
+
+    def test_probe_tiff_header(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "image_0.tif")
+            tifffile.imwrite(filename, np.zeros((3, 4), dtype=np.uint16))
+
+            self.assertEqual(probe_image(filename), ((3, 4), np.uint16))
+
+    def test_probe_fits_header(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "image_0.fits")
+            fits.PrimaryHDU(np.zeros((3, 4), dtype=np.float32)).writeto(filename)
+            scaled_filename = os.path.join(tmpdir, "image_1.fits")
+            fits.PrimaryHDU(np.zeros((3, 4), dtype=np.uint16)).writeto(scaled_filename)
+
+            self.assertEqual(probe_image(filename), ((3, 4), np.float32))
+            self.assertEqual(probe_image(scaled_filename), ((3, 4), np.uint16))
+
+    def test_file_information_read_from_header_and_cached(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for i in range(3):
+                tifffile.imwrite(os.path.join(tmpdir, f"image_{i}.tif"), np.zeros((3, 4), dtype=np.float32))
+            with open(os.path.join(tmpdir, "image.json"), "w") as f:
+                json.dump({const.SINOGRAMS: True}, f)
+
+            with mock.patch("mantidimaging.core.io.loader.loader.load") as load, \
+                    mock.patch("mantidimaging.core.io.loader.loader.probe_image", wraps=probe_image) as probe:
+                file_information = loader.read_in_file_information(tmpdir, in_prefix="image")
+                self.assertIs(loader.read_in_file_information(tmpdir, in_prefix="image"), file_information)
+                self.assertEqual(probe.call_count, 1)
+                load.assert_not_called()
+
+                self.assertEqual(file_information.shape, (3, 3, 4))
+                self.assertEqual(file_information.dtype, np.float32)
+                self.assertTrue(file_information.sinograms)
+
+                # adding a file to the directory invalidates the cached information
+                tifffile.imwrite(os.path.join(tmpdir, "image_3.tif"), np.zeros((3, 4), dtype=np.float32))
+                os.utime(tmpdir, ns=(0, os.stat(tmpdir).st_mtime_ns + 1))
+                self.assertEqual(loader.read_in_file_information(tmpdir, in_prefix="image").shape, (4, 3, 4))
+
+    def test_invalid_binning(self):
+        self.assertRaises(ValueError, loader.load, "/some/path", file_names=["/somefile"], binning=1.5)
+        self.assertRaises(ValueError, loader.load, "/some/path", file_names=["/somefile"], binning=0)
@@ -0,0 +1,110 @@
+# Copyright (C) 2020 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import h5py
+import numpy as np
+import numpy.testing as npt
+
+from mantidimaging.core.io import loader
+from mantidimaging.core.io.loader import nexus_loader
+from mantidimaging.core.data import Images
+from mantidimaging.core.io.loader.img_loader import BINNING_MODE
+from mantidimaging.core.io.loader.nexus_loader import DARK_KEY, FLAT_KEY, SAMPLE_KEY
+from mantidimaging.core.operation_history import const
+from mantidimaging.core.operations.crop_coords import CropCoordinatesFilter
+from mantidimaging.core.operations.rebin import RebinFilter
+from mantidimaging.core.utility.sensible_roi import SensibleROI
+
+# 2 darks and 2 flats before the sample, 1 flat after it
+IMAGE_KEY = [DARK_KEY] * 2 + [FLAT_KEY] * 2 + [SAMPLE_KEY] * 10 + [FLAT_KEY]
+
+
+class NexusLoaderTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.tmpdir.name, "scan.nxs")
+        # each frame is filled with its index in the file
+        self.data = np.repeat(np.arange(len(IMAGE_KEY), dtype=np.uint16), 6 * 8).reshape((len(IMAGE_KEY), 6, 8))
+        self.angles = np.concatenate((np.zeros(4), np.linspace(0, 180, 10), [180]))
+        with h5py.File(self.file_name, 'w') as nexus:
+            entry = nexus.create_group("entry")
+            entry["definition"] = "NXtomo"
+            entry.create_dataset("instrument/detector/data", data=self.data, chunks=(3, 6, 8))
+            entry["instrument/detector/image_key"] = IMAGE_KEY
+            entry["sample/rotation_angle"] = self.angles
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_frames_split_by_image_key(self):
+        dataset = nexus_loader.execute(self.file_name)
+
+        npt.assert_equal(dataset.sample.data, self.data[4:14])
+        self.assertEqual(dataset.sample.dtype, np.float32)
+        npt.assert_equal(dataset.dark_before.data, self.data[0:2])
+        npt.assert_equal(dataset.flat_before.data, self.data[2:4])
+        npt.assert_equal(dataset.flat_after.data, self.data[14:])
+        self.assertIsNone(dataset.dark_after)
+        npt.assert_almost_equal(dataset.sample.projection_angles().value, np.deg2rad(self.angles[4:14]))
+
+    def test_indices_and_roi(self):
+        roi = SensibleROI(1, 2, 5, 4)
+        dataset = nexus_loader.execute(self.file_name, indices=[1, 9, 3], roi=roi)
+
+        npt.assert_equal(dataset.sample.data, self.data[[5, 8, 11], 2:4, 1:5])
+        npt.assert_equal(dataset.flat_before.data, self.data[2:4, 2:4, 1:5])
+        npt.assert_almost_equal(dataset.sample.projection_angles().value, np.deg2rad(self.angles[[5, 8, 11]]))
+        self.assertEqual(dataset.sample.indices, [1, 9, 3])
+
+    def test_frames_cropped_and_binned_while_reading(self):
+        file_name = os.path.join(self.tmpdir.name, "random.nxs")
+        frames = np.random.default_rng(0).random((4, 10, 12)).astype(np.float32)
+        with h5py.File(file_name, 'w') as nexus:
+            nexus["tomography/sample_data"] = frames
+        roi = SensibleROI(1, 2, 11, 9)
+
+        with mock.patch("mantidimaging.core.io.loader.img_loader.reduce_loaded") as reduce_loaded:
+            sample = loader.load(file_names=[file_name], in_format='nxs', roi=roi, binning=2).sample
+        reduce_loaded.assert_not_called()
+
+        # the recorded operations reproduce the loaded frames
+        operations = [op["name"] for op in sample.metadata[const.OPERATION_HISTORY]]
+        self.assertEqual(operations, [CropCoordinatesFilter.__name__, RebinFilter.__name__])
+        whole = Images(frames.copy())
+        CropCoordinatesFilter.filter_func(whole, roi)
+        RebinFilter.filter_func(whole, rebin_param=0.5, mode=BINNING_MODE)
+        self.assertEqual(sample.data.shape, (4, 3, 5))
+        npt.assert_allclose(sample.data, whole.data, rtol=1e-6)
+
+    def test_parallel_reads(self):
+        dataset = nexus_loader.execute(self.file_name, parallel=True)
+
+        npt.assert_equal(dataset.sample.data, self.data[4:14])
+
+    def test_roi_outside_of_images(self):
+        self.assertRaises(ValueError, nexus_loader.execute, self.file_name, roi=SensibleROI(0, 0, 9, 6))
+
+    def test_probe(self):
+        self.assertEqual(nexus_loader.probe(self.file_name), ((10, 6, 8), np.uint16))
+
+    def test_frame_runs(self):
+        self.assertEqual(nexus_loader._frame_runs(np.array([4, 5, 6, 9, 11, 12])), [(0, 4, 3), (3, 9, 1), (4, 11, 2)])
+
+    def test_load_file_written_by_saver(self):
+        file_name = os.path.join(self.tmpdir.name, "saved.nxs")
+        with h5py.File(file_name, 'w') as nexus:
+            nexus["tomography/sample_data"] = self.data[:3]
+
+        dataset = loader.load(file_names=[file_name], in_format='nxs')
+
+        npt.assert_equal(dataset.sample.data, self.data[:3])
+        self.assertIsNone(dataset.flat_before)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,13 +3,14 @@
 
 import os
 from logging import getLogger
-from typing import List, Union
+from typing import List, Optional, Union
 
 import numpy as np
 
 from .utility import DEFAULT_IO_FILE_FORMAT
 from ..data.images import Images
 from ..operations.rescale import RescaleFilter
+from ..parallel import utility as pu
 from ..utility.progress_reporting import Progress
 
 LOG = getLogger(__name__)
@@ -63,7 +64,8 @@ def save(images: Images,
          name_postfix=DEFAULT_NAME_POSTFIX,
          indices=None,
          pixel_depth=None,
-         progress=None) -> Union[str, List[str]]:
+         progress=None,
+         workers: Optional[int] = None) -> Union[str, List[str]]:
     """
     Save image volume (3d) into a series of slices along the Z axis.
     The Z axis in the script is the ndarray.shape[0].
@@ -93,6 +95,7 @@ def save(images: Images,
     :param pixel_depth: Defines the target pixel depth of the save operation so
            np.float32 or np.int16 will ensure the values are scaled
            correctly to these values.
+    :param workers: Number of images written concurrently. If None, pu.DEFAULT_IO_WORKERS is used
     :returns: The filename/filenames of the saved data.
     """
     progress = Progress.ensure_instance(progress, task_name='Save')
@@ -143,17 +146,21 @@ def save(images: Images,
         for i in range(len(names)):
             names[i] = os.path.join(output_dir, names[i])
 
+        min_value = images.data.min()
+
+        def write_image(idx: int):
+            # Overwrite images with the copy that has been rescaled.
+            if pixel_depth == "int16":
+                write_func(rescale_single_image(np.copy(images.data[idx]), min_value, max_value, INT16_SIZE - 1),
+                           names[idx], overwrite_all)
+            else:
+                write_func(data[idx, :, :], names[idx], overwrite_all)
+
+        # the images are encoded and written concurrently. If one can not be written, the images
+        # that were not started are not written
         with progress:
-            min_value = images.data.min()
-            for idx in range(num_images):
-                # Overwrite images with the copy that has been rescaled.
-                if pixel_depth == "int16":
-                    write_func(rescale_single_image(np.copy(images.data[idx]), min_value, max_value, INT16_SIZE - 1),
-                               names[idx], overwrite_all)
-                else:
-                    write_func(data[idx, :, :], names[idx], overwrite_all)
-
-                progress.update(msg='Image')
+            pu.run_ordered(write_image, num_images, workers if workers is not None else pu.DEFAULT_IO_WORKERS,
+                           progress, 'Image', "Save")
 
         return names
 
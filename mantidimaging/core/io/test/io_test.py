@@ -3,7 +3,9 @@
 
 import os
 import unittest
+from unittest import mock
 
+import numpy as np
 import numpy.testing as npt
 
 import mantidimaging.test_helpers.unit_test_helper as th
@@ -257,6 +259,63 @@ class IOTest(FileOutputtingTestCase):
         if dataset.flat_after:
             dataset.flat_after.free_memory()
 
+    def test_load_lazy(self):
+        expected_images = th.generate_images()
+        saver.save(expected_images, self.output_directory, out_format='tiff')
+
+        images = loader.load_lazy(self.output_directory, in_format='tiff', cache_size=2)
+        self.assertFalse(images.is_loaded)
+        self.assertEqual(images.shape, expected_images.data.shape)
+
+        npt.assert_equal(images.projection(3), expected_images.data[3])
+        npt.assert_equal(images.index_as_images(5).data[0], expected_images.data[5])
+        npt.assert_equal(images.sino(1), expected_images.data[:, 1])
+        # only the most recently used projections are kept
+        self.assertEqual(len(images._cache), 2)
+        self.assertFalse(images.is_loaded)
+
+        npt.assert_equal(images.data, expected_images.data)
+        self.assertTrue(images.is_loaded)
+        self.assertEqual(len(images._cache), 0)
+        images.free_memory()
+        self.assertIsNone(images.data)
+
+    def test_load_lazy_sinogram_does_not_evict_cached_projections(self):
+        expected_images = th.generate_images()
+        saver.save(expected_images, self.output_directory, out_format='tiff')
+        images = loader.load_lazy(self.output_directory, in_format='tiff', cache_size=2)
+        images.projection(3)
+
+        with mock.patch.object(images, "_load_func", wraps=images._load_func) as load_func:
+            npt.assert_equal(images.sino(1), expected_images.data[:, 1])
+
+        # each file is read once, except for the cached projection
+        self.assertEqual(load_func.call_count, images.num_images - 1)
+        self.assertEqual(list(images._cache.keys()), [3])
+        self.assertFalse(images.is_loaded)
+        images.free_memory()
+
+    def test_load_lazy_projections_and_sinograms(self):
+        expected_images = th.generate_images()
+        saver.save(expected_images, self.output_directory, out_format='tiff')
+        images = loader.load_lazy(self.output_directory, in_format='tiff')
+
+        npt.assert_equal(images.projections, expected_images.data)
+        npt.assert_equal(images.sinograms, np.swapaxes(expected_images.data, 0, 1))
+        self.assertTrue(images.is_loaded)
+        images.free_memory()
+
+    def test_load_lazy_indices(self):
+        expected_images = th.generate_images()
+        saver.save(expected_images, self.output_directory, out_format='tiff')
+
+        images = loader.load_lazy(self.output_directory, in_format='tiff', indices=[2, 8, 2])
+
+        self.assertEqual(images.num_images, 3)
+        npt.assert_equal(images.projection(1), expected_images.data[4])
+        npt.assert_equal(images.data, expected_images.data[2:8:2])
+        images.free_memory()
+
 
 if __name__ == '__main__':
     unittest.main()
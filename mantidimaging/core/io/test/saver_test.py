@@ -0,0 +1,82 @@
+# Copyright (C) 2020 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+import numpy.testing as npt
+
+import mantidimaging.test_helpers.unit_test_helper as th
+from mantidimaging.core.io import saver
+from mantidimaging.core.utility.progress_reporting import Progress
+
+
+class SaverTest(unittest.TestCase):
+    def setUp(self):
+        self.images = th.generate_images((10, 3, 4))
+        self.output_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def test_images_written_concurrently(self):
+        written = {}
+        threads = set()
+
+        def write_img(data, filename, overwrite=False):
+            # the earlier images are written slower, so they finish out of order
+            time.sleep(0.001 * (10 - len(written)))
+            written[filename] = data.copy()
+            threads.add(threading.get_ident())
+
+        progress = Progress()
+        with mock.patch("mantidimaging.core.io.saver.write_img", side_effect=write_img), \
+                mock.patch.object(progress, "update", wraps=progress.update) as update:
+            names = saver.save(self.images, self.output_dir, progress=progress, workers=4)
+
+        self.assertEqual(10, len(names))
+        for idx, name in enumerate(names):
+            self.assertEqual(os.path.join(self.output_dir, f"image_{idx:06d}.tif"), name)
+            npt.assert_equal(written[name], self.images.data[idx])
+        self.assertGreater(len(threads), 1)
+        self.assertEqual(update.call_args_list.count(mock.call(msg='Image')), 10)
+
+    def test_sequential_save_with_one_worker(self):
+        with mock.patch("mantidimaging.core.io.saver.write_img") as write_img, \
+                mock.patch("mantidimaging.core.parallel.utility.ThreadPoolExecutor") as executor:
+            saver.save(self.images, self.output_dir, workers=1)
+
+        executor.assert_not_called()
+        self.assertEqual(10, write_img.call_count)
+
+    def test_failed_write_stops_saving(self):
+        started = []
+
+        def write_img(data, filename, overwrite=False):
+            started.append(filename)
+            if filename.endswith("image_000002.tif"):
+                raise IOError("Disk full")
+            time.sleep(0.01)
+
+        with mock.patch("mantidimaging.core.io.saver.write_img", side_effect=write_img):
+            self.assertRaisesRegex(IOError, "Disk full", saver.save, self.images,
+                                   self.output_dir, workers=2)
+
+        self.assertLess(len(started), 10)
+
+    def test_int16_images_rescaled(self):
+        with mock.patch("mantidimaging.core.io.saver.write_img") as write_img:
+            saver.save(self.images, self.output_dir, pixel_depth="int16", workers=3)
+
+        for call in write_img.call_args_list:
+            self.assertEqual(np.uint16, call[0][0].dtype)
+
+
+if __name__ == '__main__':
+    unittest.main()
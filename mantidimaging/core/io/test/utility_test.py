@@ -1,7 +1,11 @@
 # Copyright (C) 2020 ISIS Rutherford Appleton Laboratory UKRI
 # SPDX - License - Identifier: GPL-3.0-or-later
 
+import glob
 import os
+import threading
+import time
+from unittest import mock
 
 from mantidimaging.helper import initialise_logging
 from mantidimaging.core.io import utility
@@ -33,3 +37,71 @@ class UtilityTest(FileOutputtingTestCase):
 
         # Expect to find the .tiff file
         self.assertEqual([tiff_filename], found_files)
+
+    def _create_files(self, *names):
+        for name in names:
+            with open(os.path.join(self.output_directory, name), 'wb') as f:
+                f.write(b'\0')
+        # older than any modification that could still be in progress, so the listing is cached
+        modified = time.time() - 2 * utility.RECENTLY_MODIFIED_SECONDS
+        os.utime(self.output_directory, (modified, modified))
+
+    def test_get_file_names_matches_glob_in_natural_order(self):
+        self._create_files('image_10.tif', 'image_9.tif', 'image_100.tif', 'Flat_1.tif', '.image_1.tif',
+                           'image_1.txt')
+
+        found_files = utility.get_file_names(self.output_directory, 'tif', prefix='image')
+
+        self.assertEqual([os.path.join(self.output_directory, f'image_{i}.tif') for i in (9, 10, 100)], found_files)
+        self.assertEqual([os.path.join(self.output_directory, 'Flat_1.tif')],
+                         utility.get_file_names(self.output_directory, 'tif', prefix='*Flat'))
+        self.assertEqual(utility.get_file_names(self.output_directory, 'txt', prefix='image'),
+                         glob.glob(os.path.join(self.output_directory, 'image*.txt')))
+
+    def test_get_file_names_reuses_listing_until_directory_is_modified(self):
+        self._create_files('image_0.tif', 'image_1.tif')
+        utility.clear_file_names_cache()
+
+        with mock.patch('os.scandir', wraps=os.scandir) as scandir:
+            self.assertEqual(2, len(utility.get_file_names(self.output_directory, 'tif')))
+            self.assertEqual(0, len(utility.get_file_names(self.output_directory, 'json', essential=False)))
+            self.assertEqual(1, scandir.call_count)
+
+            self._create_files('image_2.tif')
+            self.assertEqual(3, len(utility.get_file_names(self.output_directory, 'tif')))
+            self.assertEqual(2, scandir.call_count)
+
+    def test_get_file_names_concurrently(self):
+        num_files = 5000
+        self._create_files(*[f'image_{i}.tif' for i in range(num_files)])
+        found = []
+
+        for _ in range(5):
+            # the listing is cached, but the tif names are first sorted by the concurrent calls
+            utility.clear_file_names_cache()
+            utility.get_file_names(self.output_directory, 'json', essential=False)
+            barrier = threading.Barrier(2)
+
+            def find():
+                barrier.wait()
+                found.append(len(utility.get_file_names(self.output_directory, 'tif', essential=False)))
+
+            threads = [threading.Thread(target=find) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual([num_files] * 10, found)
+
+    def test_match_files_in_current_directory(self):
+        self._create_files('image_1.tif', 'image_0.tif')
+
+        with mock.patch('os.getcwd', return_value=self.output_directory):
+            self.assertEqual(['image_0.tif', 'image_1.tif'], utility._match_files('image*.tif', 'tif'))
+
+    def test_get_file_names_missing_directory(self):
+        missing = os.path.join(self.output_directory, 'missing')
+
+        self.assertEqual([], utility.get_file_names(missing, 'tif', essential=False))
+        self.assertRaises(RuntimeError, utility.get_file_names, missing, 'tif')
@@ -1,18 +1,33 @@
 # Copyright (C) 2020 ISIS Rutherford Appleton Laboratory UKRI
 # SPDX - License - Identifier: GPL-3.0-or-later
 
+import fnmatch
 import glob
+import inspect
 import itertools
 import os
 import re
-
+import threading
+import time
+from collections import OrderedDict
 from logging import getLogger
-from typing import List
+from typing import Dict, List, Optional
 
 DEFAULT_IO_FILE_FORMAT = 'tif'
 
 SIMILAR_FILE_EXTENSIONS = (('tif', 'tiff'), ('fit', 'fits'))
 
+_ALPHA_NUM_SPLIT_RE = re.compile('([0-9]+)')
+
+# Number of directory listings kept by get_file_names
+DIRECTORY_CACHE_SIZE = 32
+# Listings of directories modified more recently than this are not cached, as files could still be added
+# within the resolution of the modification time, which is coarse on some network file systems
+RECENTLY_MODIFIED_SECONDS = 2.0
+
+_directory_cache: 'OrderedDict[str, _DirectoryIndex]' = OrderedDict()
+_directory_cache_lock = threading.Lock()
+
 
 def get_file_extension(file):
     """
@@ -67,6 +82,8 @@ def get_file_names(path, img_format, prefix='', essential=True) -> List[str]:
     :return: All the file names, sorted by ascending
     """
     log = getLogger(__name__)
+    # The directory is listed once, and the listing is reused until the directory is modified,
+    # so finding the sample, flats, darks and logs of a scan does not list large directories repeatedly
 
     # Return no found files on None path
     if path is None:
@@ -76,7 +93,7 @@ def get_file_names(path, img_format, prefix='', essential=True) -> List[str]:
     extensions = get_candidate_file_extensions(img_format)
     files_match = []
     for ext in extensions:
-        files_match = glob.glob(os.path.join(path, "{0}*.{1}".format(prefix, ext)))
+        files_match = _match_files(os.path.join(path, "{0}*.{1}".format(prefix, ext)), ext)
 
         if len(files_match) > 0:
             break
@@ -84,10 +101,6 @@ def get_file_names(path, img_format, prefix='', essential=True) -> List[str]:
     if len(files_match) == 0 and essential:
         raise RuntimeError(f"Could not find any image files in '{path}' with extensions: {extensions}")
 
-    # This is a necessary step, otherwise the file order is not guaranteed to
-    # be sequential and we get randomly ordered stack of names
-    files_match.sort(key=_alphanum_key_split)
-
     log.debug(f'Found {len(files_match)} files with common prefix: {os.path.commonprefix(files_match)}')
 
     return files_match
@@ -134,15 +147,112 @@ def _alphanum_key_split(path_str):
     Several variants compared here:
     https://dave.st.germa.in/blog/2007/12/11/exception-handling-slow/
     """
-    alpha_num_split_re = re.compile('([0-9]+)')
-    return [int(c) if c.isdigit() else c for c in alpha_num_split_re.split(path_str)]
+    return [int(c) if c.isdigit() else c for c in _ALPHA_NUM_SPLIT_RE.split(path_str)]
 
 
-if __name__ == '__main__':
-    import doctest
+class _DirectoryIndex:
+    """
+    The names in a directory, read with a single scandir and grouped by their extension.
+    The names with each extension are sorted the first time they are matched.
+    """
+    def __init__(self, path: str, modified: int):
+        self.path = path
+        self.modified = modified
+        self._names: Dict[str, List[str]] = {}
+        self._sorted: Dict[str, List[str]] = {}
+
+        with os.scandir(path) as entries:
+            for entry in entries:
+                _, dot, ext = entry.name.rpartition('.')
+                if dot:
+                    self._names.setdefault(ext, []).append(entry.name)
+
+    def match(self, name_pattern: str, ext: str) -> List[str]:
+        """
+        :param name_pattern: A glob pattern of the names, that ends with the extension
+        :param ext: The extension of the names
+        :return: The matching names, in natural order
+        """
+        names = self._sorted.get(ext)
+        if names is None:
+            # This is a necessary step, otherwise the file order is not guaranteed to
+            # be sequential and we get randomly ordered stack of names.
+            # The index is shared between threads, so a new sorted list is published rather than
+            # sorting the listing in place, which would look empty to other threads while it is sorted
+            names = self._sorted.setdefault(ext, sorted(self._names.get(ext, []), key=_alphanum_key_split))
+
+        matching = fnmatch.filter(names, name_pattern)
+        if not name_pattern.startswith('.'):
+            # like glob, hidden files only match patterns that start with a dot
+            matching = [name for name in matching if not name.startswith('.')]
+        return matching
+
+
+def _directory_index(path: str) -> Optional[_DirectoryIndex]:
+    try:
+        modified = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
 
-    doctest.testmod()
+    with _directory_cache_lock:
+        index = _directory_cache.get(path)
+        if index is not None and index.modified == modified:
+            _directory_cache.move_to_end(path)
+            return index
+
+    try:
+        index = _DirectoryIndex(path, modified)
+    except OSError:
+        return None
+
+    if time.time() - modified / 1e9 > RECENTLY_MODIFIED_SECONDS:
+        with _directory_cache_lock:
+            _directory_cache[path] = index
+            _directory_cache.move_to_end(path)
+            while len(_directory_cache) > DIRECTORY_CACHE_SIZE:
+                _directory_cache.popitem(last=False)
+    return index
+
+
+def _match_files(pattern: str, ext: str) -> List[str]:
+    """
+    The files that match a glob pattern, in natural order, found in the cached listing of their directory.
+    """
+    directory, name_pattern = os.path.split(pattern)
+    if glob.has_magic(directory):
+        # the pattern spans several directories, which are not indexed
+        return sorted(glob.glob(pattern), key=_alphanum_key_split)
+
+    # like glob, a pattern without a directory matches in the current directory, and the matches have no directory
+    index = _directory_index(os.path.abspath(directory or os.curdir))
+    if index is None:
+        return []
+    return [os.path.join(directory, name) for name in index.match(name_pattern, ext)]
+
+
+def clear_file_names_cache():
+    """
+    Forget the cached directory listings, e.g. if files were modified without changing the directory
+    """
+    with _directory_cache_lock:
+        _directory_cache.clear()
 
 
 def get_prefix(path: str, separator="_"):
     return path[:path.rfind(separator)]
+
+
+def decodes_into_output(load_func) -> bool:
+    """
+    Whether the load function can decode a file straight into an output array, given as `out`
+    """
+    try:
+        return "out" in inspect.signature(load_func).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+if __name__ == '__main__':
+    import doctest
+
+    doctest.testmod()
@@ -3,15 +3,22 @@
 
 from functools import partial
 from logging import getLogger
-from typing import Any, Callable, Dict, Iterable, List
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
 import numpy as np
 
 from mantidimaging.core.operations.loader import load_filter_packages
+from mantidimaging.core.parallel import shared_mem as psm
+from mantidimaging.core.parallel import utility as pu
+from mantidimaging.core.utility.progress_reporting import Progress
 from . import const
 
 MODULE_NOT_FOUND = "Could not find module with name '{}'"
 
+# Fused operations are applied to slabs of about this size, so that a slab is
+# still in the cache when the next operation is applied to it
+FUSED_SLAB_BYTES = 8 * 1024 * 1024
+
 
 class ImageOperation:
     """
@@ -31,6 +38,14 @@ class ImageOperation:
             getLogger(__name__).error(msg)
             raise KeyError(msg)
 
+    def to_slab_partial(self, filters: Dict[str, Any]) -> Optional[partial]:
+        """
+        :return: a partial that applies the operation to a slab of images, or None if the operation needs the
+                 whole stack
+        """
+        f = filters.get(self.filter_name)
+        return f.slab_func(**self.filter_kwargs) if f is not None else None
+
     @staticmethod
     def from_serialized(metadata_entry: Dict[str, Any]) -> 'ImageOperation':
         return ImageOperation(filter_name=metadata_entry[const.OPERATION_NAME],
@@ -54,14 +69,110 @@ def deserialize_metadata(metadata: Dict[str, Any]) -> List[ImageOperation]:
         if const.OPERATION_HISTORY in metadata else []
 
 
+def _load_filters() -> Dict[str, Any]:
+    return {f.__name__: f for f in load_filter_packages(ignored_packages=['mantidimaging.core.operations.wip'])}
+
+
 def ops_to_partials(filter_ops: Iterable[ImageOperation]) -> Iterable[partial]:
-    filter_funcs: Dict[str, Callable] = {
-        f.__name__: f.filter_func
-        for f in load_filter_packages(ignored_packages=['mantidimaging.core.operations.wip'])
-    }
+    filter_funcs: Dict[str, Callable] = {name: f.filter_func for name, f in _load_filters().items()}
     fixed_funcs = {
         const.OPERATION_NAME_AXES_SWAP: lambda img, **_: np.swapaxes(img, 0, 1),
         # const.OPERATION_NAME_TOMOPY_RECON: lambda img, **kwargs: TomopyReconWindowModel.do_recon(img, **kwargs),
     }
     filter_funcs.update(fixed_funcs)
     return (op.to_partial(filter_funcs) for op in filter_ops)
+
+
+def _ensure_compute_dtype(images):
+    if pu.is_reduced_precision(images.dtype):
+        getLogger(__name__).info(f"Converting the {images.dtype} stack to {np.dtype(pu.COMPUTE_DTYPE)}")
+        images.convert_dtype(pu.COMPUTE_DTYPE)
+
+
+def _in_compute_dtype(func: Callable, images, **kwargs):
+    """
+    Applies an operation that cannot process stacks stored in reduced precision, converting them to float32 first
+    """
+    _ensure_compute_dtype(images)
+    return func(images, **kwargs)
+
+
+def _apply_slab_funcs(data, slab_funcs: List[partial]):
+    for func in slab_funcs:
+        func(data)
+
+
+class FusedOperations:
+    """
+    Consecutive operations that process each image independently, applied together to one slab of images
+    at a time, so that the whole stack is read and written once instead of once per operation.
+    """
+    def __init__(self, slab_funcs: List[partial], backend: pu.Backend, reduced_precision_storage: bool = False):
+        """
+        :param reduced_precision_storage: Whether all the operations can process stacks stored in reduced precision,
+                                          otherwise such stacks are converted to float32 first
+        """
+        self.slab_funcs = slab_funcs
+        self.backend = backend
+        self.reduced_precision_storage = reduced_precision_storage
+
+    def __call__(self, images, cores=None, progress=None):
+        if not self.reduced_precision_storage:
+            _ensure_compute_dtype(images)
+        data = images.data
+        if not cores:
+            cores = pu.get_cores()
+        chunksize = pu.calculate_chunksize(cores, data.shape[0], pu.image_nbytes(data), len(self.slab_funcs))
+        chunksize = max(1, min(chunksize, FUSED_SLAB_BYTES // max(pu.image_nbytes(data), 1)))
+
+        progress = Progress.ensure_instance(progress, num_steps=data.shape[0], task_name='Fused operations')
+        f = psm.create_partial(_apply_slab_funcs, fwd_func=psm.inplace, slab_funcs=self.slab_funcs)
+        with progress:
+            psm.execute(data,
+                        f,
+                        cores,
+                        chunksize,
+                        progress,
+                        msg=f"Applying {len(self.slab_funcs)} fused operations",
+                        slab_kernel=True,
+                        backend=self.backend)
+        return images
+
+
+def ops_to_stages(filter_ops: Iterable[ImageOperation]) -> List[Callable]:
+    """
+    Converts the operations into the stages of a pipeline. Runs of consecutive operations that process each
+    image independently are fused into a single FusedOperations stage. Every other operation, e.g. one that
+    needs statistics of the whole stack, is a stage of its own and acts as a barrier between the fused ones.
+
+    Each stage is called with the images, in order, like the partials from ops_to_partials. Stacks stored
+    in reduced precision are converted to float32 before the first operation that cannot process them.
+    """
+    filter_ops = list(filter_ops)
+    filters = _load_filters()
+    stages: List[Callable] = []
+    run: List[partial] = []
+    run_backends: List[pu.Backend] = []
+    run_reduced_precision: List[bool] = []
+
+    def end_run():
+        if run:
+            backend = pu.Backend.THREAD if all(b == pu.Backend.THREAD for b in run_backends) else pu.Backend.PROCESS
+            stages.append(FusedOperations(list(run), backend, all(run_reduced_precision)))
+            run.clear()
+            run_backends.clear()
+            run_reduced_precision.clear()
+
+    for op, whole_stack_func in zip(filter_ops, ops_to_partials(filter_ops)):
+        op_filter = filters.get(op.filter_name)
+        reduced_precision = op_filter is not None and op_filter.stores_reduced_precision(**op.filter_kwargs)
+        slab_func = op.to_slab_partial(filters)
+        if slab_func is not None:
+            run.append(slab_func)
+            run_backends.append(filters[op.filter_name].parallel_backend)
+            run_reduced_precision.append(reduced_precision)
+        else:
+            end_run()
+            stages.append(whole_stack_func if reduced_precision else partial(_in_compute_dtype, whole_stack_func))
+    end_run()
+    return stages
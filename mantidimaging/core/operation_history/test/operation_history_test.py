@@ -3,8 +3,13 @@
 
 import unittest
 
+import numpy as np
+import numpy.testing as npt
+
+from mantidimaging.core.data import Images
 from mantidimaging.core.operation_history import operations
-from mantidimaging.core.operation_history.operations import (MODULE_NOT_FOUND, ImageOperation)
+from mantidimaging.core.operation_history.operations import (MODULE_NOT_FOUND, FusedOperations, ImageOperation)
+from mantidimaging.core.parallel import utility as pu
 
 
 class OperationHistoryTest(unittest.TestCase):
@@ -21,3 +26,78 @@ class OperationHistoryTest(unittest.TestCase):
         ops = operations.ops_to_partials(in_ops)
         with self.assertRaisesRegex(KeyError, MODULE_NOT_FOUND.format(fake_module_name)):
             list(ops)
+
+    def test_per_image_operations_are_fused(self):
+        in_ops = [
+            ImageOperation("OutliersFilter", {"diff": 10, "radius": 3}, "Outliers"),
+            ImageOperation("MedianFilter", {"size": 3}, "Median"),
+            ImageOperation("ClipValuesFilter", {"clip_min": 0.1}, "Clip Values"),
+            ImageOperation("GaussianFilter", {"size": 3, "mode": "reflect", "order": 0}, "Gaussian"),
+        ]
+        stages = operations.ops_to_stages(in_ops)
+
+        self.assertEqual(len(stages), 3)
+        self.assertIsInstance(stages[0], FusedOperations)
+        self.assertEqual(len(stages[0].slab_funcs), 2)
+        self.assertEqual(stages[0].backend, pu.Backend.THREAD)
+        # clipping without a max needs the whole stack, so it is a barrier between the fused stages
+        self.assertNotIsInstance(stages[1], FusedOperations)
+        self.assertIsInstance(stages[2], FusedOperations)
+        self.assertEqual(len(stages[2].slab_funcs), 1)
+
+    def test_fused_stages_match_separate_operations(self):
+        in_ops = [
+            ImageOperation("OutliersFilter", {"diff": 0.5, "radius": 3}, "Outliers"),
+            ImageOperation("MedianFilter", {"size": 3}, "Median"),
+            ImageOperation("ClipValuesFilter", {"clip_min": 0.2, "clip_max": 0.8}, "Clip Values"),
+        ]
+        data = np.random.rand(16, 8, 10).astype(np.float32)
+        separate = Images(pu.create_array(data.shape))
+        separate.data[:] = data
+        fused = Images(pu.create_array(data.shape))
+        fused.data[:] = data
+
+        for op in operations.ops_to_partials(in_ops):
+            op(separate)
+        for stage in operations.ops_to_stages(in_ops):
+            stage(fused)
+
+        npt.assert_equal(fused.data, separate.data)
+        self.assertNotEqual(fused.data.tolist(), data.tolist())
+
+    def test_reduced_precision_stack_kept_for_supporting_operations(self):
+        in_ops = [ImageOperation("GaussianFilter", {"size": 3, "mode": "reflect", "order": 0}, "Gaussian")]
+        images = Images(pu.create_array((4, 8, 10), np.uint16))
+        images.data[:] = 100
+
+        for stage in operations.ops_to_stages(in_ops):
+            stage(images)
+
+        self.assertEqual(images.dtype, np.uint16)
+        npt.assert_equal(images.data, 100)
+
+    def test_reduced_precision_stack_converted_for_gaussian_derivative(self):
+        in_ops = [ImageOperation("GaussianFilter", {"size": 3, "mode": "reflect", "order": 1}, "Gaussian")]
+        images = Images(pu.create_array((4, 8, 10), np.uint16))
+        images.data[:] = np.arange(80).reshape(8, 10) % 7 * 100
+
+        for stage in operations.ops_to_stages(in_ops):
+            stage(images)
+
+        # the negative values of the derivative are kept
+        self.assertEqual(images.dtype, np.float32)
+        self.assertLess(images.data.min(), 0)
+
+    def test_reduced_precision_stack_converted_for_other_operations(self):
+        in_ops = [
+            ImageOperation("GaussianFilter", {"size": 3, "mode": "reflect", "order": 0}, "Gaussian"),
+            ImageOperation("MedianFilter", {"size": 3}, "Median"),
+        ]
+        images = Images(pu.create_array((4, 8, 10), np.uint16))
+        images.data[:] = 100
+
+        for stage in operations.ops_to_stages(in_ops):
+            stage(images)
+
+        self.assertEqual(images.dtype, np.float32)
+        npt.assert_equal(images.data, 100)
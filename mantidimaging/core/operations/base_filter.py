@@ -2,12 +2,13 @@
 # SPDX - License - Identifier: GPL-3.0-or-later
 
 from functools import partial
-from typing import TYPE_CHECKING, Any, Callable, Dict
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
 from enum import Enum, auto
 
 import numpy as np
 
 from mantidimaging.core.data import Images
+from mantidimaging.core.parallel.utility import Backend
 
 if TYPE_CHECKING:
     from PyQt5.QtWidgets import QFormLayout, QWidget  # noqa: F401   # pragma: no cover
@@ -22,6 +23,16 @@ class FilterGroup(Enum):
 
 class BaseFilter:
     filter_name = "Unnamed Filter"
+    # The parallel backend that suits the filter's kernel. Filters whose kernels release the GIL
+    # (NumPy ufuncs, scipy.ndimage) should use Backend.THREAD
+    parallel_backend = Backend.PROCESS
+    # Whether filter_func only changes the data through the parallel executors, or by replacing the data array.
+    # Safe Apply then only keeps the images that are modified, instead of copying the whole stack beforehand
+    copy_on_write = False
+    # Whether filter_func can be applied to stacks stored as uint16 or float16. It must only change the data through
+    # shared_mem.execute, which gives it float32 slabs, or copy it unchanged, and its results must be acceptable when
+    # rounded to the storage dtype. Other filters are applied to a float32 copy of such stacks
+    reduced_precision_storage = False
     __name__ = "BaseFilter"
     """
     The base class for filter algorithms, which should extend this class.
@@ -29,6 +40,17 @@ class BaseFilter:
     All of this classes methods must be overridden, except sv_params and the do_before and do_after wrappers
     which are optional.
     """
+
+    @classmethod
+    def stores_reduced_precision(cls, **kwargs) -> bool:
+        """
+        Whether the filter, with these parameters, can be applied to stacks stored in reduced precision.
+        See reduced_precision_storage.
+
+        :param kwargs: the same kwargs as filter_func
+        """
+        return cls.reduced_precision_storage
+
     @staticmethod
     def filter_func(data: Images) -> Images:
         """
@@ -54,6 +76,32 @@ class BaseFilter:
         raise_not_implemented("execute_wrapper")
         return partial(lambda: None)
 
+    @staticmethod
+    def slab_func(**kwargs) -> Optional[partial]:
+        """
+        Constructs a partial call that applies the filter in place to a slab of consecutive images,
+        so that it can be fused with other filters in a pipeline and run while the slab is still in cache.
+
+        Only filters that process each image independently of the rest of the stack can do that. Filters
+        that need statistics of the whole stack, or that change its shape, return None.
+
+        :param kwargs: the same kwargs as filter_func, as recorded in the operation history
+        :return: a partial call taking the slab as its only argument, or None if the filter cannot be fused
+        """
+        return None
+
+    @staticmethod
+    def peak_memory(images: Images, **kwargs) -> int:
+        """
+        Estimates the memory the filter allocates in addition to the stack, so that it can be reserved
+        before the filter touches the data. Filters that change the stack in place need none.
+
+        :param images: the image data the filter will be applied to
+        :param kwargs: the same kwargs as filter_func
+        :return: the peak amount of memory in bytes
+        """
+        return 0
+
     @staticmethod
     def register_gui(form: 'QFormLayout', on_change: Callable, view: 'BaseMainWindowView') -> Dict[str, 'QWidget']:
         """
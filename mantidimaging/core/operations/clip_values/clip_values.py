@@ -64,13 +64,21 @@ class ClipValuesFilter(BaseFilter):
 
                 progress.update(msg=f"Clipping data with values min {clip_min} and max {clip_max}")
 
-                # this is the fastest way to clip the values, np.clip does not do
-                # the clipping in place and ends up copying the data
-                sample[sample < clip_min] = clip_min_new_value
-                sample[sample > clip_max] = clip_max_new_value
+                _clip(sample, clip_min, clip_max, clip_min_new_value, clip_max_new_value)
 
         return data
 
+    @staticmethod
+    def slab_func(clip_min=None, clip_max=None, clip_min_new_value=None, clip_max_new_value=None, **_):
+        # without both limits the min or max of the whole stack is needed
+        if clip_min is None or clip_max is None:
+            return None
+        return partial(_clip,
+                       clip_min=clip_min,
+                       clip_max=clip_max,
+                       clip_min_new_value=clip_min_new_value if clip_min_new_value is not None else clip_min,
+                       clip_max_new_value=clip_max_new_value if clip_max_new_value is not None else clip_max)
+
     @staticmethod
     def register_gui(form, on_change, view):
         from mantidimaging.gui.utility import add_property_to_form
@@ -146,3 +154,10 @@ class ClipValuesFilter(BaseFilter):
                        clip_max=clip_max,
                        clip_min_new_value=clip_min_new_value,
                        clip_max_new_value=clip_max_new_value)
+
+
+def _clip(data, clip_min, clip_max, clip_min_new_value, clip_max_new_value):
+    # this is the fastest way to clip the values, np.clip does not do
+    # the clipping in place and ends up copying the data
+    data[data < clip_min] = clip_min_new_value
+    data[data > clip_max] = clip_max_new_value
@@ -10,6 +10,7 @@ from mantidimaging import helper as h
 from mantidimaging.core.data import Images
 from mantidimaging.core.operations.base_filter import BaseFilter, FilterGroup
 from mantidimaging.core.parallel import utility as pu
+from mantidimaging.core.utility import memory_budget
 from mantidimaging.core.utility.progress_reporting import Progress
 from mantidimaging.core.utility.sensible_roi import SensibleROI
 from mantidimaging.gui.utility.qt_helpers import Type
@@ -27,6 +28,9 @@ class CropCoordinatesFilter(BaseFilter):
     during the rotation of the sample in the dataset.
     """
     filter_name = "Crop Coordinates"
+    # the cropped data is written to a new array
+    copy_on_write = True
+    reduced_precision_storage = True
 
     @staticmethod
     def filter_func(images: Images,
@@ -50,12 +54,7 @@ class CropCoordinatesFilter(BaseFilter):
         :return: The processed 3D numpy.ndarray
         """
 
-        if region_of_interest is None:
-            region_of_interest = SensibleROI.from_list([0, 0, 50, 50])
-        if isinstance(region_of_interest, list):
-            region_of_interest = SensibleROI.from_list(region_of_interest)
-
-        assert isinstance(region_of_interest, SensibleROI)
+        region_of_interest = _to_roi(region_of_interest)
 
         h.check_data_stack(images)
 
@@ -73,6 +72,12 @@ class CropCoordinatesFilter(BaseFilter):
 
         return images
 
+    @staticmethod
+    def peak_memory(images: Images, region_of_interest=None, **kwargs) -> int:
+        # the cropped data is written to a new array
+        roi = _to_roi(region_of_interest)
+        return memory_budget.size_in_bytes((images.num_images, roi.height, roi.width), images.dtype)
+
     @staticmethod
     def register_gui(form, on_change, view):
         from mantidimaging.gui.utility import add_property_to_form
@@ -117,3 +122,13 @@ def execute_single(data, roi, progress=None, out=None):
             output = out[:] if out is not None else data[:]
             output[:] = data[:, roi.top:roi.bottom, roi.left:roi.right]
     return output
+
+
+def _to_roi(region_of_interest: Optional[Union[List[int], List[float], SensibleROI]]) -> SensibleROI:
+    if region_of_interest is None:
+        region_of_interest = SensibleROI.from_list([0, 0, 50, 50])
+    if isinstance(region_of_interest, list):
+        region_of_interest = SensibleROI.from_list(region_of_interest)
+
+    assert isinstance(region_of_interest, SensibleROI)
+    return region_of_interest
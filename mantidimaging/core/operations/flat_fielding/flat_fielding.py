@@ -56,6 +56,8 @@ class FlatFieldFilter(BaseFilter):
     or this will introduce additional noise in the sample.
     """
     filter_name = 'Flat-fielding'
+    parallel_backend = pu.Backend.THREAD
+    copy_on_write = True
 
     @staticmethod
     def filter_func(data: Images,
@@ -83,29 +85,11 @@ class FlatFieldFilter(BaseFilter):
         h.check_data_stack(data)
 
         if selected_flat_fielding is not None:
-            if selected_flat_fielding == "Both, concatenated" and flat_after is not None and flat_before is not None \
-                    and dark_after is not None and dark_before is not None:
-                flat_avg = (flat_before.data.mean(axis=0) + flat_after.data.mean(axis=0)) / 2.0
-                dark_avg = (dark_before.data.mean(axis=0) + dark_after.data.mean(axis=0)) / 2.0
-            elif selected_flat_fielding == "Only Before" and flat_before is not None and dark_before is not None:
-                flat_avg = flat_before.data.mean(axis=0)
-                dark_avg = dark_before.data.mean(axis=0)
-            elif selected_flat_fielding == "Only After" and flat_after is not None and dark_after is not None:
-                flat_avg = flat_after.data.mean(axis=0)
-                dark_avg = dark_after.data.mean(axis=0)
-            else:
-                flat_avg = None
-                dark_avg = None
+            flat_avg, dark_avg = _average_flat_and_dark(flat_before, flat_after, dark_before, dark_after,
+                                                        selected_flat_fielding)
 
             if flat_avg is not None and dark_avg is not None:
-                if 2 != flat_avg.ndim or 2 != dark_avg.ndim:
-                    raise ValueError(
-                        f"Incorrect shape of the flat image ({flat_avg.shape}) or dark image ({dark_avg.shape}) \
-                        which should match the shape of the sample images ({data.data.shape})")
-
-                if not data.data.shape[1:] == flat_avg.shape == dark_avg.shape:
-                    raise ValueError(f"Not all images are the expected shape: {data.data.shape[1:]}, instead "
-                                     f"flat had shape: {flat_avg.shape}, and dark had shape: {dark_avg.shape}")
+                _check_shapes(data.data.shape, flat_avg, dark_avg)
 
                 progress = Progress.ensure_instance(progress,
                                                     num_steps=data.data.shape[0],
@@ -115,6 +99,24 @@ class FlatFieldFilter(BaseFilter):
         h.check_data_stack(data)
         return data
 
+    @staticmethod
+    def slab_func(flat_before: Images = None,
+                  flat_after: Images = None,
+                  dark_before: Images = None,
+                  dark_after: Images = None,
+                  selected_flat_fielding: str = None,
+                  **_):
+        if selected_flat_fielding is None:
+            return None
+        flat_avg, dark_avg = _average_flat_and_dark(flat_before, flat_after, dark_before, dark_after,
+                                                    selected_flat_fielding)
+        if flat_avg is None or dark_avg is None:
+            return None
+
+        norm_divide = np.subtract(flat_avg, dark_avg)
+        norm_divide[norm_divide == 0] = MINIMUM_PIXEL_VALUE
+        return partial(_execute_slab, dark=dark_avg, norm_divide=norm_divide)
+
     @staticmethod
     def register_gui(form, on_change, view: FiltersWindowView) -> Dict[str, Any]:
         from mantidimaging.gui.utility import add_property_to_form
@@ -251,6 +253,38 @@ class FlatFieldFilter(BaseFilter):
         return FilterGroup.Basic
 
 
+def _average_flat_and_dark(flat_before, flat_after, dark_before, dark_after, selected_flat_fielding):
+    if selected_flat_fielding == "Both, concatenated" and flat_after is not None and flat_before is not None \
+            and dark_after is not None and dark_before is not None:
+        flat_avg = (flat_before.data.mean(axis=0) + flat_after.data.mean(axis=0)) / 2.0
+        dark_avg = (dark_before.data.mean(axis=0) + dark_after.data.mean(axis=0)) / 2.0
+    elif selected_flat_fielding == "Only Before" and flat_before is not None and dark_before is not None:
+        flat_avg = flat_before.data.mean(axis=0)
+        dark_avg = dark_before.data.mean(axis=0)
+    elif selected_flat_fielding == "Only After" and flat_after is not None and dark_after is not None:
+        flat_avg = flat_after.data.mean(axis=0)
+        dark_avg = dark_after.data.mean(axis=0)
+    else:
+        flat_avg = None
+        dark_avg = None
+    return flat_avg, dark_avg
+
+
+def _check_shapes(data_shape, flat_avg, dark_avg):
+    if 2 != flat_avg.ndim or 2 != dark_avg.ndim:
+        raise ValueError(f"Incorrect shape of the flat image ({flat_avg.shape}) or dark image ({dark_avg.shape}) \
+            which should match the shape of the sample images ({data_shape})")
+
+    if not data_shape[1:] == flat_avg.shape == dark_avg.shape:
+        raise ValueError(f"Not all images are the expected shape: {data_shape[1:]}, instead "
+                         f"flat had shape: {flat_avg.shape}, and dark had shape: {dark_avg.shape}")
+
+
+def _execute_slab(data, dark, norm_divide):
+    _subtract(data, dark)
+    _divide(data, norm_divide)
+
+
 def _divide(data, norm_divide):
     np.true_divide(data, norm_divide, out=data)
 
@@ -292,10 +326,24 @@ def _execute(data, flat=None, dark=None, cores=None, chunksize=None, progress=No
 
             # subtract the dark from all images
             f = ptsm.create_partial(_subtract, fwd_function=ptsm.inplace_second_2d)
-            data, dark = ptsm.execute(data, dark, f, cores, chunksize, progress=progress)
+            data, dark = ptsm.execute(data,
+                                      dark,
+                                      f,
+                                      cores,
+                                      chunksize,
+                                      progress=progress,
+                                      slab_kernel=True,
+                                      backend=FlatFieldFilter.parallel_backend)
 
             # divide the data by (flat - dark)
             f = ptsm.create_partial(_divide, fwd_function=ptsm.inplace_second_2d)
-            data, norm_divide = ptsm.execute(data, norm_divide, f, cores, chunksize, progress=progress)
+            data, norm_divide = ptsm.execute(data,
+                                             norm_divide,
+                                             f,
+                                             cores,
+                                             chunksize,
+                                             progress=progress,
+                                             slab_kernel=True,
+                                             backend=FlatFieldFilter.parallel_backend)
 
     return data
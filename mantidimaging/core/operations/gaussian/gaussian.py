@@ -4,12 +4,14 @@
 from functools import partial
 from logging import getLogger
 
+import numpy as np
 import scipy.ndimage as scipy_ndimage
 
 from mantidimaging import helper as h
 from mantidimaging.core.data import Images
 from mantidimaging.core.operations.base_filter import BaseFilter
 from mantidimaging.core.parallel import shared_mem as psm
+from mantidimaging.core.parallel import utility as pu
 from mantidimaging.core.utility.progress_reporting import Progress
 from mantidimaging.gui.utility import add_property_to_form
 from mantidimaging.gui.utility.qt_helpers import Type
@@ -23,6 +25,14 @@ class GaussianFilter(BaseFilter):
     When: As a pre-processing step to reduce noise.
     """
     filter_name = "Gaussian"
+    parallel_backend = pu.Backend.THREAD
+    copy_on_write = True
+    reduced_precision_storage = True
+
+    @classmethod
+    def stores_reduced_precision(cls, order=None, **kwargs) -> bool:
+        # the derivatives of the Gaussian have negative values, which the unsigned storage would clip to 0
+        return not np.any(order)
 
     @staticmethod
     def filter_func(data: Images, size=None, mode=None, order=None, cores=None, chunksize=None, progress=None):
@@ -50,6 +60,12 @@ class GaussianFilter(BaseFilter):
         h.check_data_stack(data)
         return data
 
+    @staticmethod
+    def slab_func(size=None, mode=None, order=None, **_):
+        if size and size > 1:
+            return partial(_execute_slab, size=size, mode=mode, order=order)
+        return None
+
     @staticmethod
     def register_gui(form, on_change, view):
         _, size_field = add_property_to_form('Kernel Size',
@@ -87,6 +103,11 @@ def modes():
     return ['reflect', 'constant', 'nearest', 'mirror', 'wrap']
 
 
+def _execute_slab(data, size, mode, order):
+    for i in range(data.shape[0]):
+        data[i] = scipy_ndimage.gaussian_filter(data[i], sigma=size, mode=mode, order=order)
+
+
 def _execute(data, size, mode, order, cores=None, chunksize=None, progress=None):
     log = getLogger(__name__)
     progress = Progress.ensure_instance(progress, task_name='Gaussian filter')
@@ -103,7 +124,13 @@ def _execute(data, size, mode, order, cores=None, chunksize=None, progress=None)
              "filter size/width: {1}.".format(data.dtype, size))
 
     progress.update()
-    data = psm.execute(data, f, cores, chunksize, progress, msg="Gaussian filter")
+    data = psm.execute(data,
+                       f,
+                       cores,
+                       chunksize,
+                       progress,
+                       msg="Gaussian filter",
+                       backend=GaussianFilter.parallel_backend)
 
     progress.mark_complete()
     log.info("Finished  gaussian filter, with pixel data type: {0}, "
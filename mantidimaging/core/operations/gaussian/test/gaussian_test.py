@@ -92,6 +92,11 @@ class GaussianTest(unittest.TestCase):
         self.assertEqual(mode_field.currentText.call_count, 1)
         self.assertEqual(order_field.value.call_count, 1)
 
+    def test_stores_reduced_precision_only_without_derivative(self):
+        self.assertTrue(GaussianFilter.stores_reduced_precision(size=3, mode='reflect', order=0))
+        self.assertFalse(GaussianFilter.stores_reduced_precision(size=3, mode='reflect', order=1))
+        self.assertFalse(GaussianFilter.stores_reduced_precision(size=3, mode='reflect', order=[0, 1, 0]))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -12,6 +12,7 @@ from mantidimaging.core.data import Images
 from mantidimaging.core.gpu import utility as gpu
 from mantidimaging.core.operations.base_filter import BaseFilter
 from mantidimaging.core.parallel import shared_mem as psm
+from mantidimaging.core.parallel import utility as pu
 from mantidimaging.core.utility.progress_reporting import Progress
 from mantidimaging.gui.utility import add_property_to_form
 from mantidimaging.gui.utility.qt_helpers import Type
@@ -28,6 +29,7 @@ class MedianFilter(BaseFilter):
     When: As a pre-processing step to reduce noise.
     """
     filter_name = "Median"
+    parallel_backend = pu.Backend.THREAD
 
     @staticmethod
     def filter_func(data: Images, size=None, mode="reflect", cores=None, chunksize=None, progress=None, force_cpu=True):
@@ -53,6 +55,12 @@ class MedianFilter(BaseFilter):
         h.check_data_stack(data)
         return data
 
+    @staticmethod
+    def slab_func(size=None, mode="reflect", force_cpu=True, **_):
+        if size and size > 1 and force_cpu:
+            return partial(_execute_slab, size=size, mode=mode)
+        return None
+
     @staticmethod
     def register_gui(form: 'QFormLayout', on_change: Callable, view) -> Dict[str, Any]:
         _, size_field = add_property_to_form('Kernel Size',
@@ -90,6 +98,11 @@ def modes():
     return ['reflect', 'constant', 'nearest', 'mirror', 'wrap']
 
 
+def _execute_slab(data, size, mode):
+    for i in range(data.shape[0]):
+        data[i] = scipy_ndimage.median_filter(data[i], size=size, mode=mode)
+
+
 def _execute(data, size, mode, cores=None, chunksize=None, progress=None):
     log = getLogger(__name__)
     progress = Progress.ensure_instance(progress, task_name='Median filter')
@@ -102,7 +115,15 @@ def _execute(data, size, mode, cores=None, chunksize=None, progress=None):
                  "size/width: {1}.".format(data.dtype, size))
 
         progress.update()
-        data = psm.execute(data, f, cores, chunksize, progress, msg="Median filter")
+        # each output pixel sorts size * size input pixels
+        data = psm.execute(data,
+                           f,
+                           cores,
+                           chunksize,
+                           progress,
+                           msg="Median filter",
+                           cost=size * size,
+                           backend=MedianFilter.parallel_backend)
 
     return data
 
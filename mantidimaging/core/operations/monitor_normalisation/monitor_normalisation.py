@@ -9,11 +9,13 @@ from PyQt5.QtWidgets import QFormLayout, QWidget
 from mantidimaging.core.data import Images
 from mantidimaging.core.operations.base_filter import BaseFilter
 from mantidimaging.core.parallel import two_shared_mem as ptsm
+from mantidimaging.core.parallel import utility as pu
 from mantidimaging.gui.mvp_base import BaseMainWindowView
 
 
 def _divide_by_counts(data=None, counts=None):
-    data[:] = np.true_divide(data, counts)
+    # counts is a single value for an image, or one value per image for a slab
+    np.true_divide(data, np.reshape(counts, np.shape(counts) + (1, 1)), out=data)
 
 
 class MonitorNormalisation(BaseFilter):
@@ -24,6 +26,8 @@ class MonitorNormalisation(BaseFilter):
     When: As a pre-processing step to normalise the value ranges of the data.
     """
     filter_name = "Monitor Normalisation"
+    parallel_backend = pu.Backend.THREAD
+    copy_on_write = True
 
     @staticmethod
     def filter_func(images: Images, cores=None, chunksize=None, progress=None) -> Images:
@@ -33,7 +37,14 @@ class MonitorNormalisation(BaseFilter):
 
         counts_val = counts.value / counts.value[0]
         div_partial = ptsm.create_partial(_divide_by_counts, fwd_function=ptsm.inplace)
-        images, _ = ptsm.execute(images.data, counts_val, div_partial, cores, chunksize, progress=progress)
+        images, _ = ptsm.execute(images.data,
+                                 counts_val,
+                                 div_partial,
+                                 cores,
+                                 chunksize,
+                                 progress=progress,
+                                 slab_kernel=True,
+                                 backend=MonitorNormalisation.parallel_backend)
         return images
 
     @staticmethod
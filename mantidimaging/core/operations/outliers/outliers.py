@@ -10,6 +10,7 @@ import scipy.ndimage as scipy_ndimage
 from mantidimaging.core.data import Images
 from mantidimaging.core.operations.base_filter import BaseFilter, FilterGroup
 from mantidimaging.core.parallel import shared as ps
+from mantidimaging.core.parallel import utility as pu
 from mantidimaging.core.utility.progress_reporting import Progress
 from mantidimaging.gui.utility import add_property_to_form
 from mantidimaging.gui.utility.qt_helpers import Type
@@ -33,6 +34,8 @@ class OutliersFilter(BaseFilter):
     images, to remove pixels with very large values that will cause issues in the flat-fielding.
     """
     filter_name = "Remove Outliers"
+    parallel_backend = pu.Backend.THREAD
+    copy_on_write = True
 
     @staticmethod
     def _execute(data, diff, radius, mode):
@@ -61,13 +64,26 @@ class OutliersFilter(BaseFilter):
         """
         if diff and radius and diff > 0 and radius > 0:
             func = ps.create_partial(OutliersFilter._execute, ps.return_to_self1, diff=diff, radius=radius, mode=mode)
-            ps.shared_list = [images.data]
             ps.execute(func,
                        images.num_projections,
+                       shared_list=[images.data],
                        progress=progress,
-                       msg=f"Outliers with threshold {diff} and kernel {radius}")
+                       msg=f"Outliers with threshold {diff} and kernel {radius}",
+                       cost=radius * radius,
+                       backend=OutliersFilter.parallel_backend)
         return images
 
+    @staticmethod
+    def slab_func(diff=None, radius=_default_radius, mode=_default_mode, **_):
+        if diff and radius and diff > 0 and radius > 0:
+            return partial(OutliersFilter._execute_slab, diff=diff, radius=radius, mode=mode)
+        return None
+
+    @staticmethod
+    def _execute_slab(data, diff, radius, mode):
+        for i in range(data.shape[0]):
+            data[i] = OutliersFilter._execute(data[i], diff, radius, mode)
+
     @staticmethod
     def register_gui(form, on_change, view):
         _, diff_field = add_property_to_form('Difference',
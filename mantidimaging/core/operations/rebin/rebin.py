@@ -12,6 +12,7 @@ from mantidimaging.core.data import Images
 from mantidimaging.core.operations.base_filter import BaseFilter
 from mantidimaging.core.parallel import two_shared_mem as ptsm
 from mantidimaging.core.parallel import utility as pu
+from mantidimaging.core.utility import memory_budget
 from mantidimaging.gui.utility import add_property_to_form
 from mantidimaging.gui.utility.qt_helpers import Type
 
@@ -67,6 +68,11 @@ class RebinFilter(BaseFilter):
 
         return images
 
+    @staticmethod
+    def peak_memory(images: Images, rebin_param=0.5, **kwargs) -> int:
+        # the rebinned data is written to a new array
+        return memory_budget.size_in_bytes(_output_shape(images, rebin_param), images.dtype)
+
     @staticmethod
     def register_gui(form, on_change, view):
         # Rebin by uniform factor options
@@ -159,7 +165,7 @@ def _execute_par(data: numpy.ndarray, resized_data, mode, cores=None, chunksize=
     return resized_data
 
 
-def _create_reshaped_array(images, rebin_param):
+def _output_shape(images, rebin_param):
     old_shape = images.data.shape
     num_images = old_shape[0]
 
@@ -172,6 +178,9 @@ def _create_reshaped_array(images, rebin_param):
         expected_dimy = int(rebin_param * old_shape[1])
         expected_dimx = int(rebin_param * old_shape[2])
 
+    return num_images, expected_dimy, expected_dimx
+
+
+def _create_reshaped_array(images, rebin_param):
     # allocate memory for images with new dimensions
-    shape = (num_images, expected_dimy, expected_dimx)
-    return pu.allocate_output(images, shape)
+    return pu.allocate_output(images, _output_shape(images, rebin_param))
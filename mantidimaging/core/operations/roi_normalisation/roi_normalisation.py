@@ -30,6 +30,7 @@ class RoiNormalisationFilter(BaseFilter):
     are brighter/darker than the rest. This can be fixed with this operation.
     """
     filter_name = "ROI Normalisation"
+    parallel_backend = pu.Backend.THREAD
 
     @staticmethod
     def filter_func(images: Images, region_of_interest: SensibleROI = None, cores=None, chunksize=None, progress=None):
@@ -110,7 +111,8 @@ def _calc_sum(data, _, air_left=None, air_top=None, air_right=None, air_bottom=N
 
 
 def _divide_by_air_sum(data=None, air_sums=None):
-    data[:] = np.true_divide(data, air_sums)
+    # air_sums is a single value for an image, or one value per image for a slab
+    np.true_divide(data, np.reshape(air_sums, np.shape(air_sums) + (1, 1)), out=data)
 
 
 def _execute(data, air_region: SensibleROI, cores=None, chunksize=None, progress=None):
@@ -134,11 +136,24 @@ def _execute(data, air_region: SensibleROI, cores=None, chunksize=None, progress
                                                     air_right=air_region.right,
                                                     air_bottom=air_region.bottom)
 
-            data, air_sums = ptsm.execute(data, air_sums, calc_sums_partial, cores, chunksize, progress=progress)
+            data, air_sums = ptsm.execute(data,
+                                          air_sums,
+                                          calc_sums_partial,
+                                          cores,
+                                          chunksize,
+                                          progress=progress,
+                                          backend=RoiNormalisationFilter.parallel_backend)
 
             air_sums_partial = ptsm.create_partial(_divide_by_air_sum, fwd_function=ptsm.inplace)
 
-            data, air_sums = ptsm.execute(data, air_sums, air_sums_partial, cores, chunksize, progress=progress)
+            data, air_sums = ptsm.execute(data,
+                                          air_sums,
+                                          air_sums_partial,
+                                          cores,
+                                          chunksize,
+                                          progress=progress,
+                                          slab_kernel=True,
+                                          backend=RoiNormalisationFilter.parallel_backend)
 
             avg = np.average(air_sums)
             max_avg = np.max(air_sums) / avg
@@ -8,16 +8,12 @@ import numpy
 
 from mantidimaging.core.parallel import utility as pu
 
-shared_list: List[numpy.ndarray] = []
 
-
-def inplace3(func, i, **kwargs):
-    global shared_list
+def inplace3(func, i, shared_list, **kwargs):
     func(shared_list[0][i], shared_list[1][i], shared_list[2], **kwargs)
 
 
-def return_to_self1(func, i, **kwargs):
-    global shared_list
+def return_to_self1(func, i, shared_list, **kwargs):
     shared_list[0][i] = func(shared_list[0][i], **kwargs)
 
 
@@ -36,7 +32,15 @@ def create_partial(func, fwd_function, **kwargs):
     return partial(fwd_function, func, **kwargs)
 
 
-def execute(partial_func: partial, num_operations: int, progress=None, msg: str = '', cores=None):
+def execute(partial_func: partial,
+            num_operations: int,
+            shared_list: List[numpy.ndarray],
+            progress=None,
+            msg: str = '',
+            cores=None,
+            slab_kernel: bool = False,
+            cost: float = 1.0,
+            backend: pu.Backend = pu.Backend.PROCESS):
     """
     Executes a function in parallel with shared memory between the processes.
 
@@ -55,38 +59,40 @@ def execute(partial_func: partial, num_operations: int, progress=None, msg: str
     - map and map_async do not improve speed performance
     - imap seems to be the best choice
 
-    Using _ in the for _ enumerate is slightly faster, because the tuple
-    from enumerate isn't unpacked, and thus some time is saved.
-
-    From performance tests, the chunksize doesn't seem to make much of a
-    difference, but having larger chunks usually led to slower performance:
-
-    Shape: (50,512,512)
-    1 chunk 3.06s
-    2 chunks 3.05s
-    3 chunks 3.07s
-    4 chunks 3.06s
-    5 chunks 3.16s
-    6 chunks 3.06s
-    7 chunks 3.058s
-    8 chunks 3.25s
-    9 chunks 3.45s
+    The images are dispatched to the workers in slabs of contiguous indices,
+    one task per slab. If the chunksize is not given it is calculated from the
+    image size, the cost of the operation and the number of cores, so that
+    cheap operations are not dominated by the dispatch overhead. If the
+    function can process a whole slab at once (e.g. elementwise NumPy
+    operations), pass slab_kernel=True and it will be given a slice instead
+    of a single index.
 
     :param partial_func: A function constructed using create_partial
     :param num_operations: The expected number of operations - should match the number of images being processed
                            Also used to set the number of progress steps
+    :param shared_list: The arrays given to the forwarding function
     :param cores: number of cores that the processing will use
     :param progress: Progress instance to use for progress reporting (optional)
     :param msg: Message to be shown on the progress bar
+    :param slab_kernel: whether partial_func can process a whole slab of operations at once
+    :param cost: relative cost of the function per pixel, used to calculate the chunksize
+    :param backend: whether to run on the worker processes, on threads (if the function releases the GIL),
+                    or serially
     :return:
     """
 
     if not cores:
         cores = pu.get_cores()
 
-    chunksize = pu.calculate_chunksize(cores)
-
-    pu.execute_impl(num_operations, partial_func, cores, chunksize, progress, msg)
-
-    global shared_list
-    shared_list = []
+    image_nbytes = pu.image_nbytes(shared_list[0]) if shared_list else 0
+    chunksize = pu.calculate_chunksize(cores, num_operations, image_nbytes, cost)
+
+    pu.execute_impl(num_operations,
+                    partial_func,
+                    cores,
+                    chunksize,
+                    progress,
+                    msg,
+                    shared_arrays=[shared_list],
+                    slab_kernel=slab_kernel,
+                    backend=backend)
@@ -5,14 +5,8 @@ from functools import partial
 
 from mantidimaging.core.parallel import utility as pu
 
-# this global is necessary for the child processes to access the original
-# array and overwrite the values in-place
-# TODO: now uses SharedArray so this shared_data global might not be necessary anymore. Needs testing
 
-shared_data = None
-
-
-def inplace(func, i, **kwargs):
+def inplace(func, i, shared_data, **kwargs):
     """
     Use if the parameter function will do the following:
         - Perform an operation on the input data
@@ -36,14 +30,15 @@ def inplace(func, i, **kwargs):
     then changes it's contents, as `[:]` gives a reference back to the inner contents.
 
     :param func: Function that will be executed
-    :param i: index from the shared_data on which to operate
+    :param i: index (or slice of indices) from the shared_data on which to operate
+    :param shared_data: the array being processed
     :param kwargs: kwargs to forward to the function func that will be executed
     :return: nothing is returned, as the data is replaced in place
     """
     func(shared_data[i], **kwargs)
 
 
-def return_fwd_func(func, i, **kwargs):
+def return_fwd_func(func, i, shared_data, **kwargs):
     """
     Use if the parameter function will do the following:
         - Perform an operation on the input data
@@ -60,7 +55,8 @@ def return_fwd_func(func, i, **kwargs):
     `f = parallel.create_partial(func_to_be_executed, parallel.inplace, **kwargs)`
 
     :param func: Function that will be executed
-    :param i: index from the shared_data on which to operate
+    :param i: index (or slice of indices) from the shared_data on which to operate
+    :param shared_data: the array being processed
     :param kwargs: kwargs to forward to the function func that will be executed
     :return: nothing is returned, as the data is replaced by assigning the
              return value from the func
@@ -85,7 +81,15 @@ def create_partial(func, fwd_func=return_fwd_func, **kwargs):
     return partial(fwd_func, func, **kwargs)
 
 
-def execute(data=None, partial_func=None, cores=None, chunksize=None, progress=None, msg: str = ''):
+def execute(data=None,
+            partial_func=None,
+            cores=None,
+            chunksize=None,
+            progress=None,
+            msg: str = '',
+            slab_kernel: bool = False,
+            cost: float = 1.0,
+            backend: pu.Backend = pu.Backend.PROCESS):
     """
     Executes a function in parallel with shared memory between the processes.
 
@@ -105,49 +109,48 @@ def execute(data=None, partial_func=None, cores=None, chunksize=None, progress=N
           doubling the memory. They do not improve speed performance either
         - imap seems to be the best choice
 
-    Using _ in the for _ enumerate is slightly faster, because the tuple
-    from enumerate isn't unpacked, and thus some time is saved.
-
-    From performance tests, the chunksize doesn't seem to make much of a
-    difference, but having larger chunks usually led to slower performance:
-
-    Shape: (50,512,512)
-    1 chunk 3.06s
-    2 chunks 3.05s
-    3 chunks 3.07s
-    4 chunks 3.06s
-    5 chunks 3.16s
-    6 chunks 3.06s
-    7 chunks 3.058s
-    8 chunks 3.25s
-    9 chunks 3.45s
-
-    :param data: the data array that will be processed in parallel
+    The images are dispatched to the workers in slabs of contiguous indices,
+    one task per slab. If the chunksize is not given it is calculated from the
+    image size, the cost of the operation and the number of cores, so that
+    cheap operations are not dominated by the dispatch overhead. If the
+    function can process a whole slab at once (e.g. elementwise NumPy
+    operations), pass slab_kernel=True and it will be given a slice instead
+    of a single index.
+
+    :param data: the data array that will be processed in parallel. If it is stored in reduced precision
+                 (uint16 or float16) the function is given float32 copies of the slabs, which are written
+                 back in the storage dtype
     :param partial_func: a function constructed using partial to pass the
                          correct arguments
     :param cores: number of cores that the processing will use
-    :param chunksize: chunk of work per process(worker)
+    :param chunksize: number of images in each slab of work sent to a worker
     :param name: name of the task used in progress reporting
     :param progress: Progress instance to use for progress reporting (optional)
+    :param slab_kernel: whether partial_func can process a whole slab of images at once
+    :param cost: relative cost of the function per pixel, used to calculate the chunksize
+    :param backend: whether to run on the worker processes, on threads (if the function releases the GIL),
+                    or serially
     :return: reference to the input shared array
     """
     if not cores:
         cores = pu.get_cores()
 
     if not chunksize:
-        chunksize = pu.calculate_chunksize(cores)
-
-    global shared_data
-    # get reference to output data
-    # if different shape it will get the reference to the new array
-    shared_data = data
-
-    img_num = shared_data.shape[0]
-    pu.execute_impl(img_num, partial_func, cores, chunksize, progress, msg)
-
-    # remove the global references to remove unused dangling handles to the
-    # data, which might prevent it from being GCed
-    temp_data_ref = shared_data
-    del shared_data
-
-    return temp_data_ref
+        chunksize = pu.calculate_chunksize(cores, data.shape[0], pu.image_nbytes(data), cost)
+
+    img_num = data.shape[0]
+    if pu.is_reduced_precision(data.dtype):
+        # the function is applied to float32 copies of the slabs
+        partial_func = partial(pu.promote_slab, partial_func, slab_kernel)
+        slab_kernel = True
+    pu.execute_impl(img_num,
+                    partial_func,
+                    cores,
+                    chunksize,
+                    progress,
+                    msg,
+                    shared_arrays=[data],
+                    slab_kernel=slab_kernel,
+                    backend=backend)
+
+    return data
@@ -162,6 +162,16 @@ class SharedMemTest(unittest.TestCase):
         # compare results
         npt.assert_equal(img, expected)
 
+    def test_reduced_precision_data_is_processed_in_float32(self):
+        img = np.arange(10 * 3 * 4, dtype=np.uint16).reshape((10, 3, 4))
+        f = psm.create_partial(add_inplace, fwd_func=psm.inplace, add_arg=0.6)
+
+        psm.execute(img, f)
+
+        self.assertEqual(img.dtype, np.uint16)
+        # the fractional part is rounded instead of truncated
+        npt.assert_equal(img, np.arange(10 * 3 * 4).reshape((10, 3, 4)) + 1)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,8 +1,15 @@
 # Copyright (C) 2020 ISIS Rutherford Appleton Laboratory UKRI
 # SPDX - License - Identifier: GPL-3.0-or-later
 
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import mock
+import numpy as np
+import numpy.testing as npt
+import pytest
 
+from mantidimaging.core.parallel import shared_mem as psm, utility as pu
 from mantidimaging.core.parallel.utility import multiprocessing_necessary, execute_impl
 
 
@@ -26,19 +33,345 @@ def test_execute_impl_one_core(mock_pool):
     mock_progress.update.assert_called_once_with(1, "Test")
 
 
-@mock.patch('mantidimaging.core.parallel.utility.Pool')
-def test_execute_impl_par(mock_pool):
+@mock.patch('mantidimaging.core.parallel.utility.get_worker_pool')
+def test_execute_impl_par(mock_get_worker_pool):
     mock_partial = mock.Mock()
     mock_progress = mock.Mock()
     mock_pool_instance = mock.Mock()
     mock_pool_instance.imap.return_value = range(15)
-    mock_pool.return_value.__enter__.return_value = mock_pool_instance
+    mock_get_worker_pool.return_value = mock_pool_instance
     execute_impl(15, mock_partial, 10, 1, mock_progress, "Test")
+    mock_get_worker_pool.assert_called_once_with(10)
     mock_pool_instance.imap.assert_called_once()
     assert mock_progress.update.call_count == 15
 
 
-if __name__ == "__main__":
-    import pytest
+def test_generate_slabs():
+    assert pu.generate_slabs(10, 4) == [slice(0, 4), slice(4, 8), slice(8, 10)]
+    assert pu.generate_slabs(3, 5) == [slice(0, 3)]
+
+
+def test_calculate_chunksize():
+    # no information about the data keeps the old default
+    assert pu.calculate_chunksize(8) == 1
+    # small images are limited by the number of slabs per core
+    assert pu.calculate_chunksize(8, 2000, 512 * 512 * 4) == 63
+    # large images are limited by the slab size
+    assert pu.calculate_chunksize(8, 2000, 2048 * 2048 * 4) == 4
+    # expensive operations get smaller slabs
+    assert pu.calculate_chunksize(8, 2000, 2048 * 2048 * 4, cost=9) == 1
+
+
+def test_execute_impl_slabs_one_core():
+    mock_partial = mock.Mock()
+    mock_progress = mock.Mock()
+    execute_impl(5, mock_partial, 1, 2, mock_progress, "Test", slab_kernel=True)
+    assert mock_partial.call_args_list == [mock.call(slice(0, 2)), mock.call(slice(2, 4)), mock.call(slice(4, 5))]
+    assert mock_progress.update.call_args_list == [mock.call(2, "Test"), mock.call(2, "Test"), mock.call(1, "Test")]
+
+
+@mock.patch('mantidimaging.core.parallel.utility.get_worker_pool')
+def test_execute_impl_serial_backend(mock_get_worker_pool):
+    mock_partial = mock.Mock()
+    mock_progress = mock.Mock()
+    execute_impl(15, mock_partial, 10, 1, mock_progress, "Test", backend=pu.Backend.SERIAL)
+    mock_get_worker_pool.assert_not_called()
+    assert mock_partial.call_count == 15
+    assert mock_progress.update.call_count == 15
+
+
+@mock.patch('mantidimaging.core.parallel.utility.get_worker_pool')
+def test_execute_impl_thread_backend(mock_get_worker_pool):
+    mock_partial = mock.Mock()
+    mock_progress = mock.Mock()
+    try:
+        execute_impl(15, mock_partial, 4, 4, mock_progress, "Test", slab_kernel=True, backend=pu.Backend.THREAD)
+    finally:
+        pu.shutdown_worker_pool()
+    mock_get_worker_pool.assert_not_called()
+    assert sorted(call[0][0].start for call in mock_partial.call_args_list) == [0, 4, 8, 12]
+    assert mock_progress.update.call_args_list == [mock.call(4, "Test")] * 3 + [mock.call(3, "Test")]
+
+
+def test_execute_thread_backend_changes_normal_array():
+    data = np.ones((12, 3, 4))
+    try:
+        psm.execute(data, psm.create_partial(_add_one, fwd_func=psm.inplace), cores=2, backend=pu.Backend.THREAD)
+    finally:
+        pu.shutdown_worker_pool()
+
+    npt.assert_equal(data, 2)
+
+
+@mock.patch('mantidimaging.core.parallel.utility._worker_pool_context')
+def test_worker_pool_reused_and_resized(mock_context):
+    pu.shutdown_worker_pool()
+    try:
+        pool = pu.get_worker_pool(4)
+        assert pu.get_worker_pool(4) is pool
+        mock_context.return_value.Pool.assert_called_once_with(4)
+
+        mock_context.return_value.Pool.reset_mock()
+        pu.resize_worker_pool(2)
+        pool.close.assert_called_once()
+        mock_context.return_value.Pool.assert_called_once_with(2)
+    finally:
+        pu.shutdown_worker_pool()
+
+
+def test_describe_shared_array_view():
+    data = pu.create_array((4, 5, 6))
+    data[:] = np.arange(data.size).reshape(data.shape)
+    view = data[1:3, 2]
+
+    descriptor = pu.describe_shared_array(view)
+
+    assert descriptor is not None
+    npt.assert_equal(descriptor.attach(), view)
+
+
+def test_describe_non_shared_array():
+    assert pu.describe_shared_array(np.zeros((2, 2))) is None
+
+
+def _add_one(data):
+    data[:] += 1
+
+
+def test_execute_slab_kernel_on_worker_pool():
+    data = pu.create_array((12, 3, 4))
+    data[:] = np.arange(12).reshape((12, 1, 1))
+    try:
+        psm.execute(data, psm.create_partial(_add_one, fwd_func=psm.inplace), cores=2, chunksize=5, slab_kernel=True)
+    finally:
+        pu.shutdown_worker_pool()
+
+    npt.assert_equal(data, np.arange(1, 13).reshape((12, 1, 1)) * np.ones((12, 3, 4)))
+
+
+def test_execute_on_worker_pool():
+    data = pu.create_array((12, 3, 4))
+    data[:] = 1
+    try:
+        psm.execute(data, psm.create_partial(_add_one, fwd_func=psm.inplace), cores=2)
+        psm.execute(data, psm.create_partial(_add_one, fwd_func=psm.inplace), cores=2)
+    finally:
+        pu.shutdown_worker_pool()
+
+    npt.assert_equal(data, 3)
+
+
+def test_execute_unnamed_shared_array_on_forked_pool():
+    with pu.temp_shared_array((12, 3, 4)) as data:
+        pass
+    # the memory file name has been deleted, but the array is still alive
+    data[:] = 1
+    assert pu.describe_shared_array(data) is None
+
+    psm.execute(data, psm.create_partial(_add_one, fwd_func=psm.inplace), cores=2)
+
+    npt.assert_equal(data, 2)
+
+
+def test_concurrent_execute_on_worker_pool():
+    first = pu.create_array((12, 3, 4))
+    first[:] = 1
+    second = pu.create_array((24, 3, 4))
+    second[:] = 10
+
+    def run(data):
+        for _ in range(3):
+            psm.execute(data, psm.create_partial(_add_one, fwd_func=psm.inplace), cores=2, chunksize=1)
+
+    try:
+        with ThreadPoolExecutor(2) as executor:
+            list(executor.map(run, [first, second]))
+    finally:
+        pu.shutdown_worker_pool()
+
+    npt.assert_equal(first, 4)
+    npt.assert_equal(second, 13)
+
 
+@mock.patch("mantidimaging.core.parallel.utility.enough_memory", return_value=False)
+def test_create_array_on_disk_when_not_enough_memory(_, tmp_path):
+    pu.set_scratch_directory(str(tmp_path))
+    try:
+        name = pu.create_shared_name()
+        data = pu.create_array((12, 3, 4), name=name)
+
+        assert pu.is_disk_array(data)
+        assert pu.is_disk_array(data[2:5])
+        assert pu.describe_shared_array(data[2:5]).path is not None
+        assert len(list(tmp_path.iterdir())) == 1
+
+        pu.delete_shared_array(name)
+        assert len(list(tmp_path.iterdir())) == 0
+    finally:
+        pu.set_scratch_directory(None)
+
+
+@mock.patch("mantidimaging.core.parallel.utility.enough_disk_space", return_value=False)
+@mock.patch("mantidimaging.core.parallel.utility.enough_memory", return_value=False)
+def test_create_array_fails_without_memory_or_disk_space(*_):
+    with pytest.raises(RuntimeError):
+        pu.create_array((12, 3, 4))
+
+
+@mock.patch("mantidimaging.core.parallel.utility.enough_memory", return_value=False)
+def test_execute_disk_array_on_worker_pool(_, tmp_path):
+    pu.set_scratch_directory(str(tmp_path))
+    try:
+        data = pu.create_array((12, 3, 4))
+        data[:] = 1
+        psm.execute(data, psm.create_partial(_add_one, fwd_func=psm.inplace), cores=2, chunksize=2)
+    finally:
+        pu.shutdown_worker_pool()
+        pu.set_scratch_directory(None)
+
+    npt.assert_equal(data, 2)
+    del data
+    assert len(list(tmp_path.iterdir())) == 0
+
+
+@pytest.mark.parametrize("cores", [1, 2, 4])
+def test_swap_axes(cores):
+    data = np.arange(12 * 14 * 5, dtype=np.float32).reshape((12, 14, 5))
+    # tiles of a few images, so that each slab is copied in several tiles
+    with mock.patch("mantidimaging.core.parallel.utility.SWAP_AXES_TILE_BYTES", 3 * 5 * 4):
+        out = pu.swap_axes(data, cores=cores)
+
+    assert out.shape == (14, 12, 5)
+    assert out.dtype == data.dtype
+    npt.assert_equal(out, np.swapaxes(data, 0, 1))
+
+
+def test_swap_axes_into_output():
+    data = np.random.random((11, 13, 3))
+    out = np.zeros((13, 11, 3))
+    assert pu.swap_axes(data, out, cores=2) is out
+    npt.assert_equal(out, np.swapaxes(data, 0, 1))
+
+
+def test_swap_axes_output_shape_mismatch():
+    with pytest.raises(ValueError):
+        pu.swap_axes(np.zeros((4, 5, 6)), np.zeros((4, 5, 6)))
+
+
+def test_shared_array_registry():
+    name = pu.create_shared_name()
+    with pu.shared_array_owner("Test operation"):
+        data = pu.create_array((4, 5, 6), np.float32, name)
+    try:
+        record = next(record for record in pu.shared_arrays() if record.name == name)
+        assert record.nbytes == data.nbytes
+        assert record.owner == "Test operation"
+        assert not record.on_disk
+        assert pu.shared_memory_total() >= data.nbytes
+
+        pu.set_shared_array_owner(name, "stack-uuid")
+        assert "My stack" in pu.shared_memory_report({"stack-uuid": "My stack"})
+    finally:
+        pu.delete_shared_array(name)
+    assert name not in [record.name for record in pu.shared_arrays()]
+
+
+def test_arrays_without_name_are_unregistered_when_collected():
+    data = pu.create_array((4, 5, 6))
+    name = pu.describe_shared_array(data).name
+    assert name in [record.name for record in pu.shared_arrays()]
+    del data
+    assert name not in [record.name for record in pu.shared_arrays()]
+
+
+def test_free_leaked_shared_arrays():
+    name = pu.create_shared_name()
+    data = pu.create_array((4, 5, 6), np.float32, name)
+    assert name not in [record.name for record in pu.find_leaked_shared_arrays()]
+
+    # the array is garbage collected without deleting its memory file
+    del data
+    leaked = pu.free_leaked_shared_arrays()
+
+    assert name in [record.name for record in leaked]
+    assert name not in [record.name for record in pu.shared_arrays()]
+    with pytest.raises(FileNotFoundError):
+        pu.delete_shared_array(name)
+
+
+def test_free_leaked_shared_arrays_of_owner():
+    name = pu.create_shared_name()
+    with pu.shared_array_owner("closed-stack"):
+        data = pu.create_array((4, 5, 6), np.float32, name)
+
+    leaked = pu.free_leaked_shared_arrays(owner="closed-stack")
+
+    assert [record.name for record in leaked] == [name]
+    # still usable by the remaining references
+    data[:] = 1
+    assert name not in [record.name for record in pu.shared_arrays()]
+
+
+def test_copy_on_write_with_several_callbacks():
+    data = np.zeros((6, 2, 2), dtype=np.float32)
+    first, second = mock.Mock(), mock.Mock()
+    pu.register_copy_on_write(data, first)
+    pu.register_copy_on_write(data, second)
+
+    pu.execute_impl(6, psm.create_partial(_add_one, fwd_func=psm.inplace), 1, 3, None, "Add", shared_arrays=[data])
+    pu.unregister_copy_on_write(data, first)
+    pu.execute_impl(6, psm.create_partial(_add_one, fwd_func=psm.inplace), 1, 3, None, "Add", shared_arrays=[data])
+
+    assert first.call_args_list == [mock.call(slice(0, 3)), mock.call(slice(3, 6))]
+    assert second.call_count == 4
+    pu.unregister_copy_on_write(data)
+
+
+def test_cast_to_storage_rounds_and_clips():
+    out = np.zeros(4, dtype=np.uint16)
+    pu.cast_to_storage(np.array([1.4, 1.6, -3, 70000], dtype=np.float32), out)
+    npt.assert_equal(out, [1, 2, 0, 65535])
+
+
+def test_cast_to_storage_float16():
+    out = np.zeros(2, dtype=np.float16)
+    pu.cast_to_storage(np.array([0.5, 1.25], dtype=np.float32), out)
+    npt.assert_equal(out, [0.5, 1.25])
+
+
+if __name__ == "__main__":
     pytest.main([__file__])
+
+
+def test_run_ordered_reports_progress_in_order():
+    done = []
+    progress = mock.Mock()
+    progress.update.side_effect = lambda msg: done.append(list(order))
+    order = []
+
+    def task(idx):
+        # the later tasks finish first
+        time.sleep(0.001 * (10 - idx))
+        order.append(idx)
+
+    pu.run_ordered(task, 10, 4, progress, "Image", "Test")
+
+    assert sorted(order) == list(range(10))
+    assert progress.update.call_count == 10
+    # each update is only made once its task, and the ones before it, have finished
+    for idx, finished in enumerate(done):
+        assert set(range(idx + 1)) <= set(finished)
+
+
+def test_run_ordered_stops_after_failure():
+    started = []
+
+    def task(idx):
+        started.append(idx)
+        if idx == 2:
+            raise IOError("Broken file")
+        time.sleep(0.01)
+
+    with pytest.raises(IOError):
+        pu.run_ordered(task, 20, 2, mock.Mock(), "Image", "Test")
+    assert len(started) < 20
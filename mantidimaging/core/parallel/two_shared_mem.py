@@ -4,15 +4,8 @@
 from functools import partial
 from mantidimaging.core.parallel import utility as pu
 
-# this global is necessary for the child processes to access the original
-# array and overwrite the values in-place
-# TODO: now uses SharedArray so this shared_data global might not be necessary anymore. Needs testing
 
-shared_data = None
-second_shared_data = None
-
-
-def inplace(func, i, **kwargs):
+def inplace(func, i, shared_data, second_shared_data, **kwargs):
     """Use if the parameter function will do the following:
 
         - Perform an operation on the input data that is dependent on another
@@ -48,14 +41,16 @@ def inplace(func, i, **kwargs):
     contents.
 
     :param func: Function that will be executed
-    :param i: index from the shared_data on which to operate
+    :param i: index (or slice of indices) from the shared_data on which to operate
+    :param shared_data: the first array being processed
+    :param second_shared_data: the second array being processed
     :param kwargs: kwargs to forward to the function func that will be executed
     :return: nothing is returned, as the data is replaced in place
     """
     func(shared_data[i], second_shared_data[i], **kwargs)
 
 
-def inplace_second_2d(func, i, **kwargs):
+def inplace_second_2d(func, i, shared_data, second_shared_data, **kwargs):
     """Use if the parameter function will do the following:
 
         - Perform an operation on the input data that is dependent on the same
@@ -97,14 +92,16 @@ def inplace_second_2d(func, i, **kwargs):
     contents.
 
     :param func: Function that will be executed
-    :param i: index from the shared_data on which to operate
+    :param i: index (or slice of indices) from the shared_data on which to operate
+    :param shared_data: the first array being processed
+    :param second_shared_data: the second array being processed
     :param kwargs: kwargs to forward to the function func that will be executed
     :return: nothing is returned, as the data is replaced in place
     """
     func(shared_data[i], second_shared_data, **kwargs)
 
 
-def return_to_first(func, i, **kwargs):
+def return_to_first(func, i, shared_data, second_shared_data, **kwargs):
     """Use if the parameter function will do the following:
 
         - Perform an operation on the input data that is dependent on another
@@ -114,14 +111,16 @@ def return_to_first(func, i, **kwargs):
         - The output will be stored in the FIRST INPUT CONTAINER
 
     :param func: Function that will be executed
-    :param i: index from the shared_data on which to operate
+    :param i: index (or slice of indices) from the shared_data on which to operate
+    :param shared_data: the first array being processed
+    :param second_shared_data: the second array being processed
     :param kwargs: kwargs to forward to the function func that will be executed
     :return: nothing is returned, as the data is replaced in place
     """
     shared_data[i] = func(shared_data[i], second_shared_data[i], **kwargs)
 
 
-def return_to_second(func, i, **kwargs):
+def return_to_second(func, i, shared_data, second_shared_data, **kwargs):
     """Use if the parameter function will do the following:
 
         - Perform an operation on the input data that is dependent on another
@@ -131,14 +130,16 @@ def return_to_second(func, i, **kwargs):
         - The output will be stored in the SECOND INPUT CONTAINER
 
     :param func: Function that will be executed
-    :param i: index from the shared_data on which to operate
+    :param i: index (or slice of indices) from the shared_data on which to operate
+    :param shared_data: the first array being processed
+    :param second_shared_data: the second array being processed
     :param kwargs: kwargs to forward to the function func that will be executed
     :return: nothing is returned, as the data is replaced in place
     """
     second_shared_data[i] = func(shared_data[i], second_shared_data[i], **kwargs)
 
 
-def return_to_second_but_dont_use_it(func, i, **kwargs):
+def return_to_second_but_dont_use_it(func, i, shared_data, second_shared_data, **kwargs):
     """Use if the parameter function will do the following:
 
         - Perform an operation on the input data that is dependent on another container
@@ -148,14 +149,16 @@ def return_to_second_but_dont_use_it(func, i, **kwargs):
         - The output will be stored in the SECOND INPUT CONTAINER
 
     :param func: Function that will be executed
-    :param i: index from the shared_data on which to operate
+    :param i: index (or slice of indices) from the shared_data on which to operate
+    :param shared_data: the first array being processed
+    :param second_shared_data: the second array being processed
     :param kwargs: kwargs to forward to the function func that will be executed
     :return: nothing is returned, as the data is replaced in place
     """
     second_shared_data[i] = func(shared_data[i], **kwargs)
 
 
-def return_to_second_index_only(func, i, **kwargs):
+def return_to_second_index_only(func, i, shared_data, second_shared_data, **kwargs):
     """Use if the parameter function will do the following:
 
         - Perform an operation on the input data that is dependent on another container
@@ -165,14 +168,16 @@ def return_to_second_index_only(func, i, **kwargs):
         - The output will be stored in the SECOND INPUT CONTAINER
 
     :param func: Function that will be executed
-    :param i: index from the shared_data on which to operate
+    :param i: index (or slice of indices) from the shared_data on which to operate
+    :param shared_data: the first array being processed
+    :param second_shared_data: the second array being processed
     :param kwargs: kwargs to forward to the function func that will be executed
     :return: nothing is returned, as the data is replaced in place
     """
     second_shared_data[i] = func(i, shared_data[i], **kwargs)
 
 
-def fwd_gpu_recon(func, i, num_gpus, cors, **kwargs):
+def fwd_gpu_recon(func, i, shared_data, second_shared_data, num_gpus, cors, **kwargs):
     import astra
     astra.set_gpu_index(i % num_gpus)
     second_shared_data[i] = func(shared_data[i], cors[i], **kwargs)
@@ -196,7 +201,16 @@ def create_partial(func, fwd_function=inplace, **kwargs):
     return partial(fwd_function, func, **kwargs)
 
 
-def execute(data=None, second_data=None, partial_func=None, cores=None, chunksize=None, progress=None, msg: str = ''):
+def execute(data=None,
+            second_data=None,
+            partial_func=None,
+            cores=None,
+            chunksize=None,
+            progress=None,
+            msg: str = '',
+            slab_kernel: bool = False,
+            cost: float = 1.0,
+            backend: pu.Backend = pu.Backend.PROCESS):
     """Executes a function in parallel with shared memory between the
     processes.
 
@@ -216,22 +230,13 @@ def execute(data=None, second_data=None, partial_func=None, cores=None, chunksiz
     - map and map_async do not improve speed performance
     - imap seems to be the best choice
 
-    Using _ in the for _ enumerate is slightly faster, because the tuple
-    from enumerate isn't unpacked, and thus some time is saved.
-
-    From performance tests, the chunksize doesn't seem to make much of a
-    difference, but having larger chunks usually led to slower performance:
-
-    Shape: (50,512,512)
-    1 chunk 3.06s
-    2 chunks 3.05s
-    3 chunks 3.07s
-    4 chunks 3.06s
-    5 chunks 3.16s
-    6 chunks 3.06s
-    7 chunks 3.058s
-    8 chunks 3.25s
-    9 chunks 3.45s
+    The images are dispatched to the workers in slabs of contiguous indices,
+    one task per slab. If the chunksize is not given it is calculated from the
+    image size, the cost of the operation and the number of cores, so that
+    cheap operations are not dominated by the dispatch overhead. If the
+    function can process a whole slab at once (e.g. elementwise NumPy
+    operations), pass slab_kernel=True and it will be given a slice instead
+    of a single index.
 
     :param data: the shared data array that will be processed in parallel
     :param second_data: the second shared data array that will be processed in
@@ -239,9 +244,13 @@ def execute(data=None, second_data=None, partial_func=None, cores=None, chunksiz
     :param partial_func: a function constructed using partial to pass the
                          correct arguments
     :param cores: number of cores that the processing will use
-    :param chunksize: chunk of work per process(worker)
+    :param chunksize: number of images in each slab of work sent to a worker
     :param progress: Progress instance to use for progress reporting (optional)
     :param msg: Message to be shown on the progress bar
+    :param slab_kernel: whether partial_func can process a whole slab of images at once
+    :param cost: relative cost of the function per pixel, used to calculate the chunksize
+    :param backend: whether to run on the worker processes, on threads (if the function releases the GIL),
+                    or serially
     :return:
     """
 
@@ -249,24 +258,17 @@ def execute(data=None, second_data=None, partial_func=None, cores=None, chunksiz
         cores = pu.get_cores()
 
     if not chunksize:
-        chunksize = pu.calculate_chunksize(cores)
-
-    global shared_data
-    # get reference to output data
-    # if different shape it will get the reference to the new array
-    shared_data = data
-
-    global second_shared_data
-    second_shared_data = second_data
-
-    img_num = shared_data.shape[0]
-    pu.execute_impl(img_num, partial_func, cores, chunksize, progress, msg)
-
-    # remove the global references to remove unused dangling handles to the
-    # data, which might prevent it from being GCed
-    temp_data_ref = shared_data
-    del shared_data
-    temp_data_2_ref = second_shared_data
-    del second_shared_data
-
-    return temp_data_ref, temp_data_2_ref
+        chunksize = pu.calculate_chunksize(cores, data.shape[0], pu.image_nbytes(data), cost)
+
+    img_num = data.shape[0]
+    pu.execute_impl(img_num,
+                    partial_func,
+                    cores,
+                    chunksize,
+                    progress,
+                    msg,
+                    shared_arrays=[data, second_data],
+                    slab_kernel=slab_kernel,
+                    backend=backend)
+
+    return data, second_data
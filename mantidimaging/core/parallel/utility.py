@@ -2,18 +2,27 @@
 # SPDX - License - Identifier: GPL-3.0-or-later
 
 import ctypes
+import datetime
+import math
+import multiprocessing
 import os
+import shutil
+import tempfile
+import threading
 import uuid
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
+from enum import Enum
 from functools import partial
 from logging import getLogger
 from multiprocessing.pool import Pool
-from typing import Union, Type, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Union, Type, Optional, Tuple
 
 import SharedArray as sa
 import numpy as np
 
-from mantidimaging.core.utility.memory_usage import system_free_memory
+from mantidimaging.core.utility import memory_budget
 from mantidimaging.core.utility.progress_reporting import Progress
 from mantidimaging.core.utility.size_calculator import full_size_KB
 
@@ -24,62 +33,368 @@ SimpleCType = Union[Type[ctypes.c_uint8], Type[ctypes.c_uint16], Type[ctypes.c_i
 
 NP_DTYPE = Type[np.single]
 
+# Dtypes that stacks can be stored in to use less memory than float32. The parallel executors
+# promote each slab of such a stack to COMPUTE_DTYPE, and write the results back in the storage dtype
+REDUCED_PRECISION_DTYPES = (np.dtype(np.uint16), np.dtype(np.float16))
+COMPUTE_DTYPE = np.float32
+
+
+class Backend(Enum):
+    """
+    How the parallel executors run the work:
+
+    - PROCESS: in the worker processes, on shared memory arrays. For kernels that hold the GIL
+    - THREAD: in a pool of threads of this process. For kernels that release the GIL, e.g. NumPy
+      ufuncs with out= and the scipy.ndimage filters, avoiding the pickling and attaching to the arrays
+    - SERIAL: one image (or slab) after another in the calling thread
+    """
+    PROCESS = "process"
+    THREAD = "thread"
+    SERIAL = "serial"
+
+
+# Amount of image data in a slab for an operation of unit cost. Large enough to amortise
+# dispatching the slab to a worker, while the slabs per core still balance the load
+SLAB_TARGET_BYTES = 64 * 1024 * 1024
+SLABS_PER_CORE = 4
+
+# Number of files read or written concurrently by run_ordered. Decoding and encoding images mostly waits
+# on the file system, so this does not depend on the number of cores
+DEFAULT_IO_WORKERS = 8
+
+# Amount of data copied at once when swapping the axes of a stack. Small enough that the rows
+# read from the input and written to the output of each tile stay in the CPU cache
+SWAP_AXES_TILE_BYTES = 2 * 1024 * 1024
+
+# Names of the shared memory files backing the arrays created in this process,
+# keyed by the id of the array object that owns the memory mapping
+_shared_array_names: Dict[int, Tuple[weakref.ref, str]] = {}
+
+# Arrays that do not fit in memory are stored in memory-mapped files in the scratch directory.
+# It can be set with set_scratch_directory or this environment variable, otherwise the temporary directory is used
+SCRATCH_DIRECTORY_ENV_VAR = "MANTIDIMAGING_SCRATCH_DIR"
+_scratch_directory: Optional[str] = None
+
+# Paths of the memory-mapped files backing the arrays stored on disk, keyed by the array name
+_disk_array_paths: Dict[str, str] = {}
+
+
+class SharedArrayRecord(NamedTuple):
+    """
+    Accounting of a shared memory file (or memory-mapped file on disk) created by this process
+    """
+    name: str
+    nbytes: int
+    # the stack (by UUID) or the operation that the array was created for
+    owner: str
+    created: datetime.datetime
+    on_disk: bool
+
+
+# Every shared array created by this process that has not been deleted yet, keyed by the array name
+_shared_arrays: Dict[str, SharedArrayRecord] = {}
+_shared_arrays_lock = threading.Lock()
+
+# Owner given to the arrays created by the current thread, see shared_array_owner
+_thread_owner = threading.local()
+UNKNOWN_OWNER = "unknown"
+
+# Functions called with each slab of an array before the executors process it, keyed by the id of the array
+_copy_on_write: Dict[int, Tuple[weakref.ref, List[Callable[[slice], None]]]] = {}
+
+# The long-lived worker pool shared by all parallel executors, started on first use
+_worker_pool: Optional[Pool] = None
+_worker_pool_cores = 0
+_worker_pool_lock = threading.Lock()
+
+# The long-lived thread pool used by the THREAD backend, started on first use
+_thread_pool: Optional[ThreadPoolExecutor] = None
+_thread_pool_cores = 0
+
+
+class SharedArrayDescriptor(NamedTuple):
+    """
+    Picklable description of a (view of a) shared array, used by the pool workers
+    to attach to the memory file by name instead of inheriting the array on fork.
+    """
+    name: str
+    shape: Tuple[int, ...]
+    dtype: np.dtype
+    offset: int
+    strides: Tuple[int, ...]
+    # the path of the memory-mapped file, if the array is stored on disk
+    path: Optional[str] = None
+
+    def attach(self) -> np.ndarray:
+        if self.path is not None:
+            root = np.memmap(self.path, dtype=np.uint8, mode="r+")
+        else:
+            root = sa.attach(f"shm://{self.name}")
+        return np.ndarray(self.shape, self.dtype, buffer=root, offset=self.offset, strides=self.strides)
+
 
 def create_shared_name(file_name=None) -> str:
     return f"{uuid.uuid4()}{f'-{os.path.basename(file_name)}' if file_name is not None else ''}"
 
 
 def delete_shared_array(name, silent_failure=False):
+    for key, (_, registered_name) in list(_shared_array_names.items()):
+        if registered_name == name:
+            _shared_array_names.pop(key, None)
+    with _shared_arrays_lock:
+        _shared_arrays.pop(name, None)
     try:
-        sa.delete(f"shm://{name}")
+        if name in _disk_array_paths:
+            # the mapping stays valid until all references to the array are gone
+            os.remove(_disk_array_paths.pop(name))
+        else:
+            sa.delete(f"shm://{name}")
     except FileNotFoundError as e:
         if not silent_failure:
             raise e
 
 
+def delete_disk_arrays():
+    """
+    Delete the memory-mapped files of all arrays stored on disk by this process.
+    """
+    for name in list(_disk_array_paths):
+        delete_shared_array(name, silent_failure=True)
+
+
+def _register_shared_array(array: np.ndarray, name: str):
+    key = id(array)
+    _shared_array_names[key] = (weakref.ref(array, lambda _: _shared_array_names.pop(key, None)), name)
+    record = SharedArrayRecord(name, array.nbytes, _current_owner(), datetime.datetime.now(),
+                               name in _disk_array_paths)
+    with _shared_arrays_lock:
+        _shared_arrays[name] = record
+
+
+def _current_owner() -> str:
+    return getattr(_thread_owner, "owner", UNKNOWN_OWNER)
+
+
+@contextmanager
+def shared_array_owner(owner: str):
+    """
+    Record `owner` as the owner of the shared arrays created by this thread within the context,
+    e.g. the operation that is being applied or the stack that is being loaded.
+    """
+    previous = _current_owner()
+    _thread_owner.owner = owner
+    try:
+        yield
+    finally:
+        _thread_owner.owner = previous
+
+
+def set_shared_array_owner(name: Optional[str], owner: str):
+    """
+    Change the owner of an array, e.g. once the stack it was loaded for has been created.
+
+    :param name: The name of the array. Nothing is done if it is None or the array is not registered
+    :param owner: The new owner
+    """
+    with _shared_arrays_lock:
+        if name in _shared_arrays:
+            _shared_arrays[name] = _shared_arrays[name]._replace(owner=owner)
+
+
+def shared_arrays() -> List[SharedArrayRecord]:
+    """
+    :return: The arrays created by this process that have not been deleted, oldest first
+    """
+    with _shared_arrays_lock:
+        return sorted(_shared_arrays.values(), key=lambda record: record.created)
+
+
+def shared_memory_total(on_disk: bool = False) -> int:
+    """
+    :param on_disk: Whether to total the arrays stored on disk instead of the ones in memory
+    :return: The size in bytes of the arrays created by this process that have not been deleted
+    """
+    return sum(record.nbytes for record in shared_arrays() if record.on_disk == on_disk)
+
+
+def find_leaked_shared_arrays(owner: Optional[str] = None) -> List[SharedArrayRecord]:
+    """
+    Find the arrays that were not deleted, although nothing in this process can use them anymore.
+
+    :param owner: An owner that is gone, e.g. a stack that was closed. Its arrays are leaked even if
+                  they are still referenced
+    :return: The arrays that were garbage collected without deleting their memory file, or belong to `owner`
+    """
+    live_names = {name for ref, name in list(_shared_array_names.values()) if ref() is not None}
+    return [
+        record for record in shared_arrays()
+        if record.name not in live_names or (owner is not None and record.owner == owner)
+    ]
+
+
+def free_leaked_shared_arrays(owner: Optional[str] = None) -> List[SharedArrayRecord]:
+    """
+    Delete the memory files of the leaked arrays, see find_leaked_shared_arrays. Any remaining
+    reference to one of these arrays keeps the memory alive until it is gone.
+
+    :return: The arrays that were leaked
+    """
+    leaked = find_leaked_shared_arrays(owner)
+    for record in leaked:
+        LOG.warning(f"Freeing leaked shared array '{record.name}' of {record.nbytes / 1024**2:.1f} MB, "
+                    f"owned by '{record.owner}' since {record.created:%H:%M:%S}")
+        delete_shared_array(record.name, silent_failure=True)
+    return leaked
+
+
+def shared_memory_report(owner_names: Optional[Dict[str, str]] = None) -> str:
+    """
+    Describe the arrays created by this process that have not been deleted.
+
+    :param owner_names: Display names of the owners, e.g. the names of the stacks instead of their UUID
+    """
+    owner_names = owner_names if owner_names is not None else {}
+    records = shared_arrays()
+    lines = [
+        f"{len(records)} shared arrays using {shared_memory_total() / 1024**2:.1f} MB of memory "
+        f"and {shared_memory_total(on_disk=True) / 1024**2:.1f} MB on disk"
+    ]
+    for record in records:
+        lines.append(f"  {record.created:%H:%M:%S} {record.nbytes / 1024**2:10.1f} MB "
+                     f"{'disk' if record.on_disk else 'memory':6} "
+                     f"{owner_names.get(record.owner, record.owner)}: {record.name}")
+    return "\n".join(lines)
+
+
+def _root_array(array: np.ndarray) -> np.ndarray:
+    while isinstance(array.base, np.ndarray):
+        array = array.base
+    return array
+
+
+def _is_shared_array(array: np.ndarray) -> bool:
+    return type(_root_array(array).base).__name__ == "map_owner"
+
+
+def is_disk_array(array: np.ndarray) -> bool:
+    """
+    :return: Whether the array, or the array it is a view of, is stored in a memory-mapped file on disk
+    """
+    return isinstance(_root_array(array), np.memmap)
+
+
+def describe_shared_array(array: np.ndarray) -> Optional[SharedArrayDescriptor]:
+    """
+    Describe the array as a view into a named shared memory file.
+
+    :param array: The array, or a view of an array, created with `create_array` or `temp_shared_array`
+    :return: The descriptor, or None if the array is not backed by a named shared memory file
+    """
+    root = _root_array(array)
+    entry = _shared_array_names.get(id(root))
+    if entry is None or entry[0]() is not root:
+        return None
+    offset = array.__array_interface__['data'][0] - root.__array_interface__['data'][0]
+    return SharedArrayDescriptor(entry[1], array.shape, array.dtype, offset, array.strides,
+                                 _disk_array_paths.get(entry[1]))
+
+
+def get_scratch_directory() -> str:
+    return _scratch_directory or os.environ.get(SCRATCH_DIRECTORY_ENV_VAR) or tempfile.gettempdir()
+
+
+def set_scratch_directory(path: Optional[str]):
+    """
+    Set the directory in which arrays that do not fit in memory are stored.
+
+    :param path: The directory, or None to use the default
+    """
+    global _scratch_directory
+    if path is not None and not os.path.isdir(path):
+        raise ValueError(f"Scratch directory does not exist: {path}")
+    _scratch_directory = path
+
+
 def enough_memory(shape, dtype):
-    return full_size_KB(shape=shape, axis=0, dtype=dtype) < system_free_memory().kb()
+    # the memory reserved by other operations is not available, even if they have not allocated it yet
+    return full_size_KB(shape=shape, axis=0, dtype=dtype) < memory_budget.available_bytes() / 1024
+
+
+def enough_disk_space(shape, dtype):
+    return full_size_KB(shape=shape, axis=0, dtype=dtype) < shutil.disk_usage(get_scratch_directory()).free / 1024
 
 
-def allocate_output(images, shape):
+def allocate_output(images, shape, dtype=None):
+    dtype = dtype if dtype is not None else images.dtype
     if images.memory_filename is not None:
         name = create_shared_name()
-        output = create_array(shape, images.dtype, name)
+        output = create_array(shape, dtype, name)
         images.free_memory(delete_filename=False)
         images.memory_filename = name
     else:
-        output = create_array(shape, images.dtype)
+        output = create_array(shape, dtype)
     return output
 
 
+def is_reduced_precision(dtype) -> bool:
+    return np.dtype(dtype) in REDUCED_PRECISION_DTYPES
+
+
+def cast_to_storage(values: np.ndarray, out: np.ndarray):
+    """
+    Write floating point results into an array stored in another dtype. For integer dtypes
+    the values are rounded and clipped to the range of the dtype, instead of wrapping around.
+
+    :param values: The results. They are modified if they have to be rounded and clipped
+    :param out: The array, or view, to write to
+    """
+    if np.issubdtype(out.dtype, np.integer):
+        info = np.iinfo(out.dtype)
+        np.rint(values, out=values)
+        np.clip(values, info.min, info.max, out=values)
+    out[...] = values
+
+
 def create_array(shape: Tuple[int, int, int],
                  dtype: NP_DTYPE = np.float32,
                  name: Optional[str] = None,
                  random_name=False) -> np.ndarray:
     """
-    Create an array, either in a memory file (if name provided), or purely in memory (if name is None)
+    Create an array in a shared memory file, which the worker processes can attach to by name.
+
+    If there is not enough physical memory available, the array is stored in a memory-mapped file
+    in the scratch directory instead. It can be used - and deleted by name - like the shared arrays.
 
     :param shape: Shape of the array
     :param dtype: Dtype of the array
-    :param name: Name of the shared memory array. If None, a non-shared array will be created
+    :param name: Name of the shared memory array. If None, the array gets a random name, and its memory file
+                 is deleted once the array is garbage collected
     :param random_name: Whether to randomise the name. Will discard anything in the `name` parameter
     :return: The created Numpy array
     """
-    if not enough_memory(shape, dtype):
-        raise RuntimeError(
-            "The machine does not have enough physical memory available to allocate space for this data.")
+    if enough_memory(shape, dtype):
+        create = _create_shared_array
+    elif enough_disk_space(shape, dtype):
+        LOG.warning(f"Not enough physical memory available for an array of shape {shape}, "
+                    f"storing it on disk in {get_scratch_directory()}")
+        create = _create_disk_array
+    else:
+        raise RuntimeError("The machine does not have enough physical memory or scratch disk space available "
+                           "to allocate space for this data.")
 
     if random_name:
         name = create_shared_name()
 
     if name is not None:
-        return _create_shared_array(shape, dtype, name)
+        return create(shape, dtype, name)
     else:
-        # if the name provided is None, then a shared array, and delete the memory file
-        # reference, so that when all Python references are removed the memory is
-        # automatically freed
-        with temp_shared_array(shape, dtype) as temp:
-            return temp
+        # if the name provided is None, then create a shared array with a random name, and delete
+        # the memory file reference once all Python references are removed. The name is kept until
+        # then so that the pool workers can attach to the array
+        name = create_shared_name()
+        array = create(shape, dtype, name)
+        weakref.finalize(array, delete_shared_array, name, silent_failure=True)
+        return array
 
 
 def _create_shared_array(shape: Tuple[int, int, int], dtype: NP_DTYPE, name: str) -> np.ndarray:
@@ -91,6 +406,21 @@ def _create_shared_array(shape: Tuple[int, int, int], dtype: NP_DTYPE, name: str
     LOG.info(f"Requested shared array with name='{name}', shape={shape}, dtype={dtype}")
     memory_file_name = f"shm://{name}"
     arr = sa.create(memory_file_name, shape, dtype)
+    _register_shared_array(arr, name)
+    return arr
+
+
+def _create_disk_array(shape: Tuple[int, int, int], dtype: NP_DTYPE, name: str) -> np.ndarray:
+    """
+    :param shape:
+    :param dtype:
+    :param name: Name by which the array will be identified, also used for the name of the memory-mapped file
+    """
+    path = os.path.join(get_scratch_directory(), f"mantidimaging-{name}.dat")
+    LOG.info(f"Requested disk array with name='{name}', shape={shape}, dtype={dtype}, path='{path}'")
+    arr = np.memmap(path, dtype=dtype, mode="w+", shape=shape)
+    _disk_array_paths[name] = path
+    _register_shared_array(arr, name)
     return arr
 
 
@@ -122,19 +452,37 @@ def get_cores():
         return mp.cpu_count()
 
 
-def generate_indices(num_images):
+def generate_slabs(num_images: int, slab_size: int) -> List[slice]:
     """
-    Generate indices for each image.
+    Split the images into contiguous slabs of indices [start, stop).
 
     :param num_images: The number of images.
+    :param slab_size: The number of images in each slab. The last slab can be smaller.
+    """
+    return [slice(start, min(start + slab_size, num_images)) for start in range(0, num_images, slab_size)]
+
+
+def calculate_chunksize(cores: int, num_images: int = 0, image_nbytes: int = 0, cost: float = 1.0) -> int:
     """
-    return range(num_images)
+    Calculate the number of images in each slab sent to a worker.
 
+    Cheap operations on small images get large slabs, so that the dispatch overhead is amortised,
+    but each core still gets a few slabs to balance the load.
+
+    :param cores: The number of cores that will process the slabs
+    :param num_images: The number of images that will be processed
+    :param image_nbytes: The size of a single image in bytes
+    :param cost: The relative cost of processing a pixel, 1 being an elementwise operation like a divide
+    """
+    if num_images <= 0 or image_nbytes <= 0:
+        return 1
+    by_size = int(SLAB_TARGET_BYTES / (image_nbytes * max(cost, 1.0)))
+    by_balance = math.ceil(num_images / (cores * SLABS_PER_CORE))
+    return max(1, min(by_size, by_balance))
 
-def calculate_chunksize(cores):
-    # TODO possible proper calculation of chunksize, although best performance
-    # has been with 1
-    return 1
+
+def image_nbytes(data) -> int:
+    return data.nbytes // data.shape[0] if isinstance(data, np.ndarray) and data.ndim > 0 and data.shape[0] else 0
 
 
 def multiprocessing_necessary(shape: Union[int, Tuple[int, int, int]], cores) -> bool:
@@ -161,16 +509,354 @@ def multiprocessing_necessary(shape: Union[int, Tuple[int, int, int]], cores) ->
     return True
 
 
-def execute_impl(img_num: int, partial_func: partial, cores: int, chunksize: int, progress: Progress, msg: str):
+def get_worker_pool(cores: int) -> Pool:
+    """
+    Get the long-lived worker pool, starting it on first use. If it was started
+    with a different number of cores it is replaced by a pool of the requested size.
+    """
+    global _worker_pool, _worker_pool_cores
+    with _worker_pool_lock:
+        if _worker_pool is not None and _worker_pool_cores != cores:
+            LOG.info(f"Resizing worker pool from {_worker_pool_cores} to {cores} cores")
+            # close lets any tasks already submitted to the old pool finish
+            _worker_pool.close()
+            _worker_pool = None
+        if _worker_pool is None:
+            LOG.info(f"Starting worker pool with {cores} cores")
+            _worker_pool = _worker_pool_context().Pool(cores)
+            _worker_pool_cores = cores
+        return _worker_pool
+
+
+def _worker_pool_context():
+    """
+    The long-lived workers must not be forked from this process, otherwise they would inherit
+    the mappings of every shared array that exists at that time and keep that memory allocated
+    for as long as the pool lives. Start them from a clean process instead.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def resize_worker_pool(cores: int):
+    """
+    Restart the worker pool with a new number of cores, e.g. when the user changes the core count.
+    """
+    get_worker_pool(cores)
+
+
+def get_thread_pool(cores: int) -> ThreadPoolExecutor:
+    """
+    Get the long-lived thread pool, starting it on first use. If it was started
+    with a different number of threads it is replaced by a pool of the requested size.
+    """
+    global _thread_pool, _thread_pool_cores
+    with _worker_pool_lock:
+        if _thread_pool is not None and _thread_pool_cores != cores:
+            LOG.info(f"Resizing thread pool from {_thread_pool_cores} to {cores} threads")
+            # any work already submitted to the old pool is still finished
+            _thread_pool.shutdown(wait=False)
+            _thread_pool = None
+        if _thread_pool is None:
+            LOG.info(f"Starting thread pool with {cores} threads")
+            _thread_pool = ThreadPoolExecutor(cores, thread_name_prefix="mantidimaging-worker")
+            _thread_pool_cores = cores
+        return _thread_pool
+
+
+def shutdown_worker_pool():
+    """
+    Stop the worker pool and the thread pool. They will be started again if any
+    parallel operation is executed afterwards.
+    """
+    global _worker_pool, _worker_pool_cores, _thread_pool, _thread_pool_cores
+    with _worker_pool_lock:
+        if _worker_pool is not None:
+            LOG.info("Shutting down worker pool")
+            _worker_pool.terminate()
+            _worker_pool.join()
+            _worker_pool = None
+            _worker_pool_cores = 0
+        if _thread_pool is not None:
+            LOG.info("Shutting down thread pool")
+            _thread_pool.shutdown()
+            _thread_pool = None
+            _thread_pool_cores = 0
+
+
+def _share_value(value: Any, temporaries: List[str]) -> Any:
+    """
+    Replace arrays with descriptors that the workers can attach to. Arrays that are not in named
+    shared memory are copied into a temporary one, so - as before - changes made by the workers
+    to them are not visible here.
+
+    :raises ValueError: if the array is in shared memory that the workers cannot attach to
+    """
+    if isinstance(value, (list, tuple)):
+        return type(value)(_share_value(v, temporaries) for v in value)
+    elif not isinstance(value, np.ndarray):
+        return value
+
+    descriptor = describe_shared_array(value)
+    if descriptor is None:
+        if _is_shared_array(value):
+            raise ValueError("Shared array has no memory file name")
+        name = create_shared_name()
+        temp = _create_shared_array(value.shape, value.dtype, name)
+        temporaries.append(name)
+        temp[:] = value
+        descriptor = describe_shared_array(temp)
+    return descriptor
+
+
+def _attach_value(value: Any) -> Any:
+    if isinstance(value, SharedArrayDescriptor):
+        return value.attach()
+    elif isinstance(value, (list, tuple)):
+        return type(value)(_attach_value(v) for v in value)
+    return value
+
+
+def register_copy_on_write(array: np.ndarray, save_slab: Callable[[slice], None]):
+    """
+    Call save_slab with each slab of indices before the parallel executors process it, when the array
+    is given to them. This lets the caller keep a copy of the images just before they are modified.
+
+    Only changes made through the executors are seen, and only if they are given this array object.
+    Several functions can watch the same array.
+
+    :param array: The array to watch
+    :param save_slab: Called with the slice of images, in this process, before they are dispatched
+    """
+    key = id(array)
+    entry = _copy_on_write.get(key)
+    if entry is None or entry[0]() is not array:
+        # the registry is bound to the callback, as the module globals can be gone when it runs at exit
+        entry = (weakref.ref(array, lambda _, registry=_copy_on_write: registry.pop(key, None)), [])
+        _copy_on_write[key] = entry
+    entry[1].append(save_slab)
+
+
+def unregister_copy_on_write(array: np.ndarray, save_slab: Optional[Callable[[slice], None]] = None):
+    """
+    :param save_slab: The function to stop calling. If None, all functions watching the array are removed
+    """
+    entry = _copy_on_write.get(id(array))
+    if entry is None or entry[0]() is not array:
+        return
+    if save_slab is None:
+        entry[1].clear()
+    elif save_slab in entry[1]:
+        entry[1].remove(save_slab)
+    if not entry[1]:
+        _copy_on_write.pop(id(array), None)
+
+
+def _copy_on_write_callbacks(value: Any) -> List[Callable[[slice], None]]:
+    if isinstance(value, (list, tuple)):
+        return [callback for v in value for callback in _copy_on_write_callbacks(v)]
+    entry = _copy_on_write.get(id(value))
+    return list(entry[1]) if entry is not None and entry[0]() is value else []
+
+
+def _copy_on_write_slabs(slabs: List[slice], arrays: List[Any]) -> Iterator[slice]:
+    callbacks = _copy_on_write_callbacks(arrays)
+    for slab in slabs:
+        for save_slab in callbacks:
+            save_slab(slab)
+        yield slab
+
+
+def _execute_slab(partial_func: partial, slab_kernel: bool, slab: slice, *arrays):
+    """
+    Process the slab of images, either in a single call if the function can process a
+    whole slab, or by calling it for each index in the slab.
+    """
+    if slab_kernel:
+        partial_func(slab, *arrays)
+    else:
+        for index in range(slab.start, slab.stop):
+            partial_func(index, *arrays)
+
+
+def promote_slab(partial_func: partial, slab_kernel: bool, slab: slice, data: np.ndarray):
+    """
+    Process a slab of a stack stored in reduced precision. partial_func is given a float32 copy
+    of the slab, which is written back in the storage dtype afterwards.
+    """
+    promoted = data[slab].astype(COMPUTE_DTYPE)
+    _execute_slab(partial_func, slab_kernel, slice(0, promoted.shape[0]), promoted)
+    cast_to_storage(promoted, data[slab])
+
+
+def _execute_on_descriptors(descriptors: List[Any], partial_func: partial, slab_kernel: bool, slab: slice):
+    """
+    Runs in the pool worker. Attaches to the shared arrays by name and processes the slab.
+    The arrays go out of scope afterwards, so that the worker does not keep the memory alive
+    after the main process deletes it.
+    """
+    _execute_slab(partial_func, slab_kernel, slab, *[_attach_value(d) for d in descriptors])
+
+
+_forked_arrays: List[Any] = []
+
+
+def _set_forked_arrays(arrays: List[Any]):
+    """
+    Initializer of the forked pool. The arrays are inherited on fork rather than pickled.
+    This module is copied in each worker, so this does not affect the pool of any other operation.
+    """
+    global _forked_arrays
+    _forked_arrays = arrays
+
+
+def _execute_on_forked_arrays(partial_func: partial, slab_kernel: bool, slab: slice):
+    _execute_slab(partial_func, slab_kernel, slab, *_forked_arrays)
+
+
+def execute_impl(img_num: int,
+                 partial_func: partial,
+                 cores: int,
+                 chunksize: int,
+                 progress: Progress,
+                 msg: str,
+                 shared_arrays: Optional[List[Any]] = None,
+                 slab_kernel: bool = False,
+                 backend: Backend = Backend.PROCESS):
+    """
+    Process the images in slabs of `chunksize` contiguous indices. Each slab is a single task
+    for a worker, and the progress is updated once per slab.
+
+    :param shared_arrays: The arrays (or lists of arrays) given to partial_func after the index. The pool
+                          workers receive a SharedArrayDescriptor and attach to each array by name, so
+                          that nothing is stored in module state and operations can run concurrently
+    :param slab_kernel: Whether partial_func can process a whole slab at once, i.e. it is given a slice
+                        of indices rather than a single index
+    :param backend: Whether to run on the worker processes, on threads, or serially
+    """
     task_name = f"{msg} {cores}c {chunksize}chs"
     progress = Progress.ensure_instance(progress, num_steps=img_num, task_name=task_name)
-    indices_list = generate_indices(img_num)
-    if multiprocessing_necessary(img_num, cores):
-        with Pool(cores) as pool:
-            for _ in pool.imap(partial_func, indices_list, chunksize=chunksize):
-                progress.update(1, msg)
+    slabs = generate_slabs(img_num, chunksize)
+    arrays = shared_arrays if shared_arrays is not None else []
+    # the slabs are dispatched lazily, so that any copy-on-write snapshot is taken just before they are processed
+    to_dispatch = _copy_on_write_slabs(slabs, arrays)
+    if backend == Backend.SERIAL or not multiprocessing_necessary(img_num, cores):
+        for slab in to_dispatch:
+            _execute_slab(partial_func, slab_kernel, slab, *arrays)
+            progress.update(slab.stop - slab.start, msg)
+    elif backend == Backend.THREAD:
+        # the threads share this process' memory, so they can use the arrays directly
+        func = partial(_execute_slab, partial_func, slab_kernel)
+        for slab, _ in zip(slabs, get_thread_pool(cores).map(lambda slab: func(slab, *arrays), to_dispatch)):
+            progress.update(slab.stop - slab.start, msg)
     else:
-        for ind in indices_list:
-            partial_func(ind)
-            progress.update(1, msg)
+        temporaries: List[str] = []
+        try:
+            try:
+                descriptors = [_share_value(value, temporaries) for value in arrays]
+            except ValueError:
+                # arrays without a memory file name can only reach the workers by being inherited on fork
+                LOG.info("Shared array without a memory file name found. Running on a new pool")
+                func = partial(_execute_on_forked_arrays, partial_func, slab_kernel)
+                with multiprocessing.get_context("fork").Pool(cores, _set_forked_arrays, (arrays, )) as pool:
+                    for slab, _ in zip(slabs, pool.imap(func, to_dispatch)):
+                        progress.update(slab.stop - slab.start, msg)
+            else:
+                func = partial(_execute_on_descriptors, descriptors, partial_func, slab_kernel)
+                for slab, _ in zip(slabs, get_worker_pool(cores).imap(func, to_dispatch)):
+                    progress.update(slab.stop - slab.start, msg)
+        finally:
+            for name in temporaries:
+                delete_shared_array(name)
     progress.mark_complete()
+
+
+def run_ordered(func: Callable[[int], None], num_tasks: int, workers: int, progress: Progress, msg: str,
+                name: str):
+    """
+    Run a task for each index on a bounded pool of threads, e.g. to read or write the images of a stack.
+
+    The progress is updated once per task, in the order of the indices, even though the tasks can finish
+    out of order. If a task fails, or the progress is cancelled, the tasks that have not started are cancelled,
+    and the error is raised once the running tasks have finished. With one worker the tasks run one after
+    another in the calling thread.
+
+    :param func: The task, called with the index
+    :param num_tasks: The number of indices
+    :param workers: The maximum number of tasks that run at once
+    :param progress: The progress to update after each task
+    :param msg: The message of the progress updates
+    :param name: The name of the threads
+    """
+    workers = min(workers, num_tasks)
+    if workers <= 1:
+        for idx in range(num_tasks):
+            func(idx)
+            progress.update(msg=msg)
+        return
+
+    with ThreadPoolExecutor(workers, thread_name_prefix=name) as executor:
+        futures = [executor.submit(func, idx) for idx in range(num_tasks)]
+        try:
+            for future in futures:
+                future.result()
+                progress.update(msg=msg)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+
+def _swap_axes_slab(slab: slice, data: np.ndarray, out: np.ndarray):
+    """
+    Fill the images `slab` of the output, i.e. the rows `slab` of every input image,
+    one tile of input images at a time.
+    """
+    row_nbytes = (slab.stop - slab.start) * data.shape[2] * data.itemsize
+    tile = max(1, SWAP_AXES_TILE_BYTES // max(row_nbytes, 1))
+    for start in range(0, data.shape[0], tile):
+        stop = min(start + tile, data.shape[0])
+        out[slab, start:stop] = np.swapaxes(data[start:stop, slab], 0, 1)
+
+
+def swap_axes(data: np.ndarray,
+              out: Optional[np.ndarray] = None,
+              cores: Optional[int] = None,
+              progress: Optional[Progress] = None) -> np.ndarray:
+    """
+    Copy the stack with axes 0 and 1 swapped, e.g. to convert projections to sinograms.
+
+    The output is split into slabs that are filled in parallel, and each slab is copied in tiles that
+    fit in the cache, rather than with a single strided copy of the whole stack.
+
+    :param data: The 3D stack to copy
+    :param out: The array to write the result into, with shape (data.shape[1], data.shape[0], data.shape[2]).
+                If None, a new shared array is created
+    :param cores: The number of cores to use. If None all cores are used
+    :param progress: Progress instance to use for progress reporting (optional)
+    :return: The array with the axes swapped
+    """
+    shape = (data.shape[1], data.shape[0], data.shape[2])
+    if out is None:
+        out = create_array(shape, data.dtype)
+    elif out.shape != shape:
+        raise ValueError(f"Output of shape {out.shape} cannot hold the swapped axes of shape {data.shape}")
+
+    if not cores:
+        cores = get_cores()
+    chunksize = calculate_chunksize(cores, shape[0], image_nbytes(out))
+    # the arrays are bound to the kernel rather than passed as shared arrays, because the slabs index
+    # the output and must not trigger any copy-on-write snapshot of the input. The copies release the
+    # GIL, so the threads can access the arrays directly whether or not they are shared
+    execute_impl(shape[0],
+                 partial(_swap_axes_slab, data=data, out=out),
+                 cores,
+                 chunksize,
+                 progress,
+                 "Swapping axes",
+                 slab_kernel=True,
+                 backend=Backend.THREAD)
+    return out
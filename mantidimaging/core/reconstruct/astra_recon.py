@@ -84,12 +84,13 @@ class AstraRecon(BaseRecon):
         """
 
         proj_angles = images.projection_angles(recon_params.max_projection_angle)
+        sino = images.sino(slice_idx)
 
         def get_sumsq(image: np.ndarray) -> float:
             return np.sum(image**2)
 
         def minimizer_function(cor):
-            return -get_sumsq(AstraRecon.single_sino(images.sino(slice_idx), ScalarCoR(cor), proj_angles, recon_params))
+            return -get_sumsq(AstraRecon.single_sino(sino, ScalarCoR(cor), proj_angles, recon_params))
 
         return minimize(minimizer_function, start_cor, method='nelder-mead', tol=0.1).x[0]
 
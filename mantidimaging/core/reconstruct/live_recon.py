@@ -0,0 +1,69 @@
+# Copyright (C) 2020 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+
+import threading
+from logging import getLogger
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from mantidimaging.core.data.live_images import LiveImages
+from mantidimaging.core.reconstruct import get_reconstructor_for
+from mantidimaging.core.utility.data_containers import ReconstructionParameters, ScalarCoR
+
+LOG = getLogger(__name__)
+
+
+class LiveSliceReconstruction(object):
+    """
+    Reconstructs chosen slices from the projections acquired so far, each time projections are appended to
+    a live stack, e.g. to check the alignment and the centre of rotation while the scan is running.
+
+    Used as a listener of a `LiveLoader`. The sinograms of the slices are read straight from the stack,
+    so the stack is not transposed for every update.
+    """
+    def __init__(self,
+                 slice_indices: List[int],
+                 cors: List[ScalarCoR],
+                 recon_params: ReconstructionParameters,
+                 on_update: Optional[Callable[[Dict[int, np.ndarray]], None]] = None):
+        """
+        :param slice_indices: The slices to reconstruct
+        :param cors: The centre of rotation of each slice
+        :param recon_params: Reconstruction parameters to configure which algorithm/filter/etc is used
+        :param on_update: Called with the new reconstructions of the slices, e.g. to show them
+        """
+        if len(slice_indices) != len(cors):
+            raise ValueError("A centre of rotation is needed for each slice")
+        self.slice_indices = slice_indices
+        self.cors = cors
+        self.recon_params = recon_params
+        self.on_update = on_update
+        self._reconstructor = get_reconstructor_for(recon_params.algorithm)
+        self._reconstructions: Dict[int, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def reconstructions(self) -> Dict[int, np.ndarray]:
+        """
+        The latest reconstruction of each slice
+        """
+        with self._lock:
+            return dict(self._reconstructions)
+
+    def __call__(self, images: LiveImages, new_indices: range):
+        # a sinogram needs at least two projections
+        if images.num_projections < 2:
+            return
+
+        proj_angles = images.projection_angles(self.recon_params.max_projection_angle)
+        reconstructions = {}
+        for slice_idx, cor in zip(self.slice_indices, self.cors):
+            reconstructions[slice_idx] = self._reconstructor.single_sino(images.sino(slice_idx), cor, proj_angles,
+                                                                         self.recon_params)
+        LOG.debug(f"Reconstructed slices {self.slice_indices} from {images.num_projections} projections")
+
+        with self._lock:
+            self._reconstructions = reconstructions
+        if self.on_update is not None:
+            self.on_update(reconstructions)
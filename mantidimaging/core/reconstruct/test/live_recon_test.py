@@ -0,0 +1,48 @@
+# Copyright (C) 2020 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+
+import unittest
+from unittest import mock
+
+import numpy as np
+import numpy.testing as npt
+
+from mantidimaging.core.data import LiveImages
+from mantidimaging.core.reconstruct.live_recon import LiveSliceReconstruction
+from mantidimaging.core.utility.data_containers import ReconstructionParameters, ScalarCoR
+
+
+class LiveSliceReconstructionTest(unittest.TestCase):
+    def setUp(self):
+        self.images = LiveImages((3, 4), expected_images=4)
+        self.recon_params = ReconstructionParameters("FBP_CUDA", "ram-lak", max_projection_angle=180)
+
+    def tearDown(self):
+        self.images.free_memory()
+
+    @mock.patch("mantidimaging.core.reconstruct.live_recon.get_reconstructor_for")
+    def test_slices_reconstructed_from_projections_so_far(self, get_reconstructor_for):
+        reconstructor = get_reconstructor_for.return_value
+        reconstructor.single_sino.side_effect = lambda sino, *_: sino.sum(axis=0)
+        on_update = mock.Mock()
+        live_recon = LiveSliceReconstruction([0, 2], [ScalarCoR(2), ScalarCoR(1.5)], self.recon_params, on_update)
+
+        # a single projection is not enough for a sinogram
+        live_recon(self.images, self.images.append(np.ones((1, 3, 4)), ["a"]))
+        reconstructor.single_sino.assert_not_called()
+
+        live_recon(self.images, self.images.append(np.ones((2, 3, 4)), ["b", "c"]))
+
+        sino, cor, proj_angles, recon_params = reconstructor.single_sino.call_args_list[1][0]
+        self.assertEqual(sino.shape, (3, 4))
+        self.assertEqual(cor, ScalarCoR(1.5))
+        npt.assert_almost_equal(proj_angles.value, np.deg2rad([0, 60, 120]))
+        npt.assert_equal(live_recon.reconstructions[2], 3)
+        on_update.assert_called_once_with(live_recon.reconstructions)
+
+    def test_cor_needed_for_each_slice(self):
+        self.assertRaises(ValueError, LiveSliceReconstruction, [0, 1], [ScalarCoR(1)], self.recon_params)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+# Copyright (C) 2020 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from mantidimaging.core.reconstruct.tomopy_recon import TomopyRecon
+from mantidimaging.core.utility.data_containers import ReconstructionParameters, ScalarCoR
+from mantidimaging.test_helpers.unit_test_helper import generate_images
+
+
+@mock.patch("mantidimaging.core.reconstruct.tomopy_recon.tomopy")
+class TomopyReconTest(unittest.TestCase):
+    def setUp(self):
+        self.images = generate_images()
+        self.recon_params = ReconstructionParameters("gridrec", "ramlak")
+        self.cors = [ScalarCoR(5)] * self.images.height
+
+    def _recon_kwargs(self, tomopy):
+        tomopy.recon.return_value = np.zeros((1, 2, 2))
+        TomopyRecon.full(self.images, self.cors, self.recon_params)
+        return tomopy.recon.call_args[1]
+
+    def test_full_reads_cached_sinograms(self, tomopy):
+        self.images.cache_sinograms()
+
+        kwargs = self._recon_kwargs(tomopy)
+
+        self.assertIs(kwargs["tomo"], self.images.sinograms)
+        self.assertTrue(kwargs["sinogram_order"])
+
+    def test_full_reads_projections_without_sinogram_cache(self, tomopy):
+        with mock.patch("mantidimaging.core.data.images.pu.enough_memory", return_value=False):
+            self.assertFalse(self.images.cache_sinograms())
+
+        kwargs = self._recon_kwargs(tomopy)
+
+        self.assertIs(kwargs["tomo"], self.images.data)
+        self.assertFalse(kwargs["sinogram_order"])
+
+    def test_full_reads_sinogram_stack(self, tomopy):
+        self.images._is_sinograms = True
+
+        kwargs = self._recon_kwargs(tomopy)
+
+        self.assertIs(kwargs["tomo"], self.images.data)
+        self.assertTrue(kwargs["sinogram_order"])
+
+
+if __name__ == '__main__':
+    unittest.main()
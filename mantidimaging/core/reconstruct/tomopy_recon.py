@@ -57,13 +57,16 @@ class TomopyRecon(BaseRecon):
 
         kwargs = {
             'ncore': ncores,
-            'tomo': images.data,
-            'sinogram_order': images._is_sinograms,
             'theta': images.projection_angles(recon_params.max_projection_angle).value,
             'center': [cor.value for cor in cors],
             'algorithm': recon_params.algorithm,
             'filter_name': recon_params.filter_name
         }
+        if images.has_sinogram_cache:
+            kwargs.update(tomo=images.sinograms, sinogram_order=True)
+        else:
+            # the sinograms were not cached for lack of memory, so tomopy is not made to copy them either
+            kwargs.update(tomo=images.data, sinogram_order=images.is_sinograms)
 
         with progress:
             volume = tomopy.recon(**kwargs)
@@ -14,6 +14,8 @@ from typing import Optional
 
 import numpy
 
+from mantidimaging.core.utility.sensible_roi import SensibleROI
+
 
 @dataclass
 class SingleValue:
@@ -137,3 +139,7 @@ class LoadingParameters:
     name: str
     dtype: str
     sinograms: bool
+
+    # all images are cropped to the ROI and binned by this factor while they are loaded
+    roi: Optional[SensibleROI] = None
+    binning: int = 1
@@ -1,9 +1,9 @@
 # Copyright (C) 2020 ISIS Rutherford Appleton Laboratory UKRI
 # SPDX - License - Identifier: GPL-3.0-or-later
 
+import re
 from enum import Enum, auto
-from itertools import zip_longest
-from typing import List, Dict
+from typing import Dict, Iterable, List, Optional
 
 import numpy
 
@@ -23,8 +23,31 @@ class IMATLogColumn(Enum):
     COUNTS_AFTER = auto()
 
 
+# The projection number and the angle of a row, e.g. "Projection:  12  angle: 3.7824"
+_PROJECTION_RE = re.compile(r"^[^:\n]*: *(\d+)\s*angle:\s*(\S+)\s*$", re.MULTILINE)
+# The text after the last colon of a row, e.g. the count of "Monitor 3 before:  4577907"
+_AFTER_LAST_COLON_RE = re.compile(r"^(?:[^\n]*:)?([^:\n]*)$", re.MULTILINE)
+
+
+def _parse_after_last_colon(column: List[str]) -> numpy.ndarray:
+    if not column:
+        return numpy.empty(0, dtype=numpy.float64)
+    return numpy.array(_AFTER_LAST_COLON_RE.findall("\n".join(column))).astype(numpy.float64)
+
+
 class IMATLogFile:
-    def __init__(self, data: List[List[str]], source_file: str):
+    """
+    The log written by the IMAT instrument, with the angle and the beam monitor counts of each projection.
+
+    The log is read in a single pass, keeping only the text of the columns. Each column is parsed into
+    a NumPy array, with a regex over the whole column, the first time it is needed.
+    """
+    def __init__(self, data: Iterable[List[str]], source_file: str):
+        """
+        :param data: The rows of the log, split into columns. Any iterable, e.g. a generator over the lines
+                     of the file, so that the rows are not all kept in memory
+        :param source_file: The file the log was read from
+        """
         self._source_file = source_file
         self._data: Dict[IMATLogColumn, List] = {
             IMATLogColumn.TIMESTAMP: [],
@@ -33,7 +56,8 @@ class IMATLogFile:
             IMATLogColumn.COUNTS_AFTER: []
         }
 
-        if EXPECTED_HEADER_FOR_IMAT_LOG_FILE != data[0]:
+        rows = iter(data)
+        if EXPECTED_HEADER_FOR_IMAT_LOG_FILE != next(rows, None):
             raise RuntimeError(
                 "The Log file found for this dataset does not seem to have the correct header for an IMAT log file.\n"
                 "The header is expected to contain the names of the columns:\n"
@@ -41,45 +65,47 @@ class IMATLogFile:
 
         # ignores the headers (index 0) as they're not the same as the data anyway
         # and index 1 is an empty line
-        for line in data[2:]:
-            self._data[IMATLogColumn.TIMESTAMP].append(line[0])
-            self._data[IMATLogColumn.IMAGE_TYPE_IMAGE_COUNTER].append(line[1])
-            self._data[IMATLogColumn.COUNTS_BEFORE].append(line[2])
-            self._data[IMATLogColumn.COUNTS_AFTER].append(line[3])
+        next(rows, None)
+        columns = (self._data[IMATLogColumn.TIMESTAMP], self._data[IMATLogColumn.IMAGE_TYPE_IMAGE_COUNTER],
+                   self._data[IMATLogColumn.COUNTS_BEFORE], self._data[IMATLogColumn.COUNTS_AFTER])
+        for line in rows:
+            for column, value in zip(columns, line[:4]):
+                column.append(value)
+
+        self._projection_numbers: Optional[numpy.ndarray] = None
+        self._projection_angles: Optional[ProjectionAngles] = None
+        self._counts: Optional[Counts] = None
 
     @property
     def source_file(self) -> str:
         return self._source_file
 
-    def projection_numbers(self):
-        proj_nums = numpy.zeros(len(self._data[IMATLogColumn.IMAGE_TYPE_IMAGE_COUNTER]), dtype=numpy.uint32)
-        for i, angle_str in enumerate(self._data[IMATLogColumn.IMAGE_TYPE_IMAGE_COUNTER]):
-            if "angle:" not in angle_str:
-                raise ValueError("Projection angles loaded from logfile do not have the correct formatting!")
-            proj_nums[i] = int(angle_str[angle_str.find(": ") + 1:angle_str.find("a")])
+    def _parse_projections(self):
+        column = self._data[IMATLogColumn.IMAGE_TYPE_IMAGE_COUNTER]
+        found = _PROJECTION_RE.findall("\n".join(column))
+        if len(found) != len(column):
+            raise ValueError("Projection angles loaded from logfile do not have the correct formatting!")
 
-        return proj_nums
+        numbers, angles = zip(*found) if found else ((), ())
+        self._projection_numbers = numpy.array(numbers).astype(numpy.uint32)
+        self._projection_angles = ProjectionAngles(numpy.deg2rad(numpy.array(angles).astype(numpy.float64)))
 
-    def projection_angles(self) -> ProjectionAngles:
-        angles = numpy.zeros(len(self._data[IMATLogColumn.IMAGE_TYPE_IMAGE_COUNTER]))
-        for i, angle_str in enumerate(self._data[IMATLogColumn.IMAGE_TYPE_IMAGE_COUNTER]):
-            if "angle:" not in angle_str:
-                raise ValueError("Projection angles loaded from logfile do not have the correct formatting!")
-            angles[i] = float(angle_str[angle_str.rfind(": ") + 1:])
+    def projection_numbers(self) -> numpy.ndarray:
+        if self._projection_numbers is None:
+            self._parse_projections()
+        return self._projection_numbers
 
-        return ProjectionAngles(numpy.deg2rad(angles))
+    def projection_angles(self) -> ProjectionAngles:
+        if self._projection_angles is None:
+            self._parse_projections()
+        return self._projection_angles
 
     def counts(self) -> Counts:
-        counts = numpy.zeros(len(self._data[IMATLogColumn.COUNTS_BEFORE]))
-        for i, [before,
-                after] in enumerate(zip(self._data[IMATLogColumn.COUNTS_BEFORE],
-                                        self._data[IMATLogColumn.COUNTS_AFTER])):
-            # clips the string before the count number
-            before = before[before.rfind(":") + 1:]
-            after = after[after.rfind(":") + 1:]
-            counts[i] = float(after) - float(before)
-
-        return Counts(counts)
+        if self._counts is None:
+            before = _parse_after_last_colon(self._data[IMATLogColumn.COUNTS_BEFORE])
+            after = _parse_after_last_colon(self._data[IMATLogColumn.COUNTS_AFTER])
+            self._counts = Counts(after - before)
+        return self._counts
 
     def raise_if_angle_missing(self, image_filenames):
         proj_numbers = self.projection_numbers()
@@ -93,8 +119,14 @@ class IMATLogFile:
             msg = ""
         msg += f"Found {len(proj_numbers)} angles, but {len(image_numbers)} images"
 
-        for projection_num, image_num in zip_longest(proj_numbers, image_numbers):
+        # the projection number only has to appear in the end of the file name, after the last underscore
+        common = min(len(proj_numbers), len(image_numbers))
+        found = numpy.char.find(numpy.array(image_numbers[:common], dtype=str), proj_numbers[:common].astype(str))
+        mismatches = numpy.flatnonzero(found < 0)
+        if len(mismatches) > 0 or len(proj_numbers) != len(image_numbers):
             # is None happens if exactly the last projection/angle is missing
-            if projection_num is None or image_num is None or str(projection_num) not in image_num:
-                raise RuntimeError(f"{msg}\n\nMismatching angle for projection {projection_num} "
-                                   f"was going to be used for image file {image_num}")
+            first = int(mismatches[0]) if len(mismatches) > 0 else common
+            projection_num = proj_numbers[first] if first < len(proj_numbers) else None
+            image_num = image_numbers[first] if first < len(image_numbers) else None
+            raise RuntimeError(f"{msg}\n\nMismatching angle for projection {projection_num} "
+                               f"was going to be used for image file {image_num}")
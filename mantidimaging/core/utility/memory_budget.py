@@ -0,0 +1,151 @@
+# Copyright (C) 2020 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+
+import datetime
+import shutil
+import threading
+import time
+from logging import getLogger
+from typing import List, Optional, Tuple
+
+from mantidimaging.core.utility.memory_usage import system_free_memory
+from mantidimaging.core.utility.size_calculator import full_size_KB
+
+LOG = getLogger(__name__)
+
+_lock = threading.Condition()
+# Reservations that have not been released yet, oldest first
+_reservations: List['MemoryReservation'] = []
+# The reservation of the current thread, see MemoryReservation.__enter__
+_thread_reservation = threading.local()
+
+
+class MemoryBudgetError(RuntimeError):
+    pass
+
+
+def size_in_bytes(shape: Tuple[int, ...], dtype) -> int:
+    return int(full_size_KB(shape=shape, axis=0, dtype=dtype) * 1024)
+
+
+class MemoryReservation:
+    """
+    Memory set aside for an operation before it starts, so that concurrent operations and allocations
+    cannot take it. The memory stays reserved until the reservation is released, even after the
+    operation has allocated its arrays, as the pages of the arrays are only used once they are written.
+
+    Used as a context manager, arrays created by the thread within the context can use the reserved memory.
+
+    A reservation made on disk sets aside space in the scratch directory instead, for arrays that are
+    stored there because they do not fit in memory. It does not hold any memory.
+    """
+    def __init__(self, nbytes: int, owner: str, on_disk: bool = False):
+        self.nbytes = nbytes
+        self.owner = owner
+        self.on_disk = on_disk
+        self.created = datetime.datetime.now()
+        self._previous: Optional[MemoryReservation] = None
+
+    def release(self):
+        with _lock:
+            if self in _reservations:
+                _reservations.remove(self)
+                LOG.info(f"Released {self.nbytes / 1024**2:.1f} MB {self.location} reserved for '{self.owner}'")
+                _lock.notify_all()
+
+    @property
+    def location(self) -> str:
+        return "on disk" if self.on_disk else "of memory"
+
+    def __enter__(self) -> 'MemoryReservation':
+        self._previous = getattr(_thread_reservation, "reservation", None)
+        _thread_reservation.reservation = self
+        return self
+
+    def __exit__(self, *_):
+        _thread_reservation.reservation = self._previous
+        self.release()
+
+
+def reserved_bytes(exclude: Optional[MemoryReservation] = None, on_disk: bool = False) -> int:
+    """
+    :param exclude: A reservation that is not counted, e.g. the one that is going to use the memory
+    :param on_disk: Count the space reserved on disk instead of the memory
+    """
+    with _lock:
+        return sum(r.nbytes for r in _reservations if r is not exclude and r.on_disk == on_disk)
+
+
+def reservations() -> List[MemoryReservation]:
+    with _lock:
+        return list(_reservations)
+
+
+def available_bytes() -> int:
+    """
+    :return: The memory that the current thread can allocate: the free system memory that is not reserved,
+             plus the memory reserved by the thread
+    """
+    current = getattr(_thread_reservation, "reservation", None)
+    return int(system_free_memory().kb() * 1024) - reserved_bytes(exclude=current)
+
+
+def _free_disk_space() -> int:
+    from mantidimaging.core.parallel.utility import get_scratch_directory
+    return shutil.disk_usage(get_scratch_directory()).free
+
+
+def _add_reservation(nbytes: int, owner: str, on_disk: bool) -> MemoryReservation:
+    reservation = MemoryReservation(nbytes, owner, on_disk)
+    _reservations.append(reservation)
+    LOG.info(f"Reserved {nbytes / 1024**2:.1f} MB {reservation.location} for '{owner}'")
+    return reservation
+
+
+def reserve(nbytes: int, owner: str, timeout: float = 0, spill_to_disk: bool = False) -> MemoryReservation:
+    """
+    Reserve memory for an operation before it touches any data.
+
+    If the memory is held by other reservations the request is queued until they are released,
+    for up to `timeout` seconds. If it will not fit even then, it fails straight away.
+
+    :param nbytes: The peak amount of memory the operation allocates
+    :param owner: The operation, or the stack, that the memory is reserved for
+    :param timeout: How long to wait for other reservations to be released
+    :param spill_to_disk: Whether the memory is only used by arrays made with `create_array`, which are stored
+                          in the scratch directory if they do not fit in memory. If the memory is not available,
+                          the space is reserved on disk instead of failing
+    :return: The reservation, to be released when the operation completes
+    """
+    deadline = time.monotonic() + timeout
+    with _lock:
+        while True:
+            free = int(system_free_memory().kb() * 1024)
+            reserved = reserved_bytes()
+            if nbytes <= max(free - reserved, 0):
+                return _add_reservation(nbytes, owner, on_disk=False)
+
+            remaining = deadline - time.monotonic()
+            if nbytes > free or remaining <= 0:
+                if spill_to_disk and nbytes <= _free_disk_space() - reserved_bytes(on_disk=True):
+                    return _add_reservation(nbytes, owner, on_disk=True)
+                raise MemoryBudgetError(f"Not enough memory for '{owner}': it needs {nbytes / 1024**2:.1f} MB, "
+                                        f"{free / 1024**2:.1f} MB are free, of which {reserved / 1024**2:.1f} MB "
+                                        f"are reserved for other operations.")
+            LOG.info(f"Waiting for {reserved / 1024**2:.1f} MB of reserved memory to be released for '{owner}'")
+            _lock.wait(remaining)
+
+
+def report() -> str:
+    """
+    Describe the memory reserved by operations that have not completed yet.
+    """
+    current = reservations()
+    lines = [
+        f"{reserved_bytes() / 1024**2:.1f} MB of memory and {reserved_bytes(on_disk=True) / 1024**2:.1f} MB on disk "
+        f"reserved by {len(current)} operations"
+    ]
+    for reservation in current:
+        lines.append(f"  {reservation.created:%H:%M:%S} {reservation.nbytes / 1024**2:10.1f} MB "
+                     f"{reservation.location} {reservation.owner}")
+    return "\n".join(lines)
@@ -25,6 +25,42 @@ class ProgressHandler(object):
 STEPS_TO_AVERAGE = 30
 
 
+class _Subtasks(object):
+    """
+    Combines the progress of subtasks that run concurrently into the progress of the task they are part of.
+    """
+    def __init__(self, task: 'Progress', weights: List[int]):
+        self.task = task
+        self.weights = weights
+        self.completions = [0.0] * len(weights)
+        self.reported_steps = 0
+        self.lock = threading.Lock()
+
+    def update(self, index: int, subtask: 'Progress'):
+        if self.task.should_cancel:
+            # raised by the subtask, in the thread that runs it
+            subtask.cancel(self.task.cancel_msg)
+
+        with self.lock:
+            # the completion of a subtask starts again from 0 if its steps are estimated again, e.g. by its next stage
+            self.completions[index] = max(self.completions[index], subtask.completion())
+            steps = int(sum(w * c for w, c in zip(self.weights, self.completions))) - self.reported_steps
+            self.reported_steps += max(steps, 0)
+
+        if steps > 0:
+            self.task.update(steps, msg=subtask.task_name, force_continue=True)
+
+
+class _SubtaskHandler(ProgressHandler):
+    def __init__(self, subtasks: _Subtasks, index: int):
+        super(_SubtaskHandler, self).__init__()
+        self.subtasks = subtasks
+        self.index = index
+
+    def progress_update(self):
+        self.subtasks.update(self.index, self.progress)
+
+
 class Progress(object):
     """
     Class used to perform basic progress monitoring and reporting.
@@ -165,6 +201,26 @@ class Progress(object):
         self.progress_handlers.append(handler)
         handler.progress = self
 
+    def subtasks(self, weights: List[int], task_names: List[str]) -> List['Progress']:
+        """
+        Creates the progress instances of subtasks that run concurrently as parts of this task.
+
+        The completion of this task is the completion of the subtasks, weighted by e.g. the number of images they
+        process. Cancelling this task cancels the subtasks.
+
+        :param weights: The amount of work done by each subtask
+        :param task_names: The names of the subtasks, used as the message of the updates of this task
+        :return: A progress instance for each subtask
+        """
+        self.set_estimated_steps(sum(weights))
+        subtasks = _Subtasks(self, weights)
+        progresses = []
+        for index, task_name in enumerate(task_names):
+            progress = Progress(task_name=task_name)
+            progress.add_progress_handler(_SubtaskHandler(subtasks, index))
+            progresses.append(progress)
+        return progresses
+
     def update(self, steps=1, msg: str = "", force_continue=False):
         """
         Updates the progress of the task.
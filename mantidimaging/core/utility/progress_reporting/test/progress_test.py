@@ -247,6 +247,37 @@ class ProgressTest(unittest.TestCase):
         self.assertFalse(p.is_completed())
         self.assertTrue(p.should_cancel)
 
+    def test_subtasks_combined_by_weight(self):
+        p = Progress()
+        sample, flat = p.subtasks([30, 10], ["Sample", "Flat"])
+
+        flat.set_estimated_steps(10)
+        for _ in range(10):
+            flat.update()
+        self.assertEqual(p.completion(), 0.25)
+        self.assertEqual(p.last_status_message().split(" |")[0], "Flat")
+
+        # the completion of a subtask does not go back when its steps are estimated again
+        flat.set_estimated_steps(5)
+        flat.update()
+        self.assertEqual(p.completion(), 0.25)
+
+        sample.set_estimated_steps(3)
+        for _ in range(3):
+            sample.update()
+        self.assertEqual(p.completion(), 1.0)
+
+    def test_cancelling_task_cancels_subtasks(self):
+        p = Progress()
+        sample, = p.subtasks([10], ["Sample"])
+        sample.set_estimated_steps(10)
+
+        sample.update()
+        p.cancel("nope")
+        with self.assertRaises(RuntimeError):
+            sample.update()
+        self.assertTrue(sample.should_cancel)
+
 
 if __name__ == "__main__":
     unittest.main()
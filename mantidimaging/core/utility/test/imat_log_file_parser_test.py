@@ -72,3 +72,58 @@ def test_source_file():
     ]
     logfile = IMATLogFile(test_input, "/tmp/fake")
     assert logfile.source_file == "/tmp/fake"
+
+
+def _generated_log(num_projections):
+    yield EXPECTED_HEADER_FOR_IMAT_LOG_FILE
+    yield ["ignored line"]
+    for i in range(num_projections):
+        yield [
+            f"Mon Jan 01 00:00:{i % 60:02d} 2020", f"Projection:  {i}  angle: {i * 0.5}",
+            f"Monitor 3 before:  {1000 * i}", f"Monitor 3 after:  {1000 * i + i}"
+        ]
+
+
+def test_parsing_generated_log():
+    logfile = IMATLogFile(_generated_log(1000), "/tmp/fake")
+
+    np.testing.assert_array_equal(logfile.projection_numbers(), np.arange(1000))
+    np.testing.assert_allclose(logfile.projection_angles().value, np.deg2rad(np.arange(1000) * 0.5))
+    np.testing.assert_array_equal(logfile.counts().value, np.arange(1000))
+    logfile.raise_if_angle_missing([f"IMAT_Tomo_{i:06d}.tif" for i in range(1000)])
+
+
+def test_parsed_columns_are_cached():
+    logfile = IMATLogFile(_generated_log(3), "/tmp/fake")
+
+    assert logfile.projection_angles() is logfile.projection_angles()
+    assert logfile.counts() is logfile.counts()
+
+
+def test_wrong_projection_formatting():
+    test_input = [
+        EXPECTED_HEADER_FOR_IMAT_LOG_FILE,
+        ["ignored line"],
+        ["timestamp", "Projection:  0  angle: 0.0", "counts before: 12345", "counts_after: 45678"],
+        ["timestamp", "Projection:  1", "counts before: 12345", "counts_after: 45678"],
+    ]
+    logfile = IMATLogFile(test_input, "/tmp/fake")
+    assert_raises(ValueError, logfile.projection_angles)
+
+
+def test_mismatching_projection_reported():
+    logfile = IMATLogFile(_generated_log(3), "/tmp/fake")
+    try:
+        logfile.raise_if_angle_missing(["file_000.tif", "file_002.tif", "file_003.tif"])
+        assert False, "Did not raise"
+    except RuntimeError as e:
+        assert "projection 1 was going to be used for image file 002.tif" in str(e)
+
+
+def test_projection_number_found_in_image_file_name():
+    logfile = IMATLogFile(_generated_log(2), "/tmp/fake")
+
+    # the projection number only has to appear in the file name after the last underscore
+    logfile.raise_if_angle_missing(["Tomo_0000.tif", "Tomo_0001.tif"])
+    logfile.raise_if_angle_missing(["Tomo_10.tif", "Tomo_21.tif"])
+    assert_raises(RuntimeError, logfile.raise_if_angle_missing, ["Tomo_0000.tif", "Tomo_0002.tif"])
@@ -0,0 +1,98 @@
+# Copyright (C) 2020 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+
+import threading
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from mantidimaging.core.parallel import utility as pu
+from mantidimaging.core.utility import memory_budget
+from mantidimaging.core.utility.memory_budget import MemoryBudgetError
+
+MB = 1024**2
+
+
+def _free_memory(nbytes):
+    free = mock.Mock()
+    free.kb.return_value = nbytes / 1024
+    return mock.patch("mantidimaging.core.utility.memory_budget.system_free_memory", return_value=free)
+
+
+class MemoryBudgetTest(unittest.TestCase):
+    def test_size_in_bytes(self):
+        self.assertEqual(memory_budget.size_in_bytes((10, 20, 30), np.float32), 10 * 20 * 30 * 4)
+
+    def test_reserve_and_release(self):
+        with _free_memory(100 * MB):
+            with memory_budget.reserve(60 * MB, "Test") as reservation:
+                self.assertIn(reservation, memory_budget.reservations())
+                self.assertEqual(memory_budget.reserved_bytes(), 60 * MB)
+                self.assertIn("Test", memory_budget.report())
+                # the reserved memory is available to this thread, but not to others
+                self.assertEqual(memory_budget.available_bytes(), 100 * MB)
+                self.assertEqual(memory_budget.available_bytes() - memory_budget.reserved_bytes(), 40 * MB)
+
+            self.assertNotIn(reservation, memory_budget.reservations())
+            self.assertEqual(memory_budget.reserved_bytes(), 0)
+
+    def test_fails_fast_if_memory_will_never_fit(self):
+        with _free_memory(100 * MB):
+            self.assertRaises(MemoryBudgetError, memory_budget.reserve, 200 * MB, "Test", timeout=10)
+
+    def test_spills_to_disk_if_memory_will_never_fit(self):
+        with _free_memory(100 * MB), \
+                mock.patch("mantidimaging.core.utility.memory_budget._free_disk_space", return_value=500 * MB):
+            with memory_budget.reserve(200 * MB, "Test", spill_to_disk=True) as reservation:
+                self.assertTrue(reservation.on_disk)
+                # no memory is held by the reservation
+                self.assertEqual(memory_budget.reserved_bytes(), 0)
+                self.assertEqual(memory_budget.reserved_bytes(on_disk=True), 200 * MB)
+                self.assertIn("on disk", memory_budget.report())
+
+                self.assertRaises(MemoryBudgetError,
+                                  memory_budget.reserve,
+                                  400 * MB,
+                                  "Second",
+                                  spill_to_disk=True)
+
+    def test_spills_to_disk_if_memory_is_reserved(self):
+        with _free_memory(100 * MB), \
+                mock.patch("mantidimaging.core.utility.memory_budget._free_disk_space", return_value=500 * MB):
+            with memory_budget.reserve(60 * MB, "First"):
+                with memory_budget.reserve(60 * MB, "Second", spill_to_disk=True) as reservation:
+                    self.assertTrue(reservation.on_disk)
+                    self.assertEqual(memory_budget.reserved_bytes(), 60 * MB)
+
+    def test_fails_if_memory_is_reserved(self):
+        with _free_memory(100 * MB):
+            with memory_budget.reserve(60 * MB, "First"):
+                self.assertRaises(MemoryBudgetError, memory_budget.reserve, 60 * MB, "Second")
+
+    def test_waits_for_reservation_to_be_released(self):
+        with _free_memory(100 * MB):
+            first = memory_budget.reserve(60 * MB, "First")
+            timer = threading.Timer(0.1, first.release)
+            timer.start()
+
+            second = memory_budget.reserve(60 * MB, "Second", timeout=5)
+
+            self.assertEqual(memory_budget.reservations(), [second])
+            second.release()
+            timer.join()
+
+    def test_allocation_cannot_use_memory_reserved_by_others(self):
+        with _free_memory(100 * MB):
+            reservation = memory_budget.reserve(60 * MB, "Other")
+            try:
+                self.assertFalse(pu.enough_memory((50, MB // 4, 1), np.float32))
+                self.assertTrue(pu.enough_memory((30, MB // 4, 1), np.float32))
+                with reservation:
+                    self.assertTrue(pu.enough_memory((50, MB // 4, 1), np.float32))
+            finally:
+                reservation.release()
+
+
+if __name__ == '__main__':
+    unittest.main()
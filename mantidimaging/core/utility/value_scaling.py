@@ -62,6 +62,11 @@ def apply_factor(data: np.ndarray, scale_factors, cores=None, chunksize=None, pr
 
         # scale up all images by the mean sum of all of them, this will keep the
         # contrast the same as from the region of interest
-        data, scale_factors = ptsm.execute(data, [scale_factors.mean()], scale_up_partial, cores, chunksize, progress)
+        data, scale_factors = ptsm.execute(data, [scale_factors.mean()],
+                                           scale_up_partial,
+                                           cores,
+                                           chunksize,
+                                           progress,
+                                           slab_kernel=True)
 
     return data
@@ -4,7 +4,7 @@
 from typing import Iterable
 
 from mantidimaging.core.data import Images
-from mantidimaging.core.operation_history.operations import ops_to_partials, ImageOperation
+from mantidimaging.core.operation_history.operations import ops_to_stages, ImageOperation
 
 
 class OpHistoryCopyDialogModel:
@@ -15,7 +15,10 @@ class OpHistoryCopyDialogModel:
         if copy:
             self.images = self.images.copy()
 
-        to_apply = ops_to_partials(ops)
+        # per-image operations are fused, so that each slab is only read and written once
+        to_apply = ops_to_stages(ops)
         for op in to_apply:
             op(self.images)
+        # the stages change the data in place without recording an operation
+        self.images.clear_sinogram_cache()
         return self.images
@@ -16,7 +16,7 @@ class OpHistoryCopyDialogModelTest(unittest.TestCase):
         self.images.data[:] = 100
         self.model = OpHistoryCopyDialogModel(self.images)
 
-    @patch('mantidimaging.gui.dialogs.op_history_copy.model.ops_to_partials')
+    @patch('mantidimaging.gui.dialogs.op_history_copy.model.ops_to_stages')
     def test_final_function_result_returned(self, mock_partial_conversions):
         expected = self.images
         call_mock = MagicMock()
@@ -28,7 +28,7 @@ class OpHistoryCopyDialogModelTest(unittest.TestCase):
         mock_partial_conversions.return_value = [
             fake_filter,
         ]
-        # Value passed to apply_ops is only used in ops_to_partial, which is mocked for
+        # Value passed to apply_ops is only used in ops_to_stages, which is mocked for
         # this test, so the value of the parameter shouldn't matter.
         result = self.model.apply_ops([1], copy=False)
         call_mock.assert_called_once()
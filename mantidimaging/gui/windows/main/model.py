@@ -4,6 +4,7 @@
 import os
 import uuid
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from logging import getLogger
 from typing import Any, Dict, List, Optional
 
@@ -12,12 +13,23 @@ from PyQt5.QtWidgets import QDockWidget
 from mantidimaging.core.data import Images
 from mantidimaging.core.data.dataset import Dataset
 from mantidimaging.core.io import loader, saver
-from mantidimaging.core.utility.data_containers import LoadingParameters, ProjectionAngles
+from mantidimaging.core.io.utility import get_file_names
+from mantidimaging.core.parallel import utility as pu
+from mantidimaging.core.utility import memory_budget
+from mantidimaging.core.utility.data_containers import ImageParameters, LoadingParameters, ProjectionAngles
+from mantidimaging.core.utility.progress_reporting import Progress
+from mantidimaging.core.utility.size_calculator import number_of_images_from_indices
 from mantidimaging.gui.windows.stack_visualiser import StackVisualiserView
 
 StackId = namedtuple('StackId', ['id', 'name'])
 
 
+def _number_of_images(parameters: ImageParameters) -> int:
+    if parameters.indices:
+        return max(number_of_images_from_indices(*parameters.indices), 1)
+    return max(len(get_file_names(parameters.input_path, parameters.format, parameters.prefix, essential=False)), 1)
+
+
 class MainWindowModel(object):
     def __init__(self):
         super(MainWindowModel, self).__init__()
@@ -25,29 +37,53 @@ class MainWindowModel(object):
         self.active_stacks: Dict[uuid.UUID, QDockWidget] = {}
 
     def do_load_stack(self, parameters: LoadingParameters, progress):
-        ds = Dataset(loader.load_p(parameters.sample, parameters.dtype, progress))
+        return self._load_dataset(parameters, progress, owner=f"Loading {parameters.sample.input_path}")
+
+    def _load_dataset(self, parameters: LoadingParameters, progress, owner: str) -> Dataset:
+        # the stacks are loaded concurrently, as the flats and darks are often on another file system than the sample.
+        # The sample is submitted first, as it takes the longest
+        all_stacks = (("Sample", parameters.sample), ("Flat Before", parameters.flat_before),
+                      ("Flat After", parameters.flat_after), ("Dark Before", parameters.dark_before),
+                      ("Dark After", parameters.dark_after), ("180deg", parameters.proj_180deg))
+        stacks = [(name, image_parameters) for name, image_parameters in all_stacks if image_parameters]
+        progress = Progress.ensure_instance(progress, task_name="Load")
+        stack_progresses = progress.subtasks([_number_of_images(p) for _, p in stacks], [name for name, _ in stacks])
+
+        def load(image_parameters: ImageParameters, stack_progress: Progress) -> Images:
+            # the arrays are owned by the stacks once they are added
+            with pu.shared_array_owner(owner):
+                return loader.load_p(image_parameters, parameters.dtype, stack_progress, parameters.roi,
+                                     parameters.binning)
+
+        with ThreadPoolExecutor(max_workers=len(stacks)) as executor:
+            futures = [
+                executor.submit(load, p, stack_progress) for (_, p), stack_progress in zip(stacks, stack_progresses)
+            ]
+            try:
+                loaded = {name: future.result() for (name, _), future in zip(stacks, futures)}
+            except Exception:
+                # the other stacks stop at their next progress update
+                for stack_progress in stack_progresses:
+                    stack_progress.cancel()
+                raise
+
+        ds = Dataset(loaded["Sample"],
+                     flat_before=loaded.get("Flat Before"),
+                     flat_after=loaded.get("Flat After"),
+                     dark_before=loaded.get("Dark Before"),
+                     dark_after=loaded.get("Dark After"))
         ds.sample._is_sinograms = parameters.sinograms
         ds.sample.pixel_size = parameters.pixel_size
 
         if parameters.sample.log_file:
             ds.sample.log_file = loader.load_log(parameters.sample.log_file)
-
-        if parameters.flat_before:
-            ds.flat_before = loader.load_p(parameters.flat_before, parameters.dtype, progress)
-            if parameters.flat_before.log_file:
-                ds.flat_before.log_file = loader.load_log(parameters.flat_before.log_file)
-        if parameters.flat_after:
-            ds.flat_after = loader.load_p(parameters.flat_after, parameters.dtype, progress)
-            if parameters.flat_after.log_file:
-                ds.flat_after.log_file = loader.load_log(parameters.flat_after.log_file)
-
-        if parameters.dark_before:
-            ds.dark_before = loader.load_p(parameters.dark_before, parameters.dtype, progress)
-        if parameters.dark_after:
-            ds.dark_after = loader.load_p(parameters.dark_after, parameters.dtype, progress)
+        if parameters.flat_before and parameters.flat_before.log_file:
+            ds.flat_before.log_file = loader.load_log(parameters.flat_before.log_file)
+        if parameters.flat_after and parameters.flat_after.log_file:
+            ds.flat_after.log_file = loader.load_log(parameters.flat_after.log_file)
 
         if parameters.proj_180deg:
-            ds.sample.proj180deg = loader.load_p(parameters.proj_180deg, parameters.dtype, progress)
+            ds.sample.proj180deg = loaded["180deg"]
 
         return ds
 
@@ -92,6 +128,7 @@ class MainWindowModel(object):
     def add_stack(self, stack_visualiser: StackVisualiserView, dock_widget: 'QDockWidget'):
         stack_visualiser.uuid = uuid.uuid1()
         self.active_stacks[stack_visualiser.uuid] = dock_widget
+        pu.set_shared_array_owner(stack_visualiser.presenter.images.memory_filename, str(stack_visualiser.uuid))
         getLogger(__name__).debug(f"Active stacks: {self.active_stacks}")
 
     def get_stack(self, stack_uuid: uuid.UUID) -> QDockWidget:
@@ -115,6 +152,7 @@ class MainWindowModel(object):
             # Free previous images stack before reassignment
             stack.presenter.images.free_memory()
             stack.presenter.images = images
+            pu.set_shared_array_owner(images.memory_filename, str(stack_uuid))
 
     def get_stack_by_name(self, search_name: str) -> Optional[QDockWidget]:
         for stack_id in self.stack_list:
@@ -156,6 +194,12 @@ class MainWindowModel(object):
         :param stack_uuid: The unique ID of the stack that will be removed.
         """
         del self.active_stacks[stack_uuid]
+        # anything the stack still owns cannot be used anymore
+        pu.free_leaked_shared_arrays(owner=str(stack_uuid))
+
+    def shared_memory_report(self) -> str:
+        stack_names = {str(stack.id): stack.name for stack in self.stack_list}
+        return f"{pu.shared_memory_report(stack_names)}\n{memory_budget.report()}"
 
     @property
     def have_active_stacks(self) -> bool:
@@ -6,13 +6,16 @@ import os
 import traceback
 from enum import Enum, auto
 from logging import getLogger
-from typing import TYPE_CHECKING, Union, Tuple
+from typing import TYPE_CHECKING, Optional, Union, Tuple
 from uuid import UUID
 
 from PyQt5.QtWidgets import QDockWidget, QTabBar, QApplication
 
 from mantidimaging.core.data import Images
 from mantidimaging.core.data.dataset import Dataset
+from mantidimaging.core.data.live_images import LiveImages
+from mantidimaging.core.io.loader.live_loader import LiveLoader
+from mantidimaging.core.io.utility import get_file_extension, get_prefix
 from mantidimaging.gui.dialogs.async_task import start_async_task_view
 from mantidimaging.gui.mvp_base import BasePresenter
 from mantidimaging.gui.windows.stack_visualiser.presenter import SVNotification
@@ -39,6 +42,7 @@ class MainWindowPresenter(BasePresenter):
     def __init__(self, view):
         super(MainWindowPresenter, self).__init__(view)
         self.model = MainWindowModel()
+        self.live_loader: Optional[LiveLoader] = None
 
     def notify(self, signal, **baggage):
         try:
@@ -56,6 +60,9 @@ class MainWindowPresenter(BasePresenter):
             getLogger(__name__).exception("Notification handler failed")
 
     def _do_remove_stack(self, uuid: UUID):
+        if self.live_loader is not None \
+                and self.model.get_stack_visualiser(uuid).presenter.images is self.live_loader.images:
+            self.stop_watching()
         self.model.do_remove_stack(uuid)
         self.view.active_stacks_changed.emit()
 
@@ -85,6 +92,37 @@ class MainWindowPresenter(BasePresenter):
         else:
             self._handle_task_error(self.LOAD_ERROR_STRING, log, task)
 
+    def watch_directory(self, first_file: str, expected_images: Optional[int] = None):
+        """
+        Load the projections of a scan while it is acquired. The stack is shown once the first projections
+        are loaded, and refreshed as more are appended.
+
+        :param first_file: A projection of the scan, to find the directory, prefix and format of the files
+        :param expected_images: The number of projections in the whole scan, if it is known
+        """
+        self.stop_watching()
+        self.live_loader = LiveLoader(os.path.dirname(first_file),
+                                      get_prefix(first_file),
+                                      get_file_extension(first_file),
+                                      expected_images=expected_images)
+        # the listeners are called on the thread watching the directory, the signal moves the update to the GUI
+        self.live_loader.add_listener(self.view.live_images_appended.emit)
+        self.live_loader.start()
+
+    def stop_watching(self):
+        if self.live_loader is not None:
+            self.live_loader.stop()
+            self.live_loader = None
+
+    def on_live_images_appended(self, images: LiveImages, new_indices: range):
+        # the updates that were queued before the watching stopped are ignored
+        if self.live_loader is None or images is not self.live_loader.images:
+            return
+        if new_indices.start == 0:
+            self.create_new_stack(images, os.path.basename(images.filenames[0]))
+        else:
+            self.update_stack_with_images(images)
+
     def _handle_task_error(self, base_message: str, log, task):
         msg = base_message.format(task.error)
         log.error(msg)
@@ -197,3 +235,6 @@ class MainWindowPresenter(BasePresenter):
 
     def add_projection_angles_to_sample(self, stack_name: str, proj_angles: ProjectionAngles):
         self.model.add_projection_angles_to_sample(stack_name, proj_angles)
+
+    def shared_memory_report(self) -> str:
+        return self.model.shared_memory_report()
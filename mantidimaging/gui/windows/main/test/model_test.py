@@ -1,13 +1,15 @@
 # Copyright (C) 2020 ISIS Rutherford Appleton Laboratory UKRI
 # SPDX - License - Identifier: GPL-3.0-or-later
 
+import threading
 import unittest
 import uuid
 
 import mock
 import numpy as np
 
-from mantidimaging.core.utility.data_containers import LoadingParameters, ProjectionAngles
+from mantidimaging.core.utility.data_containers import Indices, LoadingParameters, ProjectionAngles
+from mantidimaging.core.utility.progress_reporting import Progress
 from mantidimaging.gui.windows.main import MainWindowModel
 from mantidimaging.gui.windows.main.model import StackId
 
@@ -104,6 +106,20 @@ class MainWindowModelTest(unittest.TestCase):
         self.model.do_remove_stack(uid)
         self.assertEqual(0, len(self.model.stack_list))
 
+    @mock.patch('mantidimaging.gui.windows.main.model.pu')
+    def test_add_stack_owns_shared_array(self, pu_mock):
+        stack_mock = mock.Mock()
+        self.model.add_stack(stack_mock, mock.Mock())
+
+        pu_mock.set_shared_array_owner.assert_called_once_with(stack_mock.presenter.images.memory_filename,
+                                                               str(stack_mock.uuid))
+
+    @mock.patch('mantidimaging.gui.windows.main.model.pu')
+    def test_do_remove_stack_frees_leaked_shared_arrays(self, pu_mock):
+        uid, _, _ = self._add_mock_widget()
+        self.model.do_remove_stack(uid)
+        pu_mock.free_leaked_shared_arrays.assert_called_once_with(owner=str(uid))
+
     def test_have_active_stacks(self):
         uid, _, _ = self._add_mock_widget()
         self.assertTrue(self.model.have_active_stacks)
@@ -114,58 +130,58 @@ class MainWindowModelTest(unittest.TestCase):
     @mock.patch('mantidimaging.core.io.loader.load_p')
     def test_do_load_stack_sample_only(self, load_p_mock: mock.Mock, load_log_mock: mock.Mock):
         lp = LoadingParameters()
-        sample_mock = mock.Mock()
+        sample_mock = mock.Mock(indices=Indices(0, 10, 1))
         sample_mock.log_file = None
         lp.sample = sample_mock
         lp.dtype = "dtype_test"
         lp.sinograms = True
         lp.pixel_size = 101
-        progress_mock = mock.Mock()
+        progress = Progress()
 
-        self.model.do_load_stack(lp, progress_mock)
+        self.model.do_load_stack(lp, progress)
 
-        load_p_mock.assert_called_once_with(sample_mock, lp.dtype, progress_mock)
+        load_p_mock.assert_called_once_with(sample_mock, lp.dtype, mock.ANY, lp.roi, lp.binning)
         load_log_mock.assert_not_called()
 
     @mock.patch('mantidimaging.core.io.loader.load_log')
     @mock.patch('mantidimaging.core.io.loader.load_p')
     def test_do_load_stack_sample_and_sample_log(self, load_p_mock: mock.Mock, load_log_mock: mock.Mock):
         lp = LoadingParameters()
-        sample_mock = mock.Mock()
+        sample_mock = mock.Mock(indices=Indices(0, 10, 1))
         lp.sample = sample_mock
         lp.dtype = "dtype_test"
         lp.sinograms = False
         lp.pixel_size = 101
-        progress_mock = mock.Mock()
+        progress = Progress()
 
-        self.model.do_load_stack(lp, progress_mock)
+        self.model.do_load_stack(lp, progress)
 
-        load_p_mock.assert_called_once_with(sample_mock, lp.dtype, progress_mock)
+        load_p_mock.assert_called_once_with(sample_mock, lp.dtype, mock.ANY, lp.roi, lp.binning)
         load_log_mock.assert_called_once_with(sample_mock.log_file)
 
     @mock.patch('mantidimaging.core.io.loader.load_log')
     @mock.patch('mantidimaging.core.io.loader.load_p')
     def test_do_load_stack_sample_and_flat(self, load_p_mock: mock.Mock, load_log_mock: mock.Mock):
         lp = LoadingParameters()
-        sample_mock = mock.Mock()
+        sample_mock = mock.Mock(indices=Indices(0, 10, 1))
         lp.sample = sample_mock
         lp.dtype = "dtype_test"
         lp.sinograms = False
         lp.pixel_size = 101
 
-        flat_before_mock = mock.Mock()
+        flat_before_mock = mock.Mock(indices=Indices(0, 10, 1))
         lp.flat_before = flat_before_mock
-        flat_after_mock = mock.Mock()
+        flat_after_mock = mock.Mock(indices=Indices(0, 10, 1))
         lp.flat_after = flat_after_mock
-        progress_mock = mock.Mock()
+        progress = Progress()
 
-        self.model.do_load_stack(lp, progress_mock)
+        self.model.do_load_stack(lp, progress)
 
         load_p_mock.assert_has_calls([
-            mock.call(sample_mock, lp.dtype, progress_mock),
-            mock.call(flat_before_mock, lp.dtype, progress_mock),
-            mock.call(flat_after_mock, lp.dtype, progress_mock)
-        ])
+            mock.call(sample_mock, lp.dtype, mock.ANY, lp.roi, lp.binning),
+            mock.call(flat_before_mock, lp.dtype, mock.ANY, lp.roi, lp.binning),
+            mock.call(flat_after_mock, lp.dtype, mock.ANY, lp.roi, lp.binning)
+        ], any_order=True)
         load_log_mock.assert_has_calls([
             mock.call(sample_mock.log_file),
             mock.call(flat_before_mock.log_file),
@@ -176,37 +192,37 @@ class MainWindowModelTest(unittest.TestCase):
     @mock.patch('mantidimaging.core.io.loader.load_p')
     def test_do_load_stack_sample_and_flat_and_dark_and_180deg(self, load_p_mock: mock.Mock, load_log_mock: mock.Mock):
         lp = LoadingParameters()
-        sample_mock = mock.Mock()
+        sample_mock = mock.Mock(indices=Indices(0, 10, 1))
         lp.sample = sample_mock
         lp.dtype = "dtype_test"
         lp.sinograms = False
         lp.pixel_size = 101
 
-        flat_before_mock = mock.Mock()
+        flat_before_mock = mock.Mock(indices=Indices(0, 10, 1))
         lp.flat_before = flat_before_mock
-        flat_after_mock = mock.Mock()
+        flat_after_mock = mock.Mock(indices=Indices(0, 10, 1))
         lp.flat_after = flat_after_mock
 
-        dark_before_mock = mock.Mock()
+        dark_before_mock = mock.Mock(indices=Indices(0, 10, 1))
         lp.dark_before = dark_before_mock
-        dark_after_mock = mock.Mock()
+        dark_after_mock = mock.Mock(indices=Indices(0, 10, 1))
         lp.dark_after = dark_after_mock
 
-        proj_180deg_mock = mock.Mock()
+        proj_180deg_mock = mock.Mock(indices=Indices(0, 10, 1))
         lp.proj_180deg = proj_180deg_mock
 
-        progress_mock = mock.Mock()
+        progress = Progress()
 
-        self.model.do_load_stack(lp, progress_mock)
+        self.model.do_load_stack(lp, progress)
 
         load_p_mock.assert_has_calls([
-            mock.call(sample_mock, lp.dtype, progress_mock),
-            mock.call(flat_before_mock, lp.dtype, progress_mock),
-            mock.call(flat_after_mock, lp.dtype, progress_mock),
-            mock.call(dark_before_mock, lp.dtype, progress_mock),
-            mock.call(dark_after_mock, lp.dtype, progress_mock),
-            mock.call(proj_180deg_mock, lp.dtype, progress_mock)
-        ])
+            mock.call(sample_mock, lp.dtype, mock.ANY, lp.roi, lp.binning),
+            mock.call(flat_before_mock, lp.dtype, mock.ANY, lp.roi, lp.binning),
+            mock.call(flat_after_mock, lp.dtype, mock.ANY, lp.roi, lp.binning),
+            mock.call(dark_before_mock, lp.dtype, mock.ANY, lp.roi, lp.binning),
+            mock.call(dark_after_mock, lp.dtype, mock.ANY, lp.roi, lp.binning),
+            mock.call(proj_180deg_mock, lp.dtype, mock.ANY, lp.roi, lp.binning)
+        ], any_order=True)
 
         load_log_mock.assert_has_calls([
             mock.call(sample_mock.log_file),
@@ -214,6 +230,49 @@ class MainWindowModelTest(unittest.TestCase):
             mock.call(flat_after_mock.log_file)
         ])
 
+    @mock.patch('mantidimaging.core.io.loader.load_p')
+    def test_do_load_stack_loads_stacks_concurrently(self, load_p_mock: mock.Mock):
+        lp = LoadingParameters()
+        lp.sample = mock.Mock(indices=Indices(0, 10, 1), log_file=None)
+        lp.flat_before = mock.Mock(indices=Indices(0, 10, 1), log_file=None)
+        lp.dtype = "dtype_test"
+        lp.sinograms = False
+        lp.pixel_size = 101
+        # each load waits for the other one to start
+        barrier = threading.Barrier(2, timeout=5)
+
+        def load_p(*_):
+            barrier.wait()
+            return mock.Mock()
+
+        load_p_mock.side_effect = load_p
+
+        ds = self.model.do_load_stack(lp, Progress())
+
+        self.assertEqual(load_p_mock.call_count, 2)
+        self.assertIsNotNone(ds.flat_before)
+
+    @mock.patch('mantidimaging.core.io.loader.load_p')
+    def test_do_load_stack_failure_cancels_other_stacks(self, load_p_mock: mock.Mock):
+        lp = LoadingParameters()
+        lp.sample = mock.Mock(indices=Indices(0, 10, 1), log_file=None)
+        lp.flat_before = mock.Mock(indices=Indices(0, 10, 1), log_file=None)
+        lp.dtype = "dtype_test"
+        lp.sinograms = False
+        lp.pixel_size = 101
+        progresses = []
+
+        def load_p(parameters, dtype, stack_progress, roi, binning):
+            progresses.append(stack_progress)
+            if parameters is lp.sample:
+                raise RuntimeError("Broken file")
+            return mock.Mock()
+
+        load_p_mock.side_effect = load_p
+
+        self.assertRaisesRegex(RuntimeError, "Broken file", self.model.do_load_stack, lp, Progress())
+        self.assertTrue(all(p.should_cancel for p in progresses))
+
     def test_create_name(self):
         self.assertEqual("apple", self.model.create_name("apple"))
 
@@ -56,6 +56,58 @@ class MainWindowPresenterTest(unittest.TestCase):
         start_async_mock.assert_called_once_with(self.view, self.presenter.model.do_load_stack,
                                                  self.presenter._on_stack_load_done, {'parameters': parameters_mock})
 
+    @mock.patch("mantidimaging.gui.windows.main.presenter.LiveLoader")
+    def test_watch_directory(self, live_loader: mock.Mock):
+        self.view.live_images_appended = mock.Mock()
+
+        self.presenter.watch_directory("/scan/tomo_0001.tif", 100)
+
+        live_loader.assert_called_once_with("/scan", "/scan/tomo", "tif", expected_images=100)
+        live_loader.return_value.add_listener.assert_called_once_with(self.view.live_images_appended.emit)
+        live_loader.return_value.start.assert_called_once()
+
+        self.presenter.watch_directory("/other_scan/tomo_0001.tif", 100)
+        # only one directory is watched at a time
+        live_loader.return_value.stop.assert_called_once()
+
+    def test_live_stack_shown_then_refreshed(self):
+        self.presenter.live_loader = mock.Mock()
+        images = self.presenter.live_loader.images
+        images.filenames = ["/scan/tomo_0001.tif"]
+        self.presenter.create_new_stack = mock.Mock()
+        self.presenter.update_stack_with_images = mock.Mock()
+
+        self.presenter.on_live_images_appended(images, range(0, 2))
+        self.presenter.create_new_stack.assert_called_once_with(images, "tomo_0001.tif")
+        self.presenter.update_stack_with_images.assert_not_called()
+
+        self.presenter.on_live_images_appended(images, range(2, 3))
+        self.presenter.create_new_stack.assert_called_once()
+        self.presenter.update_stack_with_images.assert_called_once_with(images)
+
+    def test_live_stack_updates_ignored_after_watching_stops(self):
+        live_loader = mock.Mock()
+        self.presenter.live_loader = live_loader
+        self.presenter.create_new_stack = mock.Mock()
+
+        self.presenter.stop_watching()
+        self.presenter.on_live_images_appended(live_loader.images, range(0, 2))
+
+        live_loader.stop.assert_called_once()
+        self.presenter.create_new_stack.assert_not_called()
+
+    def test_removing_live_stack_stops_watching(self):
+        live_loader = mock.Mock()
+        self.presenter.live_loader = live_loader
+        self.presenter.model = mock.Mock()
+        self.presenter.model.get_stack_visualiser.return_value.presenter.images = live_loader.images
+        self.view.active_stacks_changed.emit = mock.Mock()
+
+        self.presenter._do_remove_stack("stack-uuid")
+
+        live_loader.stop.assert_called_once()
+        self.assertIsNone(self.presenter.live_loader)
+
     def test_make_stack_window(self):
         images = generate_images()
         dock_mock = mock.Mock()
@@ -36,6 +36,8 @@ class MainWindowView(BaseMainWindowView):
 
     active_stacks_changed = pyqtSignal()
     backend_message = pyqtSignal(bytes)
+    # emitted from the thread watching a directory, with the live stack and the indices of the new projections
+    live_images_appended = pyqtSignal(object, object)
 
     menuFile: QMenu
     menuWorkflow: QMenu
@@ -49,8 +51,10 @@ class MainWindowView(BaseMainWindowView):
     actionLoadProjectionAngles: QAction
     actionLoad180deg: QAction
     actionLoad: QAction
+    actionWatchDirectory: QAction
     actionSave: QAction
     actionExit: QAction
+    actionSharedMemory: QAction
 
     filters: Optional[FiltersWindowView] = None
     recon: Optional[ReconstructWindowView] = None
@@ -82,6 +86,8 @@ class MainWindowView(BaseMainWindowView):
 
     def setup_shortcuts(self):
         self.actionLoad.triggered.connect(self.show_load_dialogue)
+        self.actionWatchDirectory.triggered.connect(self.watch_directory_dialog)
+        self.live_images_appended.connect(self.presenter.on_live_images_appended)
         self.actionSampleLoadLog.triggered.connect(self.load_sample_log_dialog)
         self.actionLoad180deg.triggered.connect(self.load_180_deg_dialog)
         self.actionLoadProjectionAngles.triggered.connect(self.load_projection_angles)
@@ -92,6 +98,7 @@ class MainWindowView(BaseMainWindowView):
 
         self.actionOnlineDocumentation.triggered.connect(self.open_online_documentation)
         self.actionAbout.triggered.connect(self.show_about)
+        self.actionSharedMemory.triggered.connect(self.show_shared_memory_report)
 
         self.actionFilters.triggered.connect(self.show_filters_window)
         self.actionRecon.triggered.connect(self.show_recon_window)
@@ -142,10 +149,38 @@ class MainWindowView(BaseMainWindowView):
                 version_no))
         msg_box.show()
 
+    def show_shared_memory_report(self):
+        msg_box = QtWidgets.QMessageBox(self)
+        msg_box.setWindowTitle("Shared Memory Usage")
+        report = self.presenter.shared_memory_report()
+        # the totals are shown, the arrays and reservations are listed in the details
+        msg_box.setText("\n".join(line for line in report.split("\n") if not line.startswith(" ")))
+        msg_box.setDetailedText(report)
+        msg_box.show()
+
     def show_load_dialogue(self):
         self.load_dialogue = MWLoadDialog(self)
         self.load_dialogue.show()
 
+    def watch_directory_dialog(self):
+        file_filter = "Image File (*.tif *.tiff *.fits)"
+        selected_file, _ = QFileDialog.getOpenFileName(caption="First projection of the scan",
+                                                       filter=f"{file_filter};;All (*.*)",
+                                                       initialFilter=file_filter)
+        # Cancel/Close was clicked
+        if selected_file == "":
+            return
+
+        expected_images, accepted = QInputDialog.getInt(self,
+                                                        "Number of projections",
+                                                        "Number of projections in the scan (0 if not known)",
+                                                        min=0,
+                                                        max=1000000)
+        if not accepted:
+            return
+
+        self.presenter.watch_directory(selected_file, expected_images if expected_images > 0 else None)
+
     def load_sample_log_dialog(self):
         stack_selector = StackSelectorDialog(main_window=self,
                                              title="Stack Selector",
@@ -314,6 +349,7 @@ class MainWindowView(BaseMainWindowView):
             should_close = msg_box == QtWidgets.QMessageBox.Yes
 
         if should_close:
+            self.presenter.stop_watching()
             # Pass close event to parent
             super(MainWindowView, self).closeEvent(event)
 
@@ -2,10 +2,15 @@
 # SPDX - License - Identifier: GPL-3.0-or-later
 
 from functools import partial
+from logging import getLogger
 from typing import Callable, TYPE_CHECKING, List, Any, Dict
 
+import numpy as np
+
 from mantidimaging.core.operations.base_filter import BaseFilter, FilterGroup
 from mantidimaging.core.operations.loader import load_filter_packages
+from mantidimaging.core.parallel import utility as pu
+from mantidimaging.core.utility import memory_budget
 from mantidimaging.gui.dialogs.async_task import start_async_task_view
 from mantidimaging.gui.mvp_base import BaseMainWindowView
 
@@ -14,6 +19,9 @@ if TYPE_CHECKING:
     from mantidimaging.gui.windows.operations import FiltersWindowPresenter  # pragma: no cover
     from mantidimaging.gui.windows.stack_visualiser import StackVisualiserView  # pragma: no cover
 
+# How long an operation waits for memory reserved by other operations, before it fails
+RESERVATION_TIMEOUT = 60
+
 
 def ensure_tuple(val):
     return val if isinstance(val, tuple) else (val, )
@@ -97,8 +105,16 @@ class FiltersWindowModel(object):
         It gets the image reference out of the StackVisualiserView and forwards
         it to the function that actually processes the images.
         """
-        for stack in stacks:
-            self.apply_to_images(stack.presenter.images, progress=progress)
+        try:
+            for stack in stacks:
+                with pu.shared_array_owner(self.selected_filter.filter_name):
+                    self.apply_to_images(stack.presenter.images, progress=progress)
+                # the operation can replace the data of the stack with a new array
+                pu.set_shared_array_owner(stack.presenter.images.memory_filename, str(stack.uuid))
+        finally:
+            # an operation that failed halfway can leave behind the arrays it created
+            pu.free_leaked_shared_arrays()
+            getLogger(__name__).info(pu.shared_memory_report())
 
     def apply_to_images(self, images, progress=None):
         input_kwarg_widgets = self.filter_widget_kwargs.copy()
@@ -110,7 +126,22 @@ class FiltersWindowModel(object):
         # Run filter
         exec_func: partial = self.selected_filter.execute_wrapper(**input_kwarg_widgets)
         exec_func.keywords["progress"] = progress
-        exec_func(images)
+        # fail before touching the data if the filter's output will not fit in memory
+        peak_memory = self.selected_filter.peak_memory(images, **exec_func.keywords)
+        convert = pu.is_reduced_precision(images.dtype) \
+            and not self.selected_filter.stores_reduced_precision(**exec_func.keywords)
+        if convert:
+            peak_memory += memory_budget.size_in_bytes(images.shape, pu.COMPUTE_DTYPE)
+        # the outputs of the filters, and of the conversion, are made with create_array, so they can be stored on disk
+        with memory_budget.reserve(peak_memory,
+                                   self.selected_filter.filter_name,
+                                   timeout=RESERVATION_TIMEOUT,
+                                   spill_to_disk=True):
+            if convert:
+                getLogger(__name__).info(f"Converting the {images.dtype} stack to {np.dtype(pu.COMPUTE_DTYPE)} "
+                                         f"for {self.selected_filter.filter_name}")
+                images.convert_dtype(pu.COMPUTE_DTYPE)
+            exec_func(images)
         # store the executed filter in history if it executed successfully
         images.record_operation(
             self.selected_filter.__name__,  # type: ignore
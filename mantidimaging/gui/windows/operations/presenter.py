@@ -14,6 +14,7 @@ from PyQt5.QtWidgets import QApplication
 from pyqtgraph import ImageItem
 
 from mantidimaging.core.data import Images
+from mantidimaging.core.data.snapshot import ImagesSnapshot
 from mantidimaging.gui.mvp_base import BasePresenter
 from mantidimaging.gui.utility import BlockQtSignals
 from mantidimaging.gui.utility.common import operation_in_progress
@@ -47,7 +48,7 @@ class FiltersWindowPresenter(BasePresenter):
         self.model = FiltersWindowModel(self)
         self._main_window = main_window
 
-        self.original_images_stack: Union[List[Tuple[Images, UUID]]] = []
+        self.original_images_stack: Union[List[Tuple[ImagesSnapshot, UUID]], ImagesSnapshot, None] = []
         self.applying_to_all = False
 
     @property
@@ -121,11 +122,27 @@ class FiltersWindowPresenter(BasePresenter):
         return parameter in self.model.params_needed_from_stack.values() if \
             self.model.params_needed_from_stack is not None else False
 
-    def do_apply_filter(self):
-        if self.view.safeApply.isChecked():
-            with operation_in_progress("Safe Apply: Copying Data", "-------------------------------------", self.view):
-                self.original_images_stack = self.stack.presenter.images.copy()
+    def _take_snapshot(self, images: Images) -> ImagesSnapshot:
+        return ImagesSnapshot(images, copy_on_write=self.model.selected_filter.copy_on_write)
+
+    def _snapshot_of(self, images: Images) -> Optional[ImagesSnapshot]:
+        if isinstance(self.original_images_stack, list):
+            snapshots = [snapshot for snapshot, _ in self.original_images_stack]
+        else:
+            snapshots = [self.original_images_stack]
+        for snapshot in snapshots:
+            if snapshot is not None and snapshot.images is images:
+                return snapshot
+        return None
+
+    def _finish_snapshots(self):
+        if isinstance(self.original_images_stack, list):
+            for snapshot, _ in self.original_images_stack:
+                snapshot.finish()
+        elif self.original_images_stack is not None:
+            self.original_images_stack.finish()
 
+    def do_apply_filter(self):
         # if is a 180degree stack and a user says no, cancel apply filter.
         if self.is_a_proj180deg(self.stack) \
             and not self.view.ask_confirmation("Operations applied to the sample are also automatically applied to the "
@@ -134,6 +151,10 @@ class FiltersWindowPresenter(BasePresenter):
                                                " degree projection?"):
             return
 
+        if self.view.safeApply.isChecked():
+            with operation_in_progress("Safe Apply: Copying Data", "-------------------------------------", self.view):
+                self.original_images_stack = self._take_snapshot(self.stack.presenter.images)
+
         apply_to = [self.stack]
 
         self._do_apply_filter(apply_to)
@@ -147,7 +168,7 @@ class FiltersWindowPresenter(BasePresenter):
             with operation_in_progress("Safe Apply: Copying Data", "-------------------------------------", self.view):
                 self.original_images_stack = []
                 for stack in stacks:
-                    self.original_images_stack.append((stack.presenter.images.copy(), stack.uuid))
+                    self.original_images_stack.append((self._take_snapshot(stack.presenter.images), stack.uuid))
 
         if len(stacks) > 0:
             self.applying_to_all = True
@@ -176,11 +197,15 @@ class FiltersWindowPresenter(BasePresenter):
     def _post_filter(self, updated_stacks: List[StackVisualiserView], task):
         do_180deg = True
         attempt_repair = task.error is not None
+        # the operation has finished, so the snapshots can stop saving the images it modifies
+        self._finish_snapshots()
         for stack in updated_stacks:
             # If the operation encountered an error during processing,
             # try to restore the original data else continue processing as usual
             if attempt_repair:
-                self.main_window.presenter.model.set_images_in_stack(stack.uuid, stack.presenter.images)
+                snapshot = self._snapshot_of(stack.presenter.images)
+                images = snapshot.restore() if snapshot is not None else stack.presenter.images
+                self.main_window.presenter.model.set_images_in_stack(stack.uuid, images)
             # Ensure there is no error if we are to continue with safe apply and 180 degree.
             elif task.error is None:
                 # otherwise check with user which one to keep
@@ -189,14 +214,17 @@ class FiltersWindowPresenter(BasePresenter):
                 # if the stack that was kept happened to have a proj180 stack - then apply the filter to that too
                 if stack.presenter.images.has_proj180deg() and do_180deg and not self.applying_to_all:
                     self.view.clear_previews()
-                    # Apply to proj180 synchronously - this function is already running async
-                    # and running another async instance causes a race condition in the parallel module
-                    # where the shared data can be removed in the middle of the operation of another operation
+                    # Apply to proj180 synchronously - it is a single image, and it has to be processed
+                    # before the stack views are updated below
                     self._do_apply_filter_sync(
                         [self.view.main_window.get_stack_with_images(stack.presenter.images.proj180deg)])
                     self.view.main_window.update_stack_with_images(stack.presenter.images.proj180deg)
                 self.view.main_window.update_stack_with_images(stack.presenter.images)
 
+        if attempt_repair:
+            # the snapshots have been restored, so there is no new data to choose from
+            self.original_images_stack = None
+
         if self.view.roi_view is not None:
             self.view.roi_view.close()
             self.view.roi_view = None
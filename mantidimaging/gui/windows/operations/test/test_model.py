@@ -9,7 +9,9 @@ import numpy as np
 
 import mantidimaging.test_helpers.unit_test_helper as th
 from mantidimaging.core.operation_history import const
+from mantidimaging.core.utility.memory_budget import MemoryBudgetError
 from mantidimaging.gui.windows.operations import FiltersWindowModel
+from mantidimaging.gui.windows.operations.model import RESERVATION_TIMEOUT
 from mantidimaging.gui.windows.stack_visualiser import (StackVisualiserView, StackVisualiserPresenter, SVParameters)
 
 
@@ -156,12 +158,31 @@ class FiltersWindowModelTest(unittest.TestCase):
         callback_mock = mock.Mock()
 
         selected_filter_mock.execute_wrapper.return_value = partial(callback_mock)
+        selected_filter_mock.peak_memory.return_value = 0
         self.model.selected_filter = selected_filter_mock
         self.model.apply_to_images(images, progress=progress_mock)
 
         selected_filter_mock.validate_execute_kwargs.assert_called_once()
+        selected_filter_mock.peak_memory.assert_called_once_with(images, progress=progress_mock)
         callback_mock.assert_called_once_with(images, progress=progress_mock)
 
+    @mock.patch("mantidimaging.gui.windows.operations.model.memory_budget.reserve")
+    def test_apply_filter_to_images_fails_before_running_without_memory(self, reserve_mock: mock.Mock):
+        images = th.generate_images()
+        selected_filter_mock = mock.Mock()
+        selected_filter_mock.filter_name = "Test filter"
+        selected_filter_mock.peak_memory.return_value = 1024
+        callback_mock = mock.Mock()
+        selected_filter_mock.execute_wrapper.return_value = partial(callback_mock)
+        self.model.selected_filter = selected_filter_mock
+        reserve_mock.side_effect = MemoryBudgetError("Not enough memory")
+
+        self.assertRaises(MemoryBudgetError, self.model.apply_to_images, images)
+
+        reserve_mock.assert_called_once_with(1024, "Test filter", timeout=RESERVATION_TIMEOUT, spill_to_disk=True)
+        callback_mock.assert_not_called()
+        self.assertNotIn(const.OPERATION_HISTORY, images.metadata)
+
     def test_get_filter_module_name(self):
         self.model.filters = mock.MagicMock()
 
@@ -106,6 +106,27 @@ class FiltersWindowPresenterTest(unittest.TestCase):
         do_update_previews.assert_called_once()
         self.presenter.main_window.presenter.model.set_images_in_stack.assert_called_once()
 
+    @mock.patch.multiple('mantidimaging.gui.windows.operations.presenter.FiltersWindowPresenter',
+                         do_update_previews=DEFAULT,
+                         _do_apply_filter=DEFAULT)
+    def test_post_filter_fail_restores_snapshot(self,
+                                                do_update_previews: Mock = Mock(),
+                                                _do_apply_filter: Mock = Mock()):
+        self.presenter.view.safeApply.isChecked.return_value = True
+        self.presenter.main_window.presenter = mock.Mock()
+        stack = mock.Mock()
+        snapshot = mock.Mock()
+        snapshot.images = stack.presenter.images
+        self.presenter.original_images_stack = snapshot
+        mock_task = mock.Mock()
+        mock_task.error = 123
+        self.presenter._post_filter([stack], mock_task)
+
+        snapshot.restore.assert_called_once()
+        self.presenter.main_window.presenter.model.set_images_in_stack.assert_called_once_with(
+            stack.uuid, snapshot.restore.return_value)
+        self.assertIsNone(self.presenter.original_images_stack)
+
     @mock.patch.multiple(
         'mantidimaging.gui.windows.operations.presenter.FiltersWindowPresenter',
         _do_apply_filter=DEFAULT,
@@ -214,15 +235,28 @@ class FiltersWindowPresenterTest(unittest.TestCase):
 
         stack_choice_presenter.assert_not_called()
 
+    @mock.patch("mantidimaging.gui.windows.operations.presenter.ImagesSnapshot")
     @mock.patch("mantidimaging.gui.windows.operations.presenter.operation_in_progress")
-    def test_original_stack_assigned_when_safe_apply_checked(self, _):
+    def test_original_stack_assigned_when_safe_apply_checked(self, _, images_snapshot):
         stack = mock.MagicMock()
         self.presenter.stack = stack
-        stack_data = "THIS IS USEFUL STACK DATA"
-        stack.presenter.images.copy.return_value = stack_data
         self.presenter._do_apply_filter = mock.MagicMock()
 
         self.presenter.do_apply_filter()
 
-        stack.presenter.images.copy.assert_called_once()
-        self.assertEqual(stack_data, self.presenter.original_images_stack)
+        images_snapshot.assert_called_once_with(stack.presenter.images,
+                                                copy_on_write=self.presenter.model.selected_filter.copy_on_write)
+        self.assertEqual(images_snapshot.return_value, self.presenter.original_images_stack)
+
+    @mock.patch("mantidimaging.gui.windows.operations.presenter.ImagesSnapshot")
+    @mock.patch("mantidimaging.gui.windows.operations.presenter.operation_in_progress")
+    def test_snapshot_not_taken_when_applying_to_180_deg_is_declined(self, _, images_snapshot):
+        self.presenter.stack = mock.MagicMock()
+        self.presenter.is_a_proj180deg = mock.Mock(return_value=True)
+        self.view.ask_confirmation.return_value = False
+        self.presenter._do_apply_filter = mock.MagicMock()
+
+        self.presenter.do_apply_filter()
+
+        images_snapshot.assert_not_called()
+        self.presenter._do_apply_filter.assert_not_called()
@@ -141,13 +141,23 @@ class ReconstructWindowModel(object):
         if self.images is None:
             return None
         reconstructor = get_reconstructor_for(recon_params.algorithm)
-        # get the image height based on the current ROI
-        recon = reconstructor.full(self.images, self.data_model.get_all_cors_from_regression(self.images.height),
-                                   recon_params, progress)
+        # every slice is read, so the whole stack is transposed once. The copy is dropped afterwards,
+        # as it doubles the memory used by the stack
+        self.images.cache_sinograms(progress)
+        try:
+            # get the image height based on the current ROI
+            recon = reconstructor.full(self.images, self.data_model.get_all_cors_from_regression(self.images.height),
+                                       recon_params, progress)
+        finally:
+            self.images.clear_sinogram_cache()
 
         recon = self._apply_pixel_size(recon, recon_params, progress)
         return recon
 
+    def clear_sinogram_cache(self):
+        if self.images is not None:
+            self.images.clear_sinogram_cache()
+
     @staticmethod
     def _apply_pixel_size(recon, recon_params, progress=None):
         if recon_params.pixel_size > 0.:
@@ -111,6 +111,20 @@ class ReconWindowModelTest(unittest.TestCase):
         mock_get_reconstructor_for.assert_called_once_with(expected_recon_params.algorithm)
         assert_called_once_with(mock_reconstructor.single_sino, expected_sino, expected_cor,
                                 self.model.images.projection_angles(), expected_recon_params)
+        # the preview only needs one slice, so the stack is not transposed
+        self.assertFalse(self.model.images.has_sinogram_cache)
+
+    @mock.patch('mantidimaging.gui.windows.recon.model.get_reconstructor_for')
+    def test_run_full_recon_clears_sinogram_cache(self, mock_get_reconstructor_for):
+        mock_reconstructor = mock.Mock()
+        mock_reconstructor.full.side_effect = lambda images, *args: self.assertTrue(images.has_sinogram_cache)
+        mock_get_reconstructor_for.return_value = mock_reconstructor
+        self.model.data_model.get_all_cors_from_regression = mock.Mock()
+
+        self.model.run_full_recon(ReconstructionParameters("FBP_CUDA", "ram-lak"), mock.Mock())
+
+        mock_reconstructor.full.assert_called_once()
+        self.assertFalse(self.model.images.has_sinogram_cache)
 
     def test_apply_pixel_size(self):
         images = generate_images()
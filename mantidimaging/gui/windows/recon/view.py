@@ -156,6 +156,7 @@ class ReconstructWindowView(BaseMainWindowView):
 
     def cleanup(self):
         self.stackSelector.unsubscribe_from_main_window()
+        self.presenter.model.clear_sinogram_cache()
         self.main_window.recon = None
 
     @property
@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING, List, Optional, Tuple, Union
 from uuid import UUID
 
 from mantidimaging.core.data.images import Images
+from mantidimaging.core.data.snapshot import ImagesSnapshot
 from mantidimaging.gui.windows.stack_choice.presenter_base import StackChoicePresenterMixin
 from mantidimaging.gui.windows.stack_choice.view import Notification, StackChoiceView
 
@@ -22,7 +23,7 @@ def _get_stack_from_uuid(original_stack, stack_uuid):
 
 class StackChoicePresenter(StackChoicePresenterMixin):
     def __init__(self,
-                 original_stack: Union[List[Tuple[Images, UUID]], Images],
+                 original_stack: Union[List[Tuple[ImagesSnapshot, UUID]], ImagesSnapshot],
                  new_stack: Images,
                  operations_presenter: 'FiltersWindowPresenter',
                  stack_uuid: Optional[UUID],
@@ -35,7 +36,7 @@ class StackChoicePresenter(StackChoicePresenterMixin):
                 self.stack = _get_stack_from_uuid(original_stack, stack_uuid)
             else:
                 self.stack = original_stack
-            view = StackChoiceView(self.stack, new_stack, self, parent=operations_presenter.view)
+            view = StackChoiceView(self.stack.original_images(), new_stack, self, parent=operations_presenter.view)
 
         self.view = view
         self.stack_uuid = stack_uuid
@@ -68,14 +69,15 @@ class StackChoicePresenter(StackChoicePresenterMixin):
             self.operations_presenter.original_images_stack = None
 
     def do_reapply_original_data(self):
-        self.operations_presenter.main_window.presenter.model.set_images_in_stack(self.stack_uuid, self.stack)
+        self.operations_presenter.main_window.presenter.model.set_images_in_stack(self.stack_uuid,
+                                                                                  self.stack.restore())
         self._clean_up_original_images_stack()
         self.view.choice_made = True
         self.close_view()
 
     def do_clean_up_original_data(self):
         self._clean_up_original_images_stack()
-        self.stack.free_memory()
+        self.stack.discard()
         self.view.choice_made = True
         self.close_view()
 
@@ -79,7 +79,8 @@ class StackChoicePresenterTest(unittest.TestCase):
     def test_do_reapply_original_data(self):
         self.p._clean_up_original_images_stack = mock.MagicMock()
         self.p.close_view = mock.MagicMock()
-        self.p.stack = 1
+        self.p.stack = mock.MagicMock()
+        self.p.stack.restore.return_value = 1
 
         self.p.do_reapply_original_data()
 
@@ -96,7 +97,7 @@ class StackChoicePresenterTest(unittest.TestCase):
         self.p.do_clean_up_original_data()
 
         self.p._clean_up_original_images_stack.assert_called_once()
-        self.p.stack.free_memory.assert_called_once()
+        self.p.stack.discard.assert_called_once()
         self.assertTrue(self.v.choice_made)
         self.p.close_view.assert_called_once()
 
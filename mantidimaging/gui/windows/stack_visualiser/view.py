@@ -1,7 +1,8 @@
 # Copyright (C) 2020 ISIS Rutherford Appleton Laboratory UKRI
 # SPDX - License - Identifier: GPL-3.0-or-later
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
+from uuid import UUID
 
 from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtGui import QGuiApplication
@@ -31,6 +32,8 @@ class StackVisualiserView(BaseMainWindowView):
     presenter: StackVisualiserPresenter
     dock: QDockWidget
     layout: QVBoxLayout
+    # assigned when the stack is added to the main window
+    uuid: Optional[UUID] = None
 
     def __init__(self, parent: 'MainWindowView', dock: QDockWidget, images: Images):
         # enforce not showing a single image
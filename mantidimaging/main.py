@@ -10,6 +10,7 @@ import warnings
 import SharedArray as sa
 
 from mantidimaging import helper as h
+from mantidimaging.core.parallel import utility as pu
 from mantidimaging.core.utility.optional_imports import safe_import
 
 formatwarning_orig = warnings.formatwarning
@@ -36,6 +37,14 @@ def parse_args():
         "Available options are: TRACE, DEBUG, INFO, WARN, CRITICAL",
     )
 
+    parser.add_argument(
+        "--scratch-dir",
+        type=str,
+        default=None,
+        help="Directory in which stacks that do not fit in memory are stored. "
+        f"Defaults to ${pu.SCRATCH_DIRECTORY_ENV_VAR}, or the temporary directory",
+    )
+
     parser.add_argument("--version", action="store_true", help="Print version number and exit.")
 
     return parser.parse_args()
@@ -47,6 +56,8 @@ def main():
             sa.delete(arr.name.decode("utf-8"))
 
     atexit.register(free_all)
+    atexit.register(pu.delete_disk_arrays)
+    atexit.register(pu.shutdown_worker_pool)
     args = parse_args()
     # Print version number and exit
     if args.version:
@@ -56,6 +67,7 @@ def main():
         return
 
     h.initialise_logging(logging.getLevelName(args.log_level))
+    pu.set_scratch_directory(args.scratch_dir)
     startup_checks()
     free_all()
 